@@ -9,6 +9,7 @@ from copy import deepcopy
 from functools import cached_property
 from typing import Dict, Iterable, List, Optional, Set, Union
 
+import numpy as np
 from monty.dev import deprecated
 from monty.json import MontyDecoder, MSONable
 from numpy.random import normal
@@ -30,6 +31,7 @@ from rxn_network.entries.freed import FREEDReferenceEntry
 from rxn_network.entries.gibbs import GibbsComputedEntry
 from rxn_network.entries.interpolated import InterpolatedEntry
 from rxn_network.entries.nist import NISTReferenceEntry
+from rxn_network.thermo.cache import get_pd_cache
 from rxn_network.thermo.utils import expand_pd
 from rxn_network.utils.funcs import get_logger
 
@@ -121,7 +123,15 @@ class GibbsEntrySet(collections.abc.MutableSet, MSONable):
         acquired using the helper method expand_pd() and represents one of the simplest
         divisions of sub-PDs for large chemical systems. Cached for speed.
         """
-        return expand_pd(self.entries)
+        return expand_pd(self.entries, fingerprint=self.fingerprint)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Returns a fingerprint of the entries, which is used as the key for sharing phase
+        diagrams across entry sets and enumerators (see rxn_network.thermo.cache).
+        """
+        return get_pd_cache().get_fingerprint(self.entries)
 
     def get_subset_in_chemsys(self, chemsys: List[str]) -> "GibbsEntrySet":
         """
@@ -165,12 +175,14 @@ class GibbsEntrySet(collections.abc.MutableSet, MSONable):
             cutoff (e_above_hull) via phase diagram construction.
         """
         pd_dict = self.pd_dict
+        entries = {e: e for e in self.entries}  # phase diagrams may be shared
 
         filtered_entries: Set[Union[GibbsComputedEntry, NISTReferenceEntry]] = set()
         all_comps: Dict[str, Union[GibbsComputedEntry, NISTReferenceEntry]] = {}
 
         for _, pd in pd_dict.items():
             for entry in pd.all_entries:
+                entry = entries.get(entry, entry)
                 if (
                     entry in filtered_entries
                     or pd.get_e_above_hull(entry) > e_above_hull
@@ -305,10 +317,9 @@ class GibbsEntrySet(collections.abc.MutableSet, MSONable):
             An interpolated GibbsComputedEntry object.
         """
         comp = Composition(formula).reduced_composition
-        pd_entries = self.get_subset_in_chemsys([str(e) for e in comp.elements])
 
         energy = (
-            PhaseDiagram(pd_entries).get_hull_energy(comp)
+            get_pd_cache().get_hull_energy(self.entries, comp, self.fingerprint)
             - tol_per_atom * comp.num_atoms
         )
 
@@ -532,6 +543,22 @@ class GibbsEntrySet(collections.abc.MutableSet, MSONable):
         """Returns a list of all entries in the entry set."""
         return list(sorted(self.entries, key=lambda e: e.composition))
 
+    @cached_property
+    def energy_vector(self) -> np.ndarray:
+        """
+        Returns the energies of the entries (in the order of entries_list) per reduced
+        formula unit; see get_energy_vector().
+        """
+        return get_energy_vector(self.entries_list)
+
+    @cached_property
+    def num_atoms_vector(self) -> np.ndarray:
+        """
+        Returns the number of atoms per reduced formula unit of the entries (in the
+        order of entries_list); see get_num_atoms_vector().
+        """
+        return get_num_atoms_vector(self.entries_list)
+
     @cached_property
     def min_entries_by_formula(self) -> Dict[str, ComputedEntry]:
         """
@@ -661,7 +688,149 @@ class GibbsEntrySet(collections.abc.MutableSet, MSONable):
         except AttributeError:
             pass
 
+        try:
+            del self.fingerprint
+        except AttributeError:
+            pass
+
         try:
             del self.min_entries_by_formula
         except AttributeError:
             pass
+
+        try:
+            del self.energy_vector
+        except AttributeError:
+            pass
+
+        try:
+            del self.num_atoms_vector
+        except AttributeError:
+            pass
+
+
+def get_energy_vector(
+    entries: List[ComputedEntry], chempots: Optional[Dict[Element, float]] = None
+) -> np.ndarray:
+    """
+    Returns the energies of entries per reduced formula unit, such that the energy of
+    a reaction between these entries is the dot product of its coefficients with this
+    vector. If chemical potentials are provided, these are grand potentials (entries
+    of the pure open elements are not transformed, as in OpenComputedReaction).
+
+    Args:
+        entries: List of entries
+        chempots: Optional dict of chemical potentials of open elements
+
+    Returns:
+        Array of energies (eV per reduced formula unit)
+    """
+    chempots = chempots or {}
+
+    energies = np.zeros(len(entries))
+    for i, entry in enumerate(entries):
+        comp = entry.composition
+        energy = entry.energy
+
+        is_open_elem = len(comp.elements) == 1 and comp.elements[0] in chempots
+        if chempots and not is_open_elem:
+            energy -= sum(comp[el] * mu for el, mu in chempots.items())
+
+        energies[i] = energy / comp.get_reduced_composition_and_factor()[1]
+
+    return energies
+
+
+def get_energy_matrix(
+    entries: List[ComputedEntry],
+    temperatures: Iterable[float],
+    chempots: Optional[Dict[Element, float]] = None,
+) -> np.ndarray:
+    """
+    Returns the energies of entries per reduced formula unit at each of the provided
+    temperatures, i.e. a temperature-dependent version of get_energy_vector(). Each
+    entry must provide a get_energies() method (see GibbsComputedEntry and
+    ExperimentalReferenceEntry).
+
+    Args:
+        entries: List of entries
+        temperatures: Temperatures at which to evaluate the energies [K]
+        chempots: Optional dict of chemical potentials of open elements
+
+    Returns:
+        Array of energies with shape (num_entries, num_temperatures)
+    """
+    chempots = chempots or {}
+    temps = np.asarray(temperatures, dtype=float)
+
+    energies = np.zeros((len(entries), len(temps)))
+    for i, entry in enumerate(entries):
+        try:
+            entry_energies = entry.get_energies(temps)  # type: ignore
+        except AttributeError as e:
+            raise AttributeError(
+                f"Entry {entry.entry_id} ({entry.composition.reduced_formula}) is not"
+                " associated with a temperature. Please use the GibbsComputedEntry"
+                " class for all entries."
+            ) from e
+
+        comp = entry.composition
+        is_open_elem = len(comp.elements) == 1 and comp.elements[0] in chempots
+        if chempots and not is_open_elem:
+            entry_energies = entry_energies - sum(
+                comp[el] * mu for el, mu in chempots.items()
+            )
+
+        energies[i] = entry_energies / comp.get_reduced_composition_and_factor()[1]
+
+    return energies
+
+
+def get_uncertainty_vector(entries: List[ComputedEntry]) -> np.ndarray:
+    """
+    Returns the energy (correction) uncertainties of entries per reduced formula unit,
+    in the same units as get_energy_vector().
+
+    Args:
+        entries: List of entries
+
+    Returns:
+        Array of energy uncertainties (eV per reduced formula unit)
+    """
+    return np.array(
+        [
+            e.correction_uncertainty
+            / e.composition.get_reduced_composition_and_factor()[1]
+            for e in entries
+        ],
+        dtype=float,
+    )
+
+
+def get_num_atoms_vector(
+    entries: List[ComputedEntry], open_elems: Optional[Iterable[Element]] = None
+) -> np.ndarray:
+    """
+    Returns the number of atoms per reduced formula unit of entries, excluding any
+    open elements (as in OpenComputedReaction).
+
+    Args:
+        entries: List of entries
+        open_elems: Optional iterable of open elements
+
+    Returns:
+        Array of numbers of atoms
+    """
+    open_elems = set(open_elems) if open_elems else set()
+
+    return np.array(
+        [
+            sum(
+                amt
+                for el, amt in e.composition.reduced_composition.items()
+                if el not in open_elems
+            )
+            for e in entries
+        ],
+        dtype=float,
+    )
@@ -2,8 +2,9 @@
 Implements an Entry that looks up NIST pre-tabulated Gibbs free energies
 """
 import hashlib
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 from monty.json import MontyDecoder
 from pymatgen.analysis.phase_diagram import GrandPotPDEntry
 from pymatgen.entries.computed_entries import ComputedEntry, EnergyAdjustment
@@ -74,6 +75,26 @@ class ExperimentalReferenceEntry(ComputedEntry):
         new_entry = self.from_dict(new_entry_dict)
         return new_entry
 
+    def get_energies(self, temperatures: Iterable[float]) -> np.ndarray:
+        """
+        Returns the energies of the entry at each of the specified temperatures. This is
+        equivalent to calling get_new_temperature() for every temperature, but the
+        reference data are interpolated for all temperatures at once.
+
+        Args:
+            temperatures: The temperatures at which to evaluate the energy [K]
+
+        Returns:
+            Array of energies (eV), one for each temperature
+        """
+        formula = self.composition.reduced_formula
+        temps = np.asarray(temperatures, dtype=float)
+        if temps.size:
+            self._validate_temperature(formula, temps.min())
+            self._validate_temperature(formula, temps.max())
+
+        return self._get_energy(formula, temps) + self.correction  # type: ignore
+
     def to_grand_entry(self, chempots):
         """
         Convert an ExperimentalReferenceEntry to a GrandComputedEntry.
@@ -106,14 +127,15 @@ class ExperimentalReferenceEntry(ComputedEntry):
 
         Args:
             formula: Chemical formula by which to search experimental data.
-            temperature: Absolute temperature [K].
+            temperature: Absolute temperature [K]. An array of temperatures may also
+                be provided, in which case an array of energies is returned.
 
         Returns:
             Gibbs free energy of formation of formula at specified temperature [eV]
         """
         data = cls.REFERENCES[formula]
 
-        if temperature % 100 > 0:
+        if np.ndim(temperature) or temperature % 100 > 0:
             g_interp = interp1d(list(data.keys()), list(data.values()))
             return g_interp(temperature)[()]
 
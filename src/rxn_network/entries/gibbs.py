@@ -5,7 +5,7 @@ add extra functionality.
 """
 from copy import deepcopy
 from itertools import combinations
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 import numpy as np
 from monty.json import MontyDecoder
@@ -128,6 +128,33 @@ class GibbsComputedEntry(ComputedEntry):
         new_entry = self.from_dict(new_entry_dict)
         return new_entry
 
+    def get_energies(self, temperatures: Iterable[float]) -> np.ndarray:
+        """
+        Returns the energies of the entry at each of the specified temperatures. This is
+        equivalent to calling get_new_temperature() for every temperature, but is
+        evaluated for all temperatures at once without creating any new entries.
+
+        Args:
+            temperatures: The temperatures at which to evaluate the energy [K]
+
+        Returns:
+            Array of energies (eV), one for each temperature
+        """
+        temps = np.asarray(temperatures, dtype=float)
+        if (temps < 300).any() or (temps > 2000).any():
+            raise ValueError("Temperature must be selected from range: [300, 2000] K.")
+
+        sisso_correction = sum(
+            adj.value
+            for adj in self.energy_adjustments
+            if adj.name == "Gibbs SISSO Correction"
+        )
+
+        energies = np.full(temps.shape, self.energy - sisso_correction)
+        energies += self.gibbs_adjustment(temps)  # type: ignore
+
+        return energies
+
     def gibbs_adjustment(self, temperature: float) -> float:
         """
         Returns the difference between the predicted Gibbs formation energy and the
@@ -138,7 +165,8 @@ class GibbsComputedEntry(ComputedEntry):
         Units: eV (not normalized)
 
         Args:
-            temperature: The absolute temperature [K].
+            temperature: The absolute temperature [K]. An array of temperatures may
+                also be provided, in which case an array of corrections is returned.
         Returns:
             The correction to Gibbs free energy of formation (eV) from DFT energy.
         """
@@ -202,7 +230,7 @@ class GibbsComputedEntry(ComputedEntry):
         """
         elems = composition.get_el_amt_dict()
 
-        if temperature % 100 > 0:
+        if np.ndim(temperature) or temperature % 100 > 0:
             sum_g_i = 0
             for elem, amt in elems.items():
                 g_interp = interp1d(
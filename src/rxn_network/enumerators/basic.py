@@ -2,24 +2,52 @@
 This module implements two types of basic reaction enumerators, differing in the option
 to consider open entries.
 """
-from copy import deepcopy
-from itertools import combinations, product
+from collections import deque
+from copy import copy
+from itertools import combinations, islice, product, repeat
 from math import comb
-from typing import List, Optional, Set
-
-import ray
-from pymatgen.analysis.phase_diagram import GrandPotentialPhaseDiagram, PhaseDiagram
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
+
+import numpy as np
 from pymatgen.entries.computed_entries import ComputedEntry
 from tqdm import tqdm
 
+from rxn_network.core.composition import Composition
 from rxn_network.core.enumerator import Enumerator
 from rxn_network.entries.entry_set import GibbsEntrySet
+from rxn_network.entries.experimental import ExperimentalReferenceEntry
+from rxn_network.entries.gibbs import GibbsComputedEntry
 from rxn_network.entries.utils import initialize_entry
-from rxn_network.enumerators.utils import get_rxn_info, group_by_chemsys
+from rxn_network.enumerators.utils import (
+    ChunkSizer,
+    EnumerationMetrics,
+    count_precursor_combo_pairs,
+    get_combo_tuples,
+    get_combos_array,
+    get_elem_bitmasks,
+    get_precursor_combo_pairs,
+    get_rxn_info,
+    group_combos_by_chemsys,
+)
+from rxn_network.reactions.cache import get_balancing_cache, set_balancing_cache
 from rxn_network.reactions.computed import ComputedReaction
 from rxn_network.reactions.reaction_set import ReactionSet
-from rxn_network.utils.funcs import get_logger, grouper, limited_powerset
-from rxn_network.utils.ray import initialize_ray
+from rxn_network.thermo.cache import get_pd_cache
+from rxn_network.utils.executors import Executor, get_executor
+from rxn_network.utils.funcs import get_logger
 
 logger = get_logger(__name__)
 
@@ -33,7 +61,10 @@ class BasicEnumerator(Enumerator):
     products may not be stable with respect to each other.
     """
 
-    CHUNK_SIZE = 2500
+    CHUNK_SIZE = 2500  # initial chunk size; adapted to the measured cost per pair
+    MIN_CHUNK_SIZE = 100
+    MAX_CHUNK_SIZE = 100000
+    TARGET_CHUNK_TIME = 1.0  # seconds
 
     def __init__(
         self,
@@ -100,7 +131,12 @@ class BasicEnumerator(Enumerator):
         self._build_pd = False
         self._build_grand_pd = False
 
-    def enumerate(self, entries: GibbsEntrySet, batch_size=None) -> ReactionSet:
+    def enumerate(
+        self,
+        entries: GibbsEntrySet,
+        batch_size=None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> ReactionSet:
         """
         Calculate all possible reactions given a set of entries. If the enumerator was
         initialized with specified precursors or target, the reactions will be filtered
@@ -124,9 +160,195 @@ class BasicEnumerator(Enumerator):
 
         Args:
             entries: the set of all entries to enumerate from
+            batch_size: maximum number of chunks submitted to the workers at once
+            executor: the execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
+
+        Returns:
+            A ReactionSet of the enumerated reactions. Its "metrics" attribute holds an
+            EnumerationMetrics object summarizing the enumeration.
+        """
+
+        entries_list, chunk_results, metrics = self._get_chunk_results(
+            entries, batch_size, executor
+        )
+
+        all_indices, all_coeffs, all_data = self._flatten_chunk_results(chunk_results)
+
+        rxn_set = ReactionSet(entries_list, all_indices, all_coeffs, all_data=all_data)
+        rxn_set = rxn_set.filter_duplicates()
+        rxn_set.metrics = metrics
+
+        logger.info(metrics)
+
+        return rxn_set
+
+    def enumerate_iter(
+        self,
+        entries: GibbsEntrySet,
+        batch_size=None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> Iterator[ReactionSet]:
+        """
+        Calculate all possible reactions given a set of entries, yielding a ReactionSet
+        for each chunk of reactions as soon as it has been computed by the workers. This
+        keeps memory bounded by the chunk size rather than by the total number of
+        reactions.
+
+        Note: duplicates are only filtered within each chunk; reactions may be repeated
+        across chunks. The "metrics" attribute of each ReactionSet refers to the same
+        EnumerationMetrics object, which is updated as enumeration progresses.
+
+        Args:
+            entries: the set of all entries to enumerate from
+            batch_size: maximum number of chunks submitted to the workers at once
+            executor: the execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
         """
+        entries_list, chunk_results, metrics = self._get_chunk_results(
+            entries, batch_size, executor
+        )
+
+        for results in chunk_results:
+            if not results:
+                continue
+
+            indices, coeffs, data = self._flatten_chunk_results([results])
+            rxn_set = ReactionSet(entries_list, indices, coeffs, all_data=data)
+            rxn_set = rxn_set.filter_duplicates()
+            rxn_set.metrics = metrics
+
+            yield rxn_set
+
+    def enumerate_to_sink(
+        self,
+        entries: GibbsEntrySet,
+        sink: Callable[[ReactionSet], Any],
+        batch_size=None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> int:
+        """
+        Calculate all possible reactions given a set of entries, passing each chunk of
+        reactions (as a ReactionSet) to the provided sink, e.g. a
+        ReactionSetShardWriter which writes each chunk to disk.
+
+        Args:
+            entries: the set of all entries to enumerate from
+            sink: a callable accepting a ReactionSet
+            batch_size: maximum number of chunks submitted to the workers at once
+            executor: the execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
+
+        Returns:
+            The total number of reactions passed to the sink.
+        """
+        num_rxns = 0
+        for rxn_set in self.enumerate_iter(
+            entries, batch_size=batch_size, executor=executor
+        ):
+            sink(rxn_set)
+            num_rxns += len(rxn_set)
+
+        return num_rxns
+
+    def enumerate_new(
+        self,
+        rxn_set: ReactionSet,
+        new_entries: Iterable[Union[GibbsComputedEntry, ExperimentalReferenceEntry]],
+        batch_size=None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> ReactionSet:
+        """
+        Incrementally updates a set of previously enumerated reactions after new
+        entries have been added. Only reactant/product combinations that are affected
+        by the new entries are enumerated (for the BasicEnumerator, these are the
+        combinations including at least one new entry). The resulting reactions are
+        merged with the existing reactions, which are remapped to the new list of
+        entries.
+
+        Args:
+            rxn_set: the previously enumerated reactions (e.g. from enumerate())
+            new_entries: the entries to be added
+            batch_size: maximum number of chunks submitted to the workers at once
+            executor: the execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
+
+        Returns:
+            A ReactionSet containing both the existing and the new reactions. Its
+            "metrics" attribute only covers the newly enumerated combinations.
+        """
+        new_entries = set(new_entries)
+        new_elem_sets = [
+            {str(el) for el in e.composition.elements} for e in new_entries
+        ]
+        entries = GibbsEntrySet(
+            set(rxn_set.entries) | new_entries,
+            calculate_e_above_hulls=self.calculate_e_above_hulls,
+        )
+
+        entries_list, chunk_results, metrics = self._get_chunk_results(
+            entries, batch_size, executor, new_entries=new_entries
+        )
+
+        all_indices, all_coeffs, all_data = self._flatten_chunk_results(chunk_results)
+
+        new_idxs = {e: idx for idx, e in enumerate(entries_list)}
+        idx_map = [new_idxs.get(e) for e in rxn_set.entries]
+        open_elems = {
+            str(el)
+            for formula in self.open_phases or []
+            for el in Composition(formula).elements
+        }
 
-        initialize_ray()
+        for indices, coeffs, data in zip(
+            rxn_set.indices, rxn_set.coeffs, rxn_set.all_data or repeat({})
+        ):
+            mapped_indices = [idx_map[i] for i in indices]
+            if None in mapped_indices:
+                continue  # entry no longer included (e.g., due to stabilization)
+
+            chemsys = {
+                str(el)
+                for i in mapped_indices
+                for el in entries_list[i].composition.elements
+            }
+            if not self._keep_existing_rxn(chemsys | open_elems, new_elem_sets):
+                continue
+
+            all_indices.append(mapped_indices)
+            all_coeffs.append(list(coeffs))
+            all_data.append(data)
+
+        new_rxn_set = ReactionSet(
+            entries_list,
+            all_indices,
+            all_coeffs,
+            open_elem=rxn_set.open_elem,
+            chempot=rxn_set.chempot,
+            all_data=all_data,
+        )
+        new_rxn_set = new_rxn_set.filter_duplicates()
+        new_rxn_set.metrics = metrics
+
+        return new_rxn_set
+
+    def _get_chunk_results(
+        self,
+        entries,
+        batch_size=None,
+        executor=None,
+        new_entries=None,
+        chempots_list=None,
+    ):
+        """
+        Initializes entries and combos and returns the (sorted) list of entries, a
+        generator of the results of each completed chunk, and an EnumerationMetrics
+        object which is updated as the generator is consumed. If new entries are
+        provided, only the combos affected by these entries are considered. If a list
+        of chemical potential dicts is provided, a list of grand potential phase
+        diagrams (one per dict) is passed to the react function.
+        """
+        executor = get_executor(executor)
 
         entries, precursors, targets, open_entries = self._get_initialized_entries(
             entries
@@ -138,129 +360,370 @@ class BasicEnumerator(Enumerator):
             targets,
             open_entries,
         )
-        open_combos = self._get_open_combos(open_entries)
+        open_combos = self._get_open_combos(entries, open_entries)
 
         if not open_combos:
             open_combos = []
 
-        items = combos_dict.items()
-
-        precursors = ray.put(precursors)
-        targets = ray.put(targets)
-        react_function = ray.put(self._react_function)
-        open_entries = ray.put(open_entries)
-        p_set_func = ray.put(self._p_set_func)
-        t_set_func = ray.put(self._t_set_func)
-        remove_unbalanced = ray.put(self.remove_unbalanced)
-        remove_changed = ray.put(self.remove_changed)
-        max_num_constraints = ray.put(self.max_num_constraints)
+        new_idxs = None
+        if new_entries is not None:
+            new_idxs = {
+                idx for idx, e in enumerate(entries.entries_list) if e in new_entries
+            }
+            new_elem_sets = [
+                {str(el) for el in e.composition.elements} for e in new_entries
+            ]
+            combos_dict = self._filter_combos_by_new_entries(
+                combos_dict, new_idxs, new_elem_sets
+            )
 
-        rxn_chunk_refs = []  # type: ignore
-        results = []
+        metrics = EnumerationMetrics()
+        chunk_results = self._iter_chunk_results(
+            entries,
+            combos_dict,
+            open_combos,
+            open_entries,
+            precursors,
+            targets,
+            executor,
+            batch_size,
+            new_idxs,
+            metrics,
+            chempots_list,
+        )
 
-        if not batch_size:
-            batch_size = ray.cluster_resources()["CPU"] * 2
+        return entries.entries_list, chunk_results, metrics
 
-        with tqdm(
-            total=self._num_chunks(items, open_combos), disable=self.quiet
-        ) as pbar:
-            for item in items:
-                chemsys, combos = item
+    def _iter_chunk_results(
+        self,
+        entries,
+        combos_dict,
+        open_combos,
+        open_entries,
+        precursors,
+        targets,
+        executor,
+        batch_size=None,
+        new_idxs=None,
+        metrics=None,
+        chempots_list=None,
+    ):
+        """
+        Submits chunks of reactant/product combinations to the workers and yields the
+        list of results for every chunk as it completes. If the indices of new entries
+        are provided, only reactant/product pairs affected by them are submitted. If an
+        EnumerationMetrics object is provided, it is updated with every chunk.
+
+        Chemical systems are processed largest-first. The chunk size is adapted to the
+        measured cost per reactant/product pair (see ChunkSizer), and the final chunks
+        are split across all workers to avoid idle workers at the end.
+
+        If the enumerator requires phase diagrams, these are built in their own tasks
+        (see _get_phase_diagrams()), which are submitted ahead of the chunks for up to
+        one chemical system per worker. The chunks of a chemical system depend on its
+        phase diagram task, such that phase diagram construction overlaps with
+        reaction enumeration instead of blocking the submission of chunks. Phase
+        diagrams found in the phase diagram cache of the main process are not rebuilt,
+        and those built by the workers are added to it once enumeration is complete.
+        """
+        precursor_idxs = self._get_precursor_idxs(entries, precursors)
+
+        def get_rxn_iterable(combos):
+            rxn_iterable = self._get_rxn_iterable(combos, open_combos, precursor_idxs)
+            if new_idxs is not None:
+                rxn_iterable = self._filter_rxn_iterable_by_new_entries(
+                    rxn_iterable, new_idxs
+                )
+            return rxn_iterable
+
+        if new_idxs is None:
+            lengths = {
+                chemsys: self._rxn_iter_length(combos, open_combos, precursor_idxs)
+                for chemsys, combos in combos_dict.items()
+            }
+        else:
+            lengths = {
+                chemsys: self._new_rxn_iter_length(
+                    combos, open_combos, precursor_idxs, new_idxs
+                )
+                for chemsys, combos in combos_dict.items()
+            }
+        items = sorted(
+            combos_dict.items(), key=lambda item: lengths[item[0]], reverse=True
+        )
+        num_remaining = sum(lengths.values())
+
+        precursors = executor.put(precursors)
+        targets = executor.put(targets)
+        entries_list = executor.put(entries.entries_list)
+        react_function = executor.put(self._react_function)
+        open_entries = executor.put(open_entries)
+        p_set_func = executor.put(self._p_set_func)
+        t_set_func = executor.put(self._t_set_func)
+        remove_unbalanced = executor.put(self.remove_unbalanced)
+        remove_changed = executor.put(self.remove_changed)
+        max_num_constraints = executor.put(self.max_num_constraints)
+
+        balancing_cache = get_balancing_cache()
+        balancing_cache_ref = executor.put(balancing_cache)
 
-                elems = chemsys.split("-")
+        rxn_chunk_refs = []  # type: ignore
 
-                filtered_entries = None
-                pd = None
-                grand_pd = None
+        if not batch_size:
+            batch_size = executor.num_workers * 2
+
+        chunk_sizer = ChunkSizer(
+            self.CHUNK_SIZE,
+            executor.num_workers,
+            target_time=self.TARGET_CHUNK_TIME,
+            min_size=self.MIN_CHUNK_SIZE,
+            max_size=self.MAX_CHUNK_SIZE,
+        )
 
-                if self.build_pd or self.build_grand_pd:
-                    filtered_entries = entries.get_subset_in_chemsys(elems)
+        build_pds = self.build_pd or self.build_grand_pd
+        if build_pds:
+            entries_ref = executor.put(entries)
+            chempots = (
+                chempots_list
+                if chempots_list is not None
+                else getattr(self, "chempots", None)
+            )
 
-                if self.build_pd:
-                    pd = PhaseDiagram(filtered_entries)
+        pd_queue = deque(chemsys for chemsys, _ in items if lengths[chemsys])
+        pd_refs = {}  # type: ignore
+        built_pd_refs = []  # type: ignore
+
+        def get_pd_data(chemsys):
+            if not build_pds:
+                return None, None, None
+
+            while pd_queue and len(pd_refs) <= executor.num_workers:
+                next_chemsys = pd_queue.popleft()
+                elems = next_chemsys.split("-")
+
+                cached_pd_data = _get_cached_phase_diagrams(
+                    entries,
+                    entries.fingerprint,
+                    elems,
+                    self.build_pd,
+                    self.build_grand_pd,
+                    chempots,
+                )
+                if cached_pd_data is not None:
+                    pd_refs[next_chemsys] = executor.put(cached_pd_data)
+                    continue
 
-                if self.build_grand_pd:
-                    chempots = getattr(self, "chempots")
-                    grand_pd = GrandPotentialPhaseDiagram(filtered_entries, chempots)
+                pd_refs[next_chemsys] = executor.submit(
+                    _get_phase_diagrams,
+                    entries_ref,
+                    entries.fingerprint,
+                    elems,
+                    self.build_pd,
+                    self.build_grand_pd,
+                    chempots,
+                )
+                built_pd_refs.append((elems, pd_refs[next_chemsys]))
+
+            return pd_refs.pop(chemsys)
+
+        chunk_chemsys = {}  # type: ignore
+        start = perf_counter()
+
+        def get_completed(refs):
+            for completed_ref in refs:
+                num_items, elapsed, results, counts, nullspaces = executor.get(
+                    completed_ref
+                )
+                if balancing_cache is not None:
+                    balancing_cache.update(nullspaces)
+
+                chunk_sizer.update(num_items, elapsed)
+                pbar.update(num_items)
+
+                chemsys = chunk_chemsys.pop(completed_ref)
+                if metrics is not None:
+                    metrics.update(chemsys, num_items, len(results), elapsed, counts)
+                    metrics.wall_time = perf_counter() - start
+
+                yield results
+
+        with tqdm(total=num_remaining, disable=self.quiet) as pbar:
+            for item in items:
+                chemsys, combos = item
+                if not lengths[chemsys]:
+                    continue
 
-                filtered_entries = ray.put(filtered_entries)
-                pd = ray.put(pd)
-                grand_pd = ray.put(grand_pd)
+                pd_data = get_pd_data(chemsys)
 
-                for rxn_iterable_chunk in grouper(
-                    self._get_rxn_iterable(combos, open_combos), self.CHUNK_SIZE
-                ):
+                rxn_iterable = iter(get_rxn_iterable(combos))
+                while True:
                     if len(rxn_chunk_refs) > batch_size:
                         num_ready = len(rxn_chunk_refs) - batch_size
-                        newly_completed, rxn_chunk_refs = ray.wait(
+                        newly_completed, rxn_chunk_refs = executor.wait(
                             rxn_chunk_refs, num_returns=num_ready
                         )
-                        for completed_ref in newly_completed:
-                            results.extend(ray.get(completed_ref))
-
-                            pbar.update(1)
-
-                    rxn_chunk_refs.append(
-                        _react.remote(
-                            rxn_iterable_chunk,
-                            react_function,
-                            open_entries,
-                            precursors,
-                            targets,
-                            p_set_func,
-                            t_set_func,
-                            remove_unbalanced,
-                            remove_changed,
-                            max_num_constraints,
-                            filtered_entries,
-                            pd,
-                            grand_pd,
-                        )
+                        yield from get_completed(newly_completed)
+
+                    rxn_iterable_chunk = list(
+                        islice(rxn_iterable, chunk_sizer.get_size(num_remaining))
+                    )
+                    if not rxn_iterable_chunk:
+                        break
+
+                    num_remaining -= len(rxn_iterable_chunk)
+
+                    rxn_chunk_ref = executor.submit(
+                        _react_timed,
+                        rxn_iterable_chunk,
+                        entries_list,
+                        react_function,
+                        open_entries,
+                        precursors,
+                        targets,
+                        p_set_func,
+                        t_set_func,
+                        remove_unbalanced,
+                        remove_changed,
+                        max_num_constraints,
+                        balancing_cache_ref,
+                        pd_data,
                     )
+                    chunk_chemsys[rxn_chunk_ref] = chemsys
+                    rxn_chunk_refs.append(rxn_chunk_ref)
+
+            while rxn_chunk_refs:
+                newly_completed, rxn_chunk_refs = executor.wait(rxn_chunk_refs)
+                yield from get_completed(newly_completed)
 
-            newly_completed, rxn_chunk_refs = ray.wait(
-                rxn_chunk_refs, num_returns=len(rxn_chunk_refs)
+        for elems, pd_ref in built_pd_refs:
+            _add_phase_diagrams(
+                executor.get(pd_ref), entries.fingerprint, elems, chempots
             )
-            for completed_ref in newly_completed:
-                results.extend(ray.get(completed_ref))
-                pbar.update(1)
-
-        all_indices, all_coeffs, all_data = [], [], []
-        for r in results:
-            all_indices.append(r[0])
-            all_coeffs.append(r[1])
-            all_data.append(r[2])
-
-        rxn_set = ReactionSet(
-            entries.entries_list, all_indices, all_coeffs, all_data=all_data
-        )
-        rxn_set = rxn_set.filter_duplicates()
 
-        return rxn_set
+        if balancing_cache is not None and balancing_cache.path is not None:
+            balancing_cache.save()
 
-    @classmethod
-    def _num_chunks(cls, items, open_combos):
-        _ = open_combos  # not used
+    @overload
+    @staticmethod
+    def _flatten_chunk_results(
+        chunk_results: Iterable[List], group_by: None = None
+    ) -> Tuple[List, List, List]:
+        ...
+
+    @overload
+    @staticmethod
+    def _flatten_chunk_results(
+        chunk_results: Iterable[List], group_by: str
+    ) -> Dict[Any, Tuple[List, List, List]]:
+        ...
+
+    @staticmethod
+    def _flatten_chunk_results(
+        chunk_results: Iterable[List], group_by: Optional[str] = None
+    ) -> Union[Tuple[List, List, List], Dict[Any, Tuple[List, List, List]]]:
+        """
+        Flattens the results of all chunks (as yielded by _iter_chunk_results()) into
+        lists of the entry indices, coefficients, and data of every reaction.
+
+        Args:
+            chunk_results: Iterable of the lists of results of every chunk
+            group_by: Optional key in the reaction data. If provided, the reactions
+                are grouped by the value of this key (which is removed from their
+                data), and a dictionary of the lists for every value is returned.
+        """
+        groups: Dict[Any, Tuple[List, List, List]] = {}
+        for results in chunk_results:
+            for indices, coeffs, data in results:
+                group = None
+                if group_by is not None:
+                    data = dict(data)
+                    group = data.pop(group_by)
+
+                all_indices, all_coeffs, all_data = groups.setdefault(
+                    group, ([], [], [])
+                )
+                all_indices.append(indices)
+                all_coeffs.append(coeffs)
+                all_data.append(data)
+
+        if group_by is None:
+            return groups.get(None, ([], [], []))
+
+        return groups
+
+    @staticmethod
+    def _filter_combos_by_new_entries(combos_dict, new_idxs, new_elem_sets):
+        """Only keep the chemical systems with combos including a new entry."""
+        _ = new_elem_sets  # unused argument
 
-        n = 0
-        for _, i in items:
-            num_combos = cls._rxn_iter_length(i, open_combos)
-            if num_combos > 0:
-                n += num_combos // cls.CHUNK_SIZE + 1
+        new_idxs = np.array(sorted(new_idxs), dtype=int)
+        return {
+            chemsys: combos
+            for chemsys, combos in combos_dict.items()
+            if np.isin(combos, new_idxs).any()
+        }
 
-        return n
+    @staticmethod
+    def _filter_rxn_iterable_by_new_entries(rxn_iterable, new_idxs):
+        """Only keep the reactant/product pairs which include a new entry."""
+        return (
+            rp
+            for rp in rxn_iterable
+            if not new_idxs.isdisjoint(rp[0])
+            or (rp[1] and not new_idxs.isdisjoint(rp[1]))
+        )
 
     @staticmethod
-    def _rxn_iter_length(combos, open_combos):
-        _ = open_combos  # not used
+    def _keep_existing_rxn(chemsys, new_elem_sets):
+        """Whether a previously enumerated reaction (in the provided chemical system)
+        is still valid after adding the new entries. Always True for the
+        BasicEnumerator, as reactions do not depend on other entries."""
+        _ = (chemsys, new_elem_sets)  # unused arguments
+        return True
+
+    def _get_precursor_idxs(self, entries, precursors) -> Optional[Set[int]]:
+        """
+        Returns the indices of the precursor entries when precursors are exclusive. In
+        this case, reactant/product pairs are generated directly from the precursor
+        combinations. Returns None otherwise.
+        """
+        if not (self.exclusive_precursors and precursors):
+            return None
+
+        return {idx for idx, e in enumerate(entries.entries_list) if e in precursors}
+
+    @classmethod
+    def _rxn_iter_length(cls, combos, open_combos, precursor_idxs=None):
+        if precursor_idxs is not None:
+            return count_precursor_combo_pairs(get_combo_tuples(combos), precursor_idxs)
+
         return comb(len(combos), 2)
 
+    @classmethod
+    def _new_rxn_iter_length(cls, combos, open_combos, precursor_idxs, new_idxs):
+        """
+        Returns the number of reactant/product pairs which include a new entry (see
+        _filter_rxn_iterable_by_new_entries()) without generating them: all pairs,
+        minus the pairs made only of combinations without new entries.
+        """
+        new_idxs_array = np.array(sorted(new_idxs), dtype=int)
+        old_combos = combos[~np.isin(combos, new_idxs_array).any(axis=1)]
+        old_open_combos = [c for c in open_combos if new_idxs.isdisjoint(c)]
+
+        num_pairs = cls._rxn_iter_length(combos, open_combos, precursor_idxs)
+        num_old_pairs = cls._rxn_iter_length(
+            old_combos, old_open_combos, precursor_idxs
+        )
+        return num_pairs - num_old_pairs
+
     def _get_combos_dict(
         self, entries, precursor_entries, target_entries, open_entries
     ):
         """
         Gets all possible entry combinations up to predefined cardinality (n), filtered
-        and grouped by chemical system.
+        and grouped by chemical system. Combinations are represented as fixed-width
+        arrays of entry indices (padded with -1) and are grouped using element
+        bitmasks.
         """
         precursor_elems = [
             [str(el) for el in e.composition.elements] for e in precursor_entries
@@ -270,10 +733,14 @@ class BasicEnumerator(Enumerator):
         ]
         all_open_elems = {el for e in open_entries for el in e.composition.elements}
 
-        entries = entries - open_entries
+        entries_list = entries.entries_list
+        elems = sorted(entries.chemsys)
+        entry_masks, elem_bits = get_elem_bitmasks(entries_list, elems)
+        open_mask = sum(elem_bits[str(el)] for el in all_open_elems)
 
-        combos = [set(c) for c in limited_powerset(entries, self.n)]
-        combos_dict = group_by_chemsys(combos, all_open_elems)
+        indices = [idx for idx, e in enumerate(entries_list) if e not in open_entries]
+        combos = get_combos_array(indices, self.n)
+        combos_dict = group_combos_by_chemsys(combos, entry_masks, elems, open_mask)
 
         filtered_combos = self._filter_dict_by_elems(
             combos_dict,
@@ -285,24 +752,34 @@ class BasicEnumerator(Enumerator):
         return filtered_combos
 
     def _get_open_combos(  # pylint: disable=useless-return
-        self, open_entries
+        self, entries, open_entries
     ) -> Optional[List[Set[ComputedEntry]]]:
         """No open entries for BasicEnumerator, returns None"""
-        _ = (self, open_entries)  # unused_arguments
+        _ = (self, entries, open_entries)  # unused_arguments
         return None
 
     @staticmethod
-    def _react_function(reactants, products, **kwargs):
+    def _react_function(rxn_pairs, **kwargs):
+        """Balances all (reactants, products) pairs in a single vectorized batch
+        (see ComputedReaction.balance_batch()). Returns a list containing the forward
+        and backward reactions for each pair."""
         _ = kwargs  # unused_argument
-        forward_rxn = ComputedReaction.balance(reactants, products)
-        backward_rxn = forward_rxn.reverse()
-        return [forward_rxn, backward_rxn]
+        all_reactants, all_products = zip(*rxn_pairs)
+        forward_rxns = ComputedReaction.balance_batch(
+            [list(r) for r in all_reactants], [list(p) for p in all_products]
+        )
+        return [[rxn, rxn.reverse()] for rxn in forward_rxns]
 
     @staticmethod
-    def _get_rxn_iterable(combos, open_combos):
-        """Get all reaction/product combinations"""
+    def _get_rxn_iterable(combos, open_combos, precursor_idxs=None):
+        """Get all reaction/product combinations. If precursor indices are provided,
+        only pairs where one side consists solely of precursors are generated."""
         _ = open_combos  # unused argument
 
+        combos = get_combo_tuples(combos)
+        if precursor_idxs is not None:
+            return get_precursor_combo_pairs(combos, precursor_idxs)
+
         return combinations(combos, 2)
 
     def _get_initialized_entries(self, entries):
@@ -314,8 +791,11 @@ class BasicEnumerator(Enumerator):
 
         precursors, targets = set(), set()
 
+        if self.calculate_e_above_hulls:  # e_above_hull is written to entry.data
+            entries = {self._copy_entry(e) for e in entries}
+
         entries_new = GibbsEntrySet(
-            deepcopy(entries), calculate_e_above_hulls=self.calculate_e_above_hulls
+            entries, calculate_e_above_hulls=self.calculate_e_above_hulls
         )
 
         if self.precursors:
@@ -339,8 +819,6 @@ class BasicEnumerator(Enumerator):
             entries_new = entries_new.filter_by_stability(e_above_hull=0.0)
             logger.info("Filtering by stable entries!")
 
-        entries_new.build_indices()
-
         open_entries = set()
         if self.open_phases:
             open_entries = {
@@ -351,6 +829,14 @@ class BasicEnumerator(Enumerator):
 
         return entries_new, precursors, targets, open_entries
 
+    @staticmethod
+    def _copy_entry(entry):
+        """Returns a shallow copy of an entry with its own data dictionary, such that
+        the caller's entry is not modified during enumeration."""
+        new_entry = copy(entry)
+        new_entry.data = dict(entry.data)
+        return new_entry
+
     def _filter_dict_by_elems(
         self,
         combos_dict,
@@ -476,39 +962,78 @@ class BasicOpenEnumerator(BasicEnumerator):
         )
         self.open_phases: List[str] = open_phases
 
-    @staticmethod
-    def _rxn_iter_length(combos, open_combos):
-        num_combos_with_open = sum(
-            1 if not i & j else 0 for i in combos for j in open_combos
-        )
+    @classmethod
+    def _rxn_iter_length(cls, combos, open_combos, precursor_idxs=None):
+        combos = get_combo_tuples(combos)
+
+        allowed_idxs = set()
+        if precursor_idxs is not None:
+            allowed_idxs = precursor_idxs.union(*open_combos)
+
+        num_combos_with_open = 0
+        num_precursor_combos_with_open = 0  # see _get_rxn_iterable()
+        for combo in combos:
+            num = sum(1 for j in open_combos if set(combo).isdisjoint(j))
+            num_combos_with_open += num
+            if allowed_idxs.issuperset(combo):
+                num_precursor_combos_with_open += num
+
+        if precursor_idxs is not None:
+            num_precursor_combos = sum(
+                1 for c in combos if precursor_idxs.issuperset(c)
+            )
+            return (
+                num_precursor_combos * num_combos_with_open
+                + (len(combos) - num_precursor_combos) * num_precursor_combos_with_open
+            )
 
         return len(combos) * num_combos_with_open
 
-    def _get_open_combos(self, open_entries):
-        """Get all possible combinations of open entries. For a single entry,
-        this is just the entry itself."""
-        open_combos = [
-            set(c) for c in limited_powerset(open_entries, len(open_entries))
+    def _get_open_combos(self, entries, open_entries):
+        """Get all possible combinations of open entries (as tuples of entry indices).
+        For a single entry, this is just the entry itself."""
+        open_idxs = [
+            idx for idx, e in enumerate(entries.entries_list) if e in open_entries
         ]
+        open_combos = get_combo_tuples(get_combos_array(open_idxs, len(open_entries)))
         return open_combos
 
     @staticmethod
-    def _get_rxn_iterable(combos, open_combos):
-        """Get all reaction/product combinations."""
+    def _get_rxn_iterable(combos, open_combos, precursor_idxs=None):
+        """Get all reaction/product combinations. If precursor indices are provided,
+        only pairs where one side consists solely of precursors (and open entries) are
+        generated."""
+        combos = get_combo_tuples(combos)
         combos_with_open = [
-            combo | open_combo
+            combo + open_combo
             for combo in combos
             for open_combo in open_combos
-            if not combo & open_combo
+            if set(combo).isdisjoint(open_combo)
         ]
+
+        if precursor_idxs is not None:
+            allowed_idxs = precursor_idxs.union(*open_combos)
+            precursor_combos_with_open = [
+                c for c in combos_with_open if allowed_idxs.issuperset(c)
+            ]
+            return (
+                (combo, combo_with_open)
+                for combo in combos
+                for combo_with_open in (
+                    combos_with_open
+                    if precursor_idxs.issuperset(combo)
+                    else precursor_combos_with_open
+                )
+            )
+
         rxn_iter = product(combos, combos_with_open)
 
         return rxn_iter
 
 
-@ray.remote
 def _react(
     rxn_iterable,
+    entries,
     react_function,
     open_entries,
     precursors,
@@ -521,68 +1046,221 @@ def _react(
     filtered_entries,
     pd,
     grand_pd,
+    counts=None,
 ):
     """
     This function is a wrapper for the specific react function of each enumerator. This
     wrapper contains the logic used for filtering out reactions based on the
-    user-defined enumerator settings. It can also be called as a remote function using
-    ray, allowing for parallel computation during reaction enumeration.
+    user-defined enumerator settings. It is submitted to an Executor (e.g. as a remote
+    function using ray), allowing for parallel computation during reaction enumeration.
+
+    Reactant/product combinations are provided as tuples of entry indices, which are
+    converted back to entries using the provided list of entries. If a counts
+    dictionary is provided, the number of rejected pairs/reactions (by reason, see
+    EnumerationMetrics) and the time spent in the react function ("balance_time") are
+    added to it.
 
     Note: this function is not intended to to be called directly!
 
     """
     all_rxns = []
 
+    if counts is None:
+        counts = {}
+
+    def reject(reason):
+        counts[reason] = counts.get(reason, 0) + 1
+
+    precursor_func = (
+        getattr(precursors | open_entries, p_set_func) if precursors else lambda e: True
+    )
+    target_func = (
+        getattr(targets | open_entries, t_set_func) if targets else lambda e: True
+    )
+
+    rxn_pairs = []
     for rp in rxn_iterable:
         if not rp:
             continue
 
-        r = set(rp[0]) if rp[0] else set()
-        p = set(rp[1]) if rp[1] else set()
+        r = {entries[i] for i in rp[0]} if rp[0] else set()
+        p = {entries[i] for i in rp[1]} if rp[1] else set()
 
         all_phases = r | p
 
-        precursor_func = (
-            getattr(precursors | open_entries, p_set_func)
-            if precursors
-            else lambda e: True
-        )
-        target_func = (
-            getattr(targets | open_entries, t_set_func) if targets else lambda e: True
-        )
-
-        if (
-            (r & p)
-            or (precursors and not precursors & all_phases)
-            or (p and targets and not targets & all_phases)
-        ):
+        if r & p:
+            reject("shared_phases")
+            continue
+        if precursors and not precursors & all_phases:
+            reject("precursors")
+            continue
+        if p and targets and not targets & all_phases:
+            reject("targets")
             continue
 
         if not (precursor_func(r) or (p and precursor_func(p))):
+            reject("precursors")
             continue
         if p and not (target_func(r) or target_func(p)):
+            reject("targets")
             continue
 
-        suggested_rxns = react_function(
-            r, p, filtered_entries=filtered_entries, pd=pd, grand_pd=grand_pd
-        )
+        rxn_pairs.append((r, p))
+
+    if not rxn_pairs:
+        return all_rxns
 
+    entry_idxs = {e: idx for idx, e in enumerate(entries)}
+
+    start = perf_counter()
+    all_suggested_rxns = react_function(
+        rxn_pairs, filtered_entries=filtered_entries, pd=pd, grand_pd=grand_pd
+    )
+    counts["balance_time"] = counts.get("balance_time", 0.0) + perf_counter() - start
+
+    for suggested_rxns in all_suggested_rxns:
         rxns = []
         for rxn in suggested_rxns:
-            if (
-                rxn.is_identity
-                or (remove_unbalanced and not rxn.balanced)
-                or (remove_changed and rxn.lowest_num_errors != 0)
-                or rxn.data["num_constraints"] > max_num_constraints
-            ):
+            if rxn.is_identity:
+                reject("identity")
+                continue
+            if remove_unbalanced and not rxn.balanced:
+                reject("unbalanced")
+                continue
+            if remove_changed and rxn.lowest_num_errors != 0:
+                reject("changed")
+                continue
+            if rxn.data["num_constraints"] > max_num_constraints:
+                reject("num_constraints")
                 continue
 
             reactant_entries = set(rxn.reactant_entries) - open_entries
             product_entries = set(rxn.product_entries) - open_entries
 
-            if precursor_func(reactant_entries) and target_func(product_entries):
-                rxns.append(get_rxn_info(rxn))
+            if not precursor_func(reactant_entries):
+                reject("precursors")
+                continue
+            if not target_func(product_entries):
+                reject("targets")
+                continue
+
+            rxns.append(get_rxn_info(rxn, entry_idxs))
 
         all_rxns.extend(rxns)
 
     return all_rxns
+
+
+def _react_timed(rxn_iterable, *args):
+    """
+    Calls _react() and additionally returns the number of reactant/product pairs, the
+    time taken (used for adapting the chunk size), the counts collected by _react()
+    (used for the enumeration metrics), and the nullspaces added to the balancing
+    cache (which are merged into the cache of the main process).
+
+    The last two arguments are the balancing cache of the main process (or None), and
+    the tuple of (filtered entries, phase diagram, grand potential phase diagram) for
+    the chemical system, as returned by _get_phase_diagrams().
+    """
+    *args, balancing_cache, pd_data = args  # type: ignore
+
+    previous_cache = get_balancing_cache()
+    set_balancing_cache(balancing_cache)
+
+    start = perf_counter()
+    counts = {}  # type: ignore
+    try:
+        results = _react(rxn_iterable, *args, *pd_data, counts=counts)
+    finally:
+        set_balancing_cache(previous_cache)
+    elapsed = perf_counter() - start
+
+    nullspaces = balancing_cache.pop_new() if balancing_cache is not None else {}
+
+    return len(rxn_iterable), elapsed, results, counts, nullspaces
+
+
+def _get_phase_diagrams(
+    entries, fingerprint, elems, build_pd, build_grand_pd, chempots
+):
+    """
+    Acquires the entries and phase diagrams used by the react function for a single
+    chemical system. This is submitted as its own task (see
+    BasicEnumerator._iter_chunk_results()), such that phase diagrams are built in
+    parallel with reaction enumeration. Phase diagrams built by process or Ray workers
+    are added to the phase diagram cache of the main process afterwards (see
+    _add_phase_diagrams()).
+
+    Args:
+        entries: The full GibbsEntrySet
+        fingerprint: Fingerprint of the entries (see GibbsEntrySet.fingerprint)
+        elems: Elements of the chemical system
+        build_pd: Whether to build the phase diagram
+        build_grand_pd: Whether to build the grand potential phase diagram(s)
+        chempots: Chemical potentials of the grand potential phase diagram, or a list
+            of chemical potentials (one grand potential phase diagram per item)
+
+    Returns:
+        Tuple of (filtered entries, phase diagram, grand potential phase diagram(s))
+    """
+    pd_cache = get_pd_cache()
+    filtered_entries = entries.get_subset_in_chemsys(elems)
+
+    pd = None
+    if build_pd:
+        pd = pd_cache.get_pd(entries, elems, fingerprint)
+
+    grand_pd = None
+    if build_grand_pd and isinstance(chempots, list):
+        grand_pd = [
+            pd_cache.get_grand_pd(entries, c, elems, fingerprint) for c in chempots
+        ]
+    elif build_grand_pd:
+        grand_pd = pd_cache.get_grand_pd(entries, chempots, elems, fingerprint)
+
+    return filtered_entries, pd, grand_pd
+
+
+def _get_cached_phase_diagrams(
+    entries, fingerprint, elems, build_pd, build_grand_pd, chempots
+):
+    """
+    Returns the same tuple as _get_phase_diagrams() if all of the required phase
+    diagrams are in the phase diagram cache of the current process, otherwise None.
+    """
+    pd_cache = get_pd_cache()
+
+    pd = None
+    if build_pd:
+        pd = pd_cache.get_cached(fingerprint, elems)
+        if pd is None:
+            return None
+
+    grand_pd = None
+    if build_grand_pd:
+        chempots_list = chempots if isinstance(chempots, list) else [chempots]
+        grand_pds = [pd_cache.get_cached(fingerprint, elems, c) for c in chempots_list]
+        if any(grand_pd is None for grand_pd in grand_pds):
+            return None
+
+        grand_pd = grand_pds if isinstance(chempots, list) else grand_pds[0]
+
+    return entries.get_subset_in_chemsys(elems), pd, grand_pd
+
+
+def _add_phase_diagrams(pd_data, fingerprint, elems, chempots):
+    """
+    Adds the phase diagrams returned by _get_phase_diagrams() (e.g., as built by a
+    worker process) to the phase diagram cache of the current process.
+    """
+    pd_cache = get_pd_cache()
+    _, pd, grand_pd = pd_data
+
+    if pd is not None:
+        pd_cache.add(pd, fingerprint, elems)
+
+    if grand_pd is not None:
+        grand_pds = grand_pd if isinstance(chempots, list) else [grand_pd]
+        chempots_list = chempots if isinstance(chempots, list) else [chempots]
+        for g, c in zip(grand_pds, chempots_list):
+            pd_cache.add(g, fingerprint, elems, c)
@@ -4,17 +4,21 @@ minimization technique, with or without the option of an open entry.
 """
 
 from itertools import product
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 
-from pymatgen.analysis.interface_reactions import (
-    GrandPotentialInterfacialReactivity,
-    InterfacialReactivity,
-)
+import numpy as np
 from pymatgen.core.composition import Element
 
 from rxn_network.core.composition import Composition
+from rxn_network.entries.entry_set import GibbsEntrySet
 from rxn_network.enumerators.basic import BasicEnumerator
-from rxn_network.enumerators.utils import get_computed_rxn
+from rxn_network.enumerators.utils import get_combo_tuples
+from rxn_network.reactions.basic import TOLERANCE
+from rxn_network.reactions.computed import ComputedReaction
+from rxn_network.reactions.open import OpenComputedReaction
+from rxn_network.reactions.reaction_set import ReactionSet
+from rxn_network.thermo.kinks import Kink, KinkFinder
+from rxn_network.utils.executors import Executor
 
 
 class MinimizeGibbsEnumerator(BasicEnumerator):
@@ -64,39 +68,75 @@ class MinimizeGibbsEnumerator(BasicEnumerator):
 
     @staticmethod
     def _react_function(
-        reactants, products, filtered_entries=None, pd=None, grand_pd=None, **kwargs
+        rxn_pairs, filtered_entries=None, pd=None, grand_pd=None, **kwargs
     ):
         """React method for MinimizeGibbsEnumerator, which uses the interfacial reaction
-        approach (see _react_interface())"""
+        approach (see react_interfaces())"""
+        interfaces = []
+        for reactants, _ in rxn_pairs:
+            r = list(reactants)
+            r0 = r[0]
 
-        r = list(reactants)
-        r0 = r[0]
+            if len(r) == 1:
+                r1 = r[0]
+            else:
+                r1 = r[1]
 
-        if len(r) == 1:
-            r1 = r[0]
-        else:
-            r1 = r[1]
-
-        return react_interface(
-            r0.composition,
-            r1.composition,
-            filtered_entries,
-            pd,
-            grand_pd,
-        )
+            interfaces.append((r0.composition, r1.composition))
+
+        return react_interfaces(interfaces, filtered_entries, pd, grand_pd)
 
     @staticmethod
-    def _get_rxn_iterable(combos, open_combos):
-        """Gets the iterable used to generate reactions"""
+    def _get_rxn_iterable(combos, open_combos, precursor_idxs=None):
+        """Gets the iterable used to generate reactions. If precursor indices are
+        provided, only combinations consisting solely of precursors are used."""
         _ = open_combos  # unused argument
 
+        combos = get_combo_tuples(combos)
+        if precursor_idxs is not None:
+            combos = [c for c in combos if precursor_idxs.issuperset(c)]
+
         return product(combos, [None])
 
     @staticmethod
-    def _rxn_iter_length(combos, open_combos):
+    def _filter_combos_by_new_entries(combos_dict, new_idxs, new_elem_sets):
+        """Keep the chemical systems whose phase diagram includes a new entry. All
+        combos in these systems are kept, as the new entries may change the predicted
+        reactions between any pair of reactants."""
+        _ = new_idxs  # unused argument
+
+        return {
+            chemsys: combos
+            for chemsys, combos in combos_dict.items()
+            if any(elems.issubset(chemsys.split("-")) for elems in new_elem_sets)
+        }
+
+    @staticmethod
+    def _filter_rxn_iterable_by_new_entries(rxn_iterable, new_idxs):
+        """All reactants in affected chemical systems must be re-reacted."""
+        _ = new_idxs  # unused argument
+        return rxn_iterable
+
+    @staticmethod
+    def _keep_existing_rxn(chemsys, new_elem_sets):
+        """Reactions in chemical systems including a new entry are replaced."""
+        return not any(elems.issubset(chemsys) for elems in new_elem_sets)
+
+    @staticmethod
+    def _rxn_iter_length(combos, open_combos, precursor_idxs=None):
         _ = open_combos
+        if precursor_idxs is not None:
+            is_precursor = np.isin(combos, list(precursor_idxs)) | (combos < 0)
+            return int(is_precursor.all(axis=1).sum())
+
         return len(combos)
 
+    @classmethod
+    def _new_rxn_iter_length(cls, combos, open_combos, precursor_idxs, new_idxs):
+        """All reactants in affected chemical systems are re-reacted."""
+        _ = new_idxs  # unused argument
+        return cls._rxn_iter_length(combos, open_combos, precursor_idxs)
+
 
 class MinimizeGrandPotentialEnumerator(MinimizeGibbsEnumerator):
     """
@@ -151,63 +191,261 @@ class MinimizeGrandPotentialEnumerator(MinimizeGibbsEnumerator):
         self.chempots = {self.open_elem: self.mu}
         self._build_grand_pd = True
 
+    def enumerate_sweep(
+        self,
+        entries: GibbsEntrySet,
+        mus: Iterable[float],
+        batch_size=None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> Dict[float, ReactionSet]:
+        """
+        Calculate the reactions predicted at each of several chemical potentials of the
+        open element. This is equivalent to calling enumerate() with an enumerator for
+        every chemical potential, but entry initialization, combo generation and
+        phase diagram construction are only performed once for the whole sweep.
+
+        Args:
+            entries: the set of all entries to enumerate from
+            mus: the chemical potentials of the open element
+            batch_size: maximum number of chunks submitted to the workers at once
+            executor: the execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
+
+        Returns:
+            A dictionary of ReactionSets keyed by chemical potential.
+        """
+        mus = [float(mu) for mu in mus]
+
+        entries_list, chunk_results, metrics = self._get_chunk_results(
+            entries,
+            batch_size,
+            executor,
+            chempots_list=[{self.open_elem: mu} for mu in mus],
+        )
+
+        all_results = self._flatten_chunk_results(chunk_results, group_by="mu")
+
+        rxn_sets = {}
+        for mu in mus:
+            all_indices, all_coeffs, all_data = all_results.get(mu, ([], [], []))
+            rxn_set = ReactionSet(
+                entries_list, all_indices, all_coeffs, all_data=all_data
+            )
+            rxn_set = rxn_set.filter_duplicates()
+            rxn_set.metrics = metrics
+            rxn_sets[mu] = rxn_set
+
+        return rxn_sets
+
     @staticmethod
     def _react_function(
-        reactants, products, filtered_entries=None, pd=None, grand_pd=None, **kwargs
+        rxn_pairs, filtered_entries=None, pd=None, grand_pd=None, **kwargs
     ):
         """Same as the MinimizeGibbsEnumerator react function, but with ability to
-        specify open element and grand potential phase diagram"""
-        r = list(reactants)
-        r0 = r[0]
+        specify open element and grand potential phase diagram. If a list of grand
+        potential phase diagrams is provided (see enumerate_sweep()), the reactions for
+        every diagram are returned, with the chemical potential stored in rxn.data."""
+        if isinstance(grand_pd, list):
+            all_rxns = [[] for _ in rxn_pairs]
+            for gpd in grand_pd:
+                mu = list(gpd.chempots.values())[0]
+                for rxns, mu_rxns in zip(
+                    all_rxns,
+                    MinimizeGrandPotentialEnumerator._react_function(
+                        rxn_pairs, filtered_entries, pd, gpd
+                    ),
+                ):
+                    for rxn in mu_rxns:
+                        rxn.data["mu"] = mu
+                    rxns.extend(mu_rxns)
 
-        if len(r) == 1:
-            r1 = r[0]
-        else:
-            r1 = r[1]
+            return all_rxns
 
         open_elem = list(grand_pd.chempots.keys())[0]
 
-        for reactant in r:
-            elems = reactant.composition.elements
-            if len(elems) == 1 and elems[0] == open_elem:  # skip if reactant = open_e
-                return []
-
-        return react_interface(
-            r0.composition,
-            r1.composition,
-            filtered_entries,
-            pd,
-            grand_pd=grand_pd,
-        )
+        all_rxns = []
+        interfaces, interface_idxs = [], []
+        for reactants, _ in rxn_pairs:
+            r = list(reactants)
+            r0 = r[0]
+
+            if len(r) == 1:
+                r1 = r[0]
+            else:
+                r1 = r[1]
+
+            all_rxns.append([])
+
+            if any(
+                len(reactant.composition.elements) == 1
+                and reactant.composition.elements[0] == open_elem
+                for reactant in r
+            ):  # skip if reactant = open_e
+                continue
+
+            interfaces.append((r0.composition, r1.composition))
+            interface_idxs.append(len(all_rxns) - 1)
+
+        for idx, rxns in zip(
+            interface_idxs,
+            react_interfaces(interfaces, filtered_entries, pd, grand_pd=grand_pd),
+        ):
+            all_rxns[idx] = rxns
+
+        return all_rxns
 
 
 def react_interface(r1, r2, filtered_entries, pd, grand_pd=None):
-    """Simple API for InterfacialReactivity module from pymatgen."""
-    chempots = None
+    """Simple API for finding the reactions predicted along the interface between two
+    reactants (see react_interfaces())."""
+    return react_interfaces([(r1, r2)], filtered_entries, pd, grand_pd=grand_pd)[0]
 
+
+def react_interfaces(interfaces, filtered_entries, pd, grand_pd=None):
+    """
+    Finds the reactions predicted at the "kinks" along each interface (i.e. mixing
+    line between two reactant compositions) using a KinkFinder, which reproduces the
+    InterfacialReactivity module from pymatgen for many interfaces at once.
+
+    The reaction at each kink is already balanced by the mixing ratio and the product
+    amounts, so its entries and coefficients are acquired directly (see
+    get_kink_rxn()) rather than by balancing the reaction again.
+
+    Args:
+        interfaces: List of (reactant 1, reactant 2) compositions.
+        filtered_entries: Entries used for acquiring the reactant/product entries.
+        pd: PhaseDiagram of the chemical system.
+        grand_pd: Optional GrandPotentialPhaseDiagram of the chemical system; if
+            provided, it is used instead of pd.
+
+    Returns:
+        A list containing the list of reactions for each interface.
+    """
+    chempots = None
     if grand_pd:
-        interface = GrandPotentialInterfacialReactivity(
-            r1,
-            r2,
-            grand_pd,
-            pd_non_grand=pd,
-            norm=True,
-            include_no_mixing_energy=True,
-            use_hull_energy=True,
-        )
+        kink_finder = KinkFinder(grand_pd)
         chempots = grand_pd.chempots
-
     else:
-        interface = InterfacialReactivity(
-            r1,
-            r2,
-            pd,
-            use_hull_energy=True,
-        )
+        kink_finder = KinkFinder(pd)
+
+    entry_cache: Dict = {}
+
+    all_rxns = []
+    for (r1, r2), kinks in zip(interfaces, kink_finder.get_kinks(interfaces)):
+        rxns = []
+        for kink in kinks:
+            try:
+                rxns.append(
+                    get_kink_rxn(kink, r1, r2, filtered_entries, chempots, entry_cache)
+                )
+            except ValueError:  # no products
+                continue
+        all_rxns.append(rxns)
+
+    return all_rxns
+
+
+def get_kink_rxn(
+    kink: Kink,
+    r1: Composition,
+    r2: Composition,
+    filtered_entries: GibbsEntrySet,
+    chempots: Optional[Dict[Element, float]] = None,
+    entry_cache: Optional[Dict] = None,
+) -> ComputedReaction:
+    """
+    Converts a kink along the interface between two reactants (see KinkFinder) into a
+    ComputedReaction. The reactants and products are mapped onto the ground state
+    entries with the same formulas, and the coefficients are calculated from the
+    mixing ratio and the product amounts; the amount of any open element follows from
+    the mass balance. The result is the same reaction that would be acquired by
+    balancing the reactants and products, normalized such that the largest product
+    coefficient is 1.
+
+    Args:
+        kink: A kink (x, reactants, products, amounts) as returned by KinkFinder.
+        r1: Composition of the first reactant of the interface.
+        r2: Composition of the second reactant of the interface.
+        filtered_entries: Entries used for acquiring the reactant/product entries.
+        chempots: Optional chemical potentials of the open elements. If provided, an
+            OpenComputedReaction is returned.
+        entry_cache: Optional dict used to store the entry (and its reduced
+            composition) found for each reactant/product; this avoids repeated
+            formula lookups when converting many kinks. Only valid for kinks from the
+            same KinkFinder and pairs of reactants.
+
+    Returns:
+        A ComputedReaction (or OpenComputedReaction) object.
+
+    Raises:
+        ValueError: if the kink has no products (e.g., nothing is formed at an
+            endpoint of the interface).
+    """
+    x, reactants, products, amounts = kink
+
+    if entry_cache is None:
+        entry_cache = {}
+
+    open_elems = list(chempots) if chempots else []
+    num_reactants = len(reactants) - len(open_elems)
+
+    keys = [id(r) for r in reactants[:num_reactants]] + open_elems
+    keys += [id(p) for p in products]
+
+    entries, comps, coeff_list = [], [], []
+    for idx, key in enumerate(keys):
+        if key not in entry_cache:
+            if idx < len(reactants):
+                formula = reactants[idx].reduced_formula
+            else:
+                formula = products[idx - len(reactants)].name
+            entry = filtered_entries.get_min_entry_by_formula(formula)
+            comp = dict(entry.composition.reduced_composition.items())
+            num_atoms = sum(amt for el, amt in comp.items() if el not in open_elems)
+            entry_cache[key] = (entry, comp, num_atoms)
+
+        entry, comp, num_atoms = entry_cache[key]
+        entries.append(entry)
+        comps.append(comp)
+
+        if idx < num_reactants:
+            if num_reactants == 1:
+                weight = 1.0
+            else:
+                weight = x if reactants[idx] is r1 else 1.0 - x
+            coeff_list.append(-weight / num_atoms)
+        elif idx < len(reactants):
+            coeff_list.append(0.0)  # open element; calculated from the mass balance
+        else:
+            coeff_list.append(amounts[idx - len(reactants)] / num_atoms)
+
+    elems = sorted({el for comp in comps for el in comp})
+    comp_matrix = np.array([[comp.get(el, 0.0) for el in elems] for comp in comps])
+    coeffs = np.array(coeff_list)
+
+    for idx, el in enumerate(open_elems, start=num_reactants):
+        col = elems.index(el)
+        coeffs[idx] = -np.dot(coeffs, comp_matrix[:, col]) / comp_matrix[idx, col]
+
+    scale = coeffs.max()  # largest product coefficient (including open elements)
+    if scale <= 0:
+        raise ValueError(f"No products found for kink at x = {x}!")
+
+    coeffs = coeffs / scale
+
+    # an error = a component disappearing (e.g., an open element that does not react)
+    reactant_idxs = [i for i, c in enumerate(coeffs) if c < -TOLERANCE]
+    product_idxs = [i for i, c in enumerate(coeffs) if c > TOLERANCE]
+    order = reactant_idxs + product_idxs
+    lowest_num_errors = len(coeffs) - len(order)
+
+    diff = len(order) - np.linalg.matrix_rank(comp_matrix[order])
+    data = {"num_constraints": diff if diff >= 2 else 1}
+
+    entries = [entries[i] for i in order]
+    coeffs = coeffs[order]
 
-    rxns = []
-    for _, _, _, rxn, _ in interface.get_kinks():
-        rxn = get_computed_rxn(rxn, filtered_entries, chempots)
-        rxns.append(rxn)
+    if chempots:
+        return OpenComputedReaction(entries, coeffs, chempots, data, lowest_num_errors)
 
-    return rxns
+    return ComputedReaction(entries, coeffs, data, lowest_num_errors)
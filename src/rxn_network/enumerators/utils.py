@@ -1,8 +1,26 @@
 """
 Utility functions used by the enumerator classes.
 """
-from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from collections import Counter
+from itertools import combinations
+from math import ceil
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+import numpy as np
+from monty.json import MSONable
+from monty.serialization import dumpfn, loadfn
 from pymatgen.analysis.phase_diagram import PhaseDiagram
 from pymatgen.core.composition import Element
 from pymatgen.entries.computed_entries import ComputedEntry, Entry
@@ -11,6 +29,7 @@ from rxn_network.core.reaction import Reaction
 from rxn_network.entries.entry_set import GibbsEntrySet
 from rxn_network.reactions.computed import ComputedReaction
 from rxn_network.reactions.open import OpenComputedReaction
+from rxn_network.reactions.reaction_set import ReactionSet
 
 
 def get_elems_set(entries: Iterable[Entry]) -> Set[str]:
@@ -66,6 +85,195 @@ def group_by_chemsys(
     return combo_dict
 
 
+def get_combos_array(indices: Sequence[int], max_size: int) -> np.ndarray:
+    """
+    Returns every combination of the provided entry indices, ranging in size from 1 to
+    max_size, as a fixed-width integer array. Combinations smaller than max_size are
+    padded with -1.
+
+    Args:
+        indices: Sequence of entry indices
+        max_size: Upper limit for the size of each combination
+
+    Returns:
+        Array of shape (num_combos, max_size)
+    """
+    idx_array = np.array(indices, dtype=np.int32)
+    num_indices = len(idx_array)
+
+    arrays = []
+    positions = np.empty((1, 0), dtype=np.int32)
+    for size in range(1, max_size + 1):
+        positions = _extend_combos(positions, num_indices)
+
+        combos = np.full((len(positions), max_size), -1, dtype=np.int32)
+        combos[:, :size] = idx_array[positions]
+        arrays.append(combos)
+
+    return np.concatenate(arrays)
+
+
+def _extend_combos(positions: np.ndarray, num_indices: int) -> np.ndarray:
+    """
+    Extends every combination (of positions in range(num_indices), in increasing
+    order) by one position greater than its last one. The rows stay in lexicographic
+    order, as in itertools.combinations().
+    """
+    last = positions[:, -1] if positions.shape[1] else np.full(len(positions), -1)
+    counts = num_indices - 1 - last
+
+    rows = np.repeat(np.arange(len(positions)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    new = np.repeat(last + 1, counts) + np.arange(len(rows)) - starts
+
+    return np.column_stack([positions[rows], new]).astype(np.int32)
+
+
+def get_elem_bitmasks(
+    entries: List[Entry], elems: List[str]
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Returns an integer bitmask for every entry, where bit i is set if the entry contains
+    the i-th element in elems.
+
+    Args:
+        entries: List of entry-like objects (ordered by entry index)
+        elems: Sorted list of element names spanning the chemical system
+
+    Returns:
+        Tuple of (array of entry bitmasks, dict mapping element name to its bit)
+    """
+    if len(elems) > 63:
+        raise ValueError("Bitmask representation supports at most 63 elements!")
+
+    elem_bits = {el: 1 << i for i, el in enumerate(elems)}
+    masks = np.array(
+        [sum(elem_bits[str(el)] for el in e.composition.elements) for e in entries],
+        dtype=np.int64,
+    )
+    return masks, elem_bits
+
+
+def group_combos_by_chemsys(
+    combos: np.ndarray,
+    entry_masks: np.ndarray,
+    elems: List[str],
+    open_mask: int = 0,
+) -> Dict[str, np.ndarray]:
+    """
+    Groups an array of entry combinations (see get_combos_array()) by chemical system.
+    The chemical system of each combination is found via a vectorized bitwise-OR of the
+    element bitmasks of its entries.
+
+    Args:
+        combos: Array of entry indices of shape (num_combos, max_size), padded with -1
+        entry_masks: Array of element bitmasks for every entry (see get_elem_bitmasks())
+        elems: Sorted list of element names corresponding to the bits in entry_masks
+        open_mask: Optional bitmask of open elements to include in every chemical system
+
+    Returns:
+        Dictionary of combination arrays grouped by chemical system string
+    """
+    padded_masks = np.append(entry_masks, np.int64(0))  # index -1 -> empty mask
+    combo_masks = np.bitwise_or.reduce(padded_masks[combos], axis=1) | open_mask
+
+    unique_masks, inverse = np.unique(combo_masks, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    splits = np.cumsum(np.bincount(inverse, minlength=len(unique_masks)))[:-1]
+
+    combos_dict = {}
+    for mask, group in zip(unique_masks, np.split(order, splits)):
+        chemsys = "-".join(el for i, el in enumerate(elems) if int(mask) >> i & 1)
+        combos_dict[chemsys] = combos[group]
+
+    return combos_dict
+
+
+def get_combo_tuples(combos: np.ndarray) -> List[Tuple[int, ...]]:
+    """
+    Converts an array of padded entry combinations into a list of index tuples.
+
+    Args:
+        combos: Array of entry indices of shape (num_combos, max_size), padded with -1
+
+    Returns:
+        List of tuples of entry indices
+    """
+    return [tuple(i for i in c if i >= 0) for c in combos.tolist()]
+
+
+def get_precursor_combo_pairs(
+    combos: List[Tuple[int, ...]], precursor_idxs: Set[int]
+) -> Iterator[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """
+    Yields the same (disjoint) pairs of combinations as combinations(combos, 2), but
+    restricted to pairs where at least one of the combinations contains only
+    precursors. This avoids generating pairs which would be rejected anyway when
+    precursors are exclusive.
+
+    Args:
+        combos: List of tuples of entry indices
+        precursor_idxs: Set of precursor entry indices
+
+    Returns:
+        Iterator of (combo, combo) pairs, each oriented as in combinations(combos, 2)
+    """
+    is_precursor = [precursor_idxs.issuperset(c) for c in combos]
+
+    for i, c1 in enumerate(combos):
+        if not is_precursor[i]:
+            continue
+        for j, c2 in enumerate(combos):
+            if j == i or (is_precursor[j] and j < i) or not set(c1).isdisjoint(c2):
+                continue
+            yield (c1, c2) if i < j else (c2, c1)
+
+
+def count_precursor_combo_pairs(
+    combos: List[Tuple[int, ...]], precursor_idxs: Set[int]
+) -> int:
+    """
+    Counts the pairs yielded by get_precursor_combo_pairs() without generating them.
+    The number of combinations disjoint from a precursor combination c is found by
+    inclusion-exclusion over the subsets S of c, from the number of combinations
+    containing each S. This only requires the subset counts of every combination
+    (restricted to precursors), rather than visiting every pair.
+
+    Args:
+        combos: List of tuples of entry indices
+        precursor_idxs: Set of precursor entry indices
+
+    Returns:
+        The number of (combo, combo) pairs
+    """
+    precursor_combos = [c for c in combos if precursor_idxs.issuperset(c)]
+
+    all_counts = _count_subsets(combos, precursor_idxs)
+    precursor_counts = _count_subsets(precursor_combos, precursor_idxs)
+
+    num_pairs = 0  # pairs with a precursor combo, where precursor pairs count twice
+    num_precursor_pairs = 0  # pairs of two precursor combos, counted twice
+    for c in precursor_combos:
+        for size in range(len(c) + 1):
+            sign = -1 if size % 2 else 1
+            for subset in combinations(sorted(c), size):
+                num_pairs += sign * all_counts[subset]
+                num_precursor_pairs += sign * precursor_counts[subset]
+
+    return num_pairs - num_precursor_pairs // 2
+
+
+def _count_subsets(combos: List[Tuple[int, ...]], idxs: Set[int]) -> Counter:
+    """Counts the combinations containing each subset of the provided indices (only
+    subsets occurring in at least one combination are counted)."""
+    counts: Counter = Counter()
+    for c in combos:
+        subset = sorted(i for i in c if i in idxs)
+        for size in range(len(subset) + 1):
+            counts.update(combinations(subset, size))
+    return counts
+
+
 def stabilize_entries(
     pd: PhaseDiagram, entries_to_adjust: Iterable[Entry], tol: float = 1e-6
 ) -> List[Entry]:
@@ -129,15 +337,256 @@ def get_computed_rxn(
     return rxn
 
 
-def get_rxn_info(rxn: ComputedReaction):
+def get_rxn_info(rxn: ComputedReaction, entry_idxs: Optional[Dict[Any, int]] = None):
     """
     Utility function to get basic reaction information from a ComputedReaction object.
     Used in enumerators.
 
     Args:
         rxn: ComputedReaction object
+        entry_idxs: Optional mapping of entries to their indices. If not provided, the
+            indices are read from the "idx" key in each entry's data (see
+            GibbsEntrySet.build_indices()).
 
     Returns:
         Tuple of reaction information (entry indices, coefficients, data)
     """
-    return [e.data["idx"] for e in rxn.entries], list(rxn.coefficients), rxn.data
+    if entry_idxs is None:
+        idxs = [e.data["idx"] for e in rxn.entries]
+    else:
+        idxs = [entry_idxs[e] for e in rxn.entries]
+
+    return idxs, list(rxn.coefficients), rxn.data
+
+
+class ChunkSizer:
+    """
+    Chooses the number of reactant/product pairs submitted per chunk from the measured
+    cost per pair, such that each chunk takes roughly the same (target) amount of time.
+    Near the end of enumeration, chunks are made smaller so that the remaining work is
+    split evenly across all workers.
+    """
+
+    def __init__(
+        self,
+        initial_size: int,
+        num_workers: int,
+        target_time: float = 1.0,
+        min_size: int = 100,
+        max_size: int = 100000,
+        smoothing: float = 0.5,
+    ):
+        """
+        Args:
+            initial_size: Chunk size used before any costs have been measured.
+            num_workers: Number of workers available for processing chunks.
+            target_time: Targeted processing time per chunk (in seconds).
+            min_size: Minimum chunk size.
+            max_size: Maximum chunk size.
+            smoothing: Weight of the newest measurement in the (exponential) moving
+                average of the cost per pair.
+        """
+        self.initial_size = initial_size
+        self.num_workers = max(num_workers, 1)
+        self.target_time = target_time
+        self.min_size = min_size
+        self.max_size = max_size
+        self.smoothing = smoothing
+
+        self.cost_per_item: Optional[float] = None
+
+    def update(self, num_items: int, elapsed: float):
+        """
+        Updates the estimated cost per pair with a newly measured chunk.
+
+        Args:
+            num_items: Number of pairs in the chunk
+            elapsed: Time taken to process the chunk (in seconds)
+        """
+        if num_items <= 0:
+            return
+
+        cost = elapsed / num_items
+        if self.cost_per_item is None:
+            self.cost_per_item = cost
+        else:
+            self.cost_per_item = (
+                self.smoothing * cost + (1 - self.smoothing) * self.cost_per_item
+            )
+
+    def get_size(self, num_remaining: Optional[int] = None) -> int:
+        """
+        Returns the size of the next chunk.
+
+        Args:
+            num_remaining: Total number of pairs that have not yet been submitted. If
+                provided, the chunk size is limited such that the remaining pairs are
+                split across all workers.
+        """
+        if self.cost_per_item:
+            size = int(self.target_time / self.cost_per_item)
+        else:
+            size = self.initial_size
+
+        size = min(max(size, self.min_size), self.max_size)
+
+        if num_remaining is not None:
+            tail_size = max(ceil(num_remaining / self.num_workers), self.min_size)
+            size = min(size, tail_size)
+
+        return size
+
+
+class EnumerationMetrics(MSONable):
+    """
+    Summary of an enumeration run: the number of reactant/product pairs and accepted
+    reactions per chemical system, the time spent in the enumerator's react function
+    (e.g., balancing), and the number of pairs/reactions rejected by each filter in
+    _react(). Attached to the ReactionSet returned by enumerate() as its "metrics"
+    attribute.
+
+    Rejection reasons are:
+        - "shared_phases": a phase appears on both sides of the pair
+        - "precursors": excluded by the precursor filters
+        - "targets": excluded by the target filters
+        - "identity": the balanced reaction is an identity reaction
+        - "unbalanced": the reaction could not be balanced (remove_unbalanced)
+        - "changed": the reaction changed sides (remove_changed)
+        - "num_constraints": the reaction exceeds max_num_constraints
+    """
+
+    REJECTION_REASONS = (
+        "shared_phases",
+        "precursors",
+        "targets",
+        "identity",
+        "unbalanced",
+        "changed",
+        "num_constraints",
+    )
+
+    def __init__(
+        self,
+        num_pairs: Optional[Dict[str, int]] = None,
+        num_rxns: Optional[Dict[str, int]] = None,
+        rejections: Optional[Dict[str, int]] = None,
+        balance_time: float = 0.0,
+        react_time: float = 0.0,
+        wall_time: float = 0.0,
+    ):
+        """
+        Args:
+            num_pairs: Number of reactant/product pairs processed, by chemical system.
+            num_rxns: Number of accepted reactions (before filtering duplicates), by
+                chemical system.
+            rejections: Number of rejected pairs/reactions, by rejection reason.
+            balance_time: Total time (in seconds) spent in the react function, summed
+                over all workers.
+            react_time: Total time (in seconds) spent processing chunks, summed over
+                all workers.
+            wall_time: Elapsed (wall clock) time of the enumeration, in seconds.
+        """
+        self.num_pairs = num_pairs if num_pairs else {}
+        self.num_rxns = num_rxns if num_rxns else {}
+        self.rejections = dict.fromkeys(self.REJECTION_REASONS, 0)
+        if rejections:
+            self.rejections.update(rejections)
+        self.balance_time = balance_time
+        self.react_time = react_time
+        self.wall_time = wall_time
+
+    def update(
+        self,
+        chemsys: str,
+        num_pairs: int,
+        num_rxns: int,
+        elapsed: float,
+        counts: Dict[str, float],
+    ):
+        """
+        Adds the results of a processed chunk.
+
+        Args:
+            chemsys: Chemical system of the chunk
+            num_pairs: Number of reactant/product pairs in the chunk
+            num_rxns: Number of accepted reactions
+            elapsed: Time taken to process the chunk (in seconds)
+            counts: Rejection counts and balance time ("balance_time") returned by
+                _react()
+        """
+        self.num_pairs[chemsys] = self.num_pairs.get(chemsys, 0) + num_pairs
+        self.num_rxns[chemsys] = self.num_rxns.get(chemsys, 0) + num_rxns
+        self.react_time += elapsed
+
+        for key, value in counts.items():
+            if key == "balance_time":
+                self.balance_time += value
+            else:
+                self.rejections[key] = self.rejections.get(key, 0) + int(value)
+
+    @property
+    def total_num_pairs(self) -> int:
+        """Total number of reactant/product pairs processed."""
+        return sum(self.num_pairs.values())
+
+    @property
+    def total_num_rxns(self) -> int:
+        """Total number of accepted reactions (before filtering duplicates)."""
+        return sum(self.num_rxns.values())
+
+    @property
+    def rxns_per_second(self) -> float:
+        """Number of accepted reactions per second of wall time."""
+        if not self.wall_time:
+            return 0.0
+        return self.total_num_rxns / self.wall_time
+
+    def __repr__(self):
+        rejections = ", ".join(f"{k}: {v}" for k, v in self.rejections.items() if v)
+        return (
+            f"EnumerationMetrics ({len(self.num_pairs)} chemical systems, "
+            f"{self.total_num_pairs} pairs, {self.total_num_rxns} reactions, "
+            f"{self.wall_time:.2f} s, {self.rxns_per_second:.1f} reactions/s, "
+            f"balance time: {self.balance_time:.2f} s, rejections: {{{rejections}}})"
+        )
+
+
+class ReactionSetShardWriter:
+    """
+    A simple sink for streaming enumeration (see BasicEnumerator.enumerate_to_sink()).
+    Every ReactionSet passed to this object is written to its own file ("shard") within
+    the provided directory.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], prefix: str = "rxn_set", compress=True
+    ):
+        """
+        Args:
+            directory: Directory in which to write the shards. Created if it does not
+                exist.
+            prefix: Filename prefix for each shard. Defaults to "rxn_set".
+            compress: Whether to gzip each shard. Defaults to True.
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.compress = compress
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.paths: List[Path] = []
+
+    def __call__(self, rxn_set: ReactionSet) -> Path:
+        """
+        Writes a ReactionSet to a new shard and returns its path.
+        """
+        suffix = ".json.gz" if self.compress else ".json"
+        path = self.directory / f"{self.prefix}_{len(self.paths)}{suffix}"
+        dumpfn(rxn_set, path)
+        self.paths.append(path)
+        return path
+
+    def load(self) -> List[ReactionSet]:
+        """
+        Loads all shards written by this object.
+        """
+        return [loadfn(path) for path in self.paths]
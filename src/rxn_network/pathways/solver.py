@@ -6,10 +6,9 @@ equations using matrix operations.
 from copy import deepcopy
 from itertools import combinations
 from math import comb
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
-import ray
 from numba import njit, prange
 from pymatgen.core.composition import Element
 from tqdm import tqdm
@@ -28,8 +27,8 @@ from rxn_network.pathways.pathway_set import PathwaySet
 from rxn_network.reactions.computed import ComputedReaction
 from rxn_network.reactions.open import OpenComputedReaction
 from rxn_network.reactions.reaction_set import ReactionSet
+from rxn_network.utils.executors import Executor, get_executor
 from rxn_network.utils.funcs import grouper
-from rxn_network.utils.ray import initialize_ray, to_iterator
 
 
 class PathwaySolver(Solver):
@@ -74,6 +73,7 @@ class PathwaySolver(Solver):
         use_basic_enumerator: bool = True,
         use_minimize_enumerator: bool = False,
         filter_interdependent: bool = True,
+        executor: Optional[Union[str, Executor]] = None,
     ) -> PathwaySet:
         """
 
@@ -95,6 +95,8 @@ class PathwaySolver(Solver):
                 intermediate reactions. Defaults to False.
             filter_interdependent: Whether or not to filter out pathways where reaction
                 steps are interdependent. Defaults to True.
+            executor: The execution backend (or its name: "serial", "process", or
+                "ray"). Defaults to the RN_EXECUTOR environment variable, or "ray".
 
         Returns:
             A list of BalancedPathway objects.
@@ -105,7 +107,7 @@ class PathwaySolver(Solver):
                 "Net reaction must be balanceable to find all reaction pathways."
             )
 
-        initialize_ray()
+        executor = get_executor(executor)
 
         entries_copy = deepcopy(self.entries)
         entries = entries_copy.entries_list
@@ -127,6 +129,7 @@ class PathwaySolver(Solver):
                 intermediate_rxn_energy_cutoff,
                 use_basic_enumerator,
                 use_minimize_enumerator,
+                executor,
             )
             intermediate_costs = [
                 self.cost_function.evaluate(r) for r in intermediate_rxns.get_rxns()
@@ -141,16 +144,16 @@ class PathwaySolver(Solver):
         if net_rxn in reactions:
             reactions.remove(net_rxn)
 
-        reaction_set = ray.put(ReactionSet.from_rxns(reactions))
-        entries = ray.put(entries)
-        costs = ray.put(costs)
-        num_entries = ray.put(num_entries)
-        net_rxn_vector = ray.put(net_rxn_vector)
-        open_elem = ray.put(self.open_elem)
-        chempot = ray.put(self.chempot)
+        reaction_set = executor.put(ReactionSet.from_rxns(reactions))
+        entries = executor.put(entries)
+        costs = executor.put(costs)
+        num_entries = executor.put(num_entries)
+        net_rxn_vector = executor.put(net_rxn_vector)
+        open_elem = executor.put(self.open_elem)
+        chempot = executor.put(self.chempot)
 
         num_rxns = len(reactions)
-        batch_size = self.batch_size or ray.cluster_resources()["CPU"] - 1
+        batch_size = self.batch_size or max(executor.num_workers - 1, 1)
 
         num_combos = sum(comb(num_rxns, k) for k in range(1, max_num_combos + 1))
         num_batches = int((num_combos // self.chunk_size + 1) // batch_size + 1)
@@ -161,7 +164,8 @@ class PathwaySolver(Solver):
         for n in range(1, max_num_combos + 1):
             for group in grouper(combinations(range(num_rxns), n), self.chunk_size):
                 paths_refs.append(
-                    _get_balanced_paths_ray.remote(
+                    executor.submit(
+                        _get_balanced_paths,
                         group,
                         reaction_set,
                         costs,
@@ -174,7 +178,7 @@ class PathwaySolver(Solver):
                 )
                 if len(paths_refs) >= batch_size:
                     for paths_ref in tqdm(
-                        to_iterator(paths_refs),
+                        executor.iter_completed(paths_refs),
                         total=len(paths_refs),
                         desc=(
                             f"{self.__class__.__name__} (Batch"
@@ -188,7 +192,7 @@ class PathwaySolver(Solver):
                     paths_refs = []
 
         for paths_ref in tqdm(
-            to_iterator(paths_refs),
+            executor.iter_completed(paths_refs),
             total=len(paths_refs),
             desc=f"{self.__class__.__name__} (Batch {batch_count}/{num_batches})",
         ):
@@ -214,6 +218,7 @@ class PathwaySolver(Solver):
         energy_cutoff,
         use_basic_enumerator,
         use_minimize_enumerator,
+        executor=None,
     ):
         """
         Method for finding intermediate reactions using enumerators and
@@ -240,7 +245,9 @@ class PathwaySolver(Solver):
 
         if use_basic_enumerator:
             be = BasicEnumerator(targets=target_formulas, calculate_e_above_hulls=False)
-            rxn_set = rxn_set.add_rxn_set(be.enumerate(intermediates))
+            rxn_set = rxn_set.add_rxn_set(
+                be.enumerate(intermediates, executor=executor)
+            )
 
             if self.open_elem:
                 boe = BasicOpenEnumerator(
@@ -249,13 +256,17 @@ class PathwaySolver(Solver):
                     calculate_e_above_hulls=False,
                 )
 
-                rxn_set = rxn_set.add_rxn_set(boe.enumerate(intermediates))
+                rxn_set = rxn_set.add_rxn_set(
+                    boe.enumerate(intermediates, executor=executor)
+                )
 
         if use_minimize_enumerator:
             mge = MinimizeGibbsEnumerator(
                 targets=target_formulas, calculate_e_above_hulls=False
             )
-            rxn_set = rxn_set.add_rxn_set(mge.enumerate(intermediates))
+            rxn_set = rxn_set.add_rxn_set(
+                mge.enumerate(intermediates, executor=executor)
+            )
 
             if self.open_elem:
                 mgpe = MinimizeGrandPotentialEnumerator(
@@ -263,7 +274,7 @@ class PathwaySolver(Solver):
                     mu=self.chempot,
                     targets=target_formulas,
                 )
-                rxn_set.add_rxn_set(mgpe.enumerate(intermediates))
+                rxn_set.add_rxn_set(mgpe.enumerate(intermediates, executor=executor))
 
         rxns = list(filter(lambda x: x.energy_per_atom < energy_cutoff, rxn_set))
         rxns = [r for r in rxns if all(e in intermediates for e in r.entries)]
@@ -354,8 +365,7 @@ def _create_comp_matrices(combos, rxns, num_entries):
     return comp_matrices
 
 
-@ray.remote
-def _get_balanced_paths_ray(
+def _get_balanced_paths(
     combos,
     reaction_set,
     costs,
@@ -7,7 +7,7 @@ import re
 from copy import deepcopy
 from functools import cached_property
 from itertools import chain, combinations
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 from monty.fractions import gcd_float
@@ -15,8 +15,13 @@ from pymatgen.core.composition import Element
 
 from rxn_network.core.composition import Composition
 from rxn_network.core.reaction import Reaction
+from rxn_network.reactions.cache import get_balancing_cache
+from rxn_network.reactions.nullspace import get_nullspace, solve_constrained
 
 TOLERANCE = 1e-6  # Tolerance for determining if a particular component fraction is > 0.
+ZERO_TOLERANCE = 1e-12  # Coefficients from batched (float) balancing treated as zero
+RANK_MARGIN = 1e-6  # Singular values (relative) too close to zero for batched balancing
+RESIDUAL_MARGIN = 1e-4  # Residuals too close to zero for batched balancing
 
 
 class BasicReaction(Reaction):
@@ -417,26 +422,286 @@ class BasicReaction(Reaction):
         cls, reactants: List[Composition], products: List[Composition]
     ) -> Tuple[np.ndarray, Union[int, float], int]:
         """
-        Balances the reaction and returns the new coefficient matrix
+        Balances the reaction and returns the new coefficient matrix. If a balancing
+        cache is set (see rxn_network.reactions.cache), the nullspace of the reaction is
+        looked up in (and added to) the cache. The result is identical to the uncached
+        result, regardless of the order of the compositions.
         """
-        compositions = reactants + products
-        num_comp = len(compositions)
+        cache = get_balancing_cache()
+        if cache is None:
+            return cls._solve_coeffs(reactants, products)
 
+        key, order = cache.get_key(reactants, products)
+        basis = cache.get(key, order)
+
+        if basis is None:
+            compositions = reactants + products
+            basis = get_nullspace(
+                cls._get_comp_matrix([compositions[i] for i in order])
+            )
+            cache.set(key, basis)
+            basis = cache.permute(basis, order)
+
+        return cls._solve_basis(basis, len(order), len(reactants))
+
+    @classmethod
+    def _solve_coeffs(
+        cls, reactants: List[Composition], products: List[Composition]
+    ) -> Tuple[np.ndarray, Union[int, float], int]:
+        """
+        Solves for the coefficients of the reaction (in the provided order). See
+        _balance_coeffs().
+        """
+        comp_matrix = cls._get_comp_matrix(reactants + products)
+        return cls._solve_comp_matrix(comp_matrix, len(reactants))
+
+    @staticmethod
+    def _get_comp_matrix(compositions: List[Composition]) -> np.ndarray:
+        """
+        Returns the composition matrix of a list of compositions (rows are elements in
+        sorted order and columns are compositions).
+        """
         all_elems = sorted({elem for c in compositions for elem in c.elements})
-        num_elems = len(all_elems)
+        return np.array([[c[el] for el in all_elems] for c in compositions]).T
 
-        comp_matrix = np.array([[c[el] for el in all_elems] for c in compositions]).T
+    @classmethod
+    def _solve_comp_matrix(
+        cls, comp_matrix: np.ndarray, num_reactants: int
+    ) -> Tuple[np.ndarray, Union[int, float], int]:
+        """
+        Balances a reaction provided as a composition matrix (rows are elements and
+        columns are compositions, reactants first).
+
+        The integer nullspace of the composition matrix (i.e. all balanced reactions)
+        is found exactly (see rxn_network.reactions.nullspace) and the coefficients are
+        chosen from it with _solve_basis().
+        """
+        basis = get_nullspace(comp_matrix)
+        return cls._solve_basis(basis, comp_matrix.shape[1], num_reactants)
+
+    @classmethod
+    def _solve_basis(
+        cls, basis: List[Tuple[int, ...]], num_comp: int, num_reactants: int
+    ) -> Tuple[np.ndarray, Union[int, float], int]:
+        """
+        Chooses the coefficients of a reaction from an integer basis of its nullspace.
+        Coefficients are fixed to 1 (products) or -1 (reactants) for increasingly
+        complex combinations of compositions (see _get_constraints()), and the
+        minimum-norm solution with the lowest number of errors is returned. An error
+        is a composition changing sides or disappearing.
 
-        rank = np.linalg.matrix_rank(comp_matrix)
-        diff = num_comp - rank
+        The result only depends on the space spanned by the basis, not on the basis
+        vectors themselves.
+        """
+        diff = len(basis)
         num_constraints = diff if diff >= 2 else 1
 
-        # an error = a component changing sides or disappearing
-        lowest_num_errors = np.inf
+        expected_signs = [-1] * num_reactants + [+1] * (num_comp - num_reactants)
+
+        lowest_num_errors: Union[int, float] = np.inf
+        best_soln = np.zeros(num_comp)
+
+        for constraints in cls._get_constraints(
+            num_comp, num_reactants, num_constraints
+        ):
+            value = 1 if min(constraints) >= num_reactants else -1
+            soln = solve_constrained(basis, constraints, value)
+            if soln is None:
+                continue
+
+            numerators, denominator = soln
+            num_errors = sum(
+                1 for s, c in zip(expected_signs, numerators) if s * c <= 0
+            )
+            if num_errors < lowest_num_errors:
+                lowest_num_errors = num_errors
+                best_soln = np.array([n / denominator for n in numerators])
+                if num_errors == 0:
+                    break
 
-        first_product_idx = len(reactants)
+        return np.squeeze(best_soln), lowest_num_errors, num_constraints
+
+    @classmethod
+    def _solve_bases_batch(
+        cls, bases: List[List[Tuple[int, ...]]], num_comp: int, num_reactants: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized version of _solve_basis() for many reactions with the same number
+        of reactants and products. Reactions with a one-dimensional nullspace (by far
+        the most common case) are solved all at once, with results identical to those
+        of _solve_basis(): every constraint then fixes a single coefficient, so the
+        solution is the basis vector scaled by the constrained value. All other
+        reactions are solved one at a time with _solve_basis().
+
+        Args:
+            bases: Integer nullspace basis of each reaction (see get_nullspace())
+            num_comp: Number of compositions in every reaction
+            num_reactants: Number of reactants (leading entries) in every reaction
+
+        Returns:
+            Tuple of arrays: coefficients (num_rxns, num_comp), lowest number of errors
+            (num_rxns,), and number of constraints (num_rxns,)
+        """
+        num_rxns = len(bases)
+        best_solns = np.zeros((num_rxns, num_comp))
+        lowest_num_errors = np.full(num_rxns, np.inf)
+        all_num_constraints = np.ones(num_rxns, dtype=int)
+
+        is_one_dim = np.array([len(basis) == 1 for basis in bases], dtype=bool)
+        for i in np.flatnonzero(~is_one_dim):
+            (
+                best_solns[i],
+                lowest_num_errors[i],
+                all_num_constraints[i],
+            ) = cls._solve_basis(bases[i], num_comp, num_reactants)
+
+        idxs = np.flatnonzero(is_one_dim)
+        if idxs.size == 0:
+            return best_solns, lowest_num_errors, all_num_constraints
+
+        vectors = np.array([bases[i][0] for i in idxs], dtype=float)
+
+        constraints = np.array(
+            [c for (c,) in cls._get_constraints(num_comp, num_reactants, 1)]
+        )
+        values = np.where(constraints >= num_reactants, 1, -1)
+        amts = vectors[:, constraints]
+        signs = np.sign(amts) * values  # zero if the constraint cannot be satisfied
 
-        # start with simplest product constraints, work to more complex constraints
+        expected_signs = np.array(
+            [-1] * num_reactants + [+1] * (num_comp - num_reactants)
+        )
+        pos_errors = np.sum(expected_signs * vectors <= 0, axis=1)
+        neg_errors = np.sum(expected_signs * vectors >= 0, axis=1)
+
+        num_errors = np.where(signs > 0, pos_errors[:, None], neg_errors[:, None])
+        num_errors = np.where(signs == 0, np.inf, num_errors)
+
+        rows = np.arange(len(idxs))
+        best = np.argmin(num_errors, axis=1)  # first constraint with fewest errors
+        lowest = num_errors[rows, best]
+        feasible = np.isfinite(lowest)
+
+        numerators = signs[rows, best, None] * vectors
+        denominators = np.where(feasible, np.abs(amts[rows, best]), 1)
+        solns = numerators / denominators[:, None] + 0.0  # avoids negative zeros
+
+        best_solns[idxs[feasible]] = solns[feasible]
+        lowest_num_errors[idxs] = lowest
+
+        return best_solns, lowest_num_errors, all_num_constraints
+
+    @classmethod
+    def _balance_coeffs_batch(
+        cls, comp_matrices: np.ndarray, num_reactants: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized version of _balance_coeffs() for balancing many reactions at once.
+        All reactions must have the same number of reactants and products; the
+        compositions are supplied as a stacked array of composition matrices, where
+        rows are elements and columns are compositions (reactants first). Rows for
+        elements that are absent from a reaction may be left as zeros.
+
+        All reactions are first solved with batched NumPy pinv/matrix_rank calls,
+        trying constraints in the same order as _solve_comp_matrix(). For integer
+        compositions, the minimum-norm solutions found this way are the same as the
+        exact ones. Any reaction whose outcome could depend on floating point error
+        (non-integer compositions, singular values close to the rank cutoff,
+        residuals or coefficients close to zero) is instead re-solved with the exact
+        solver (see _solve_comp_matrix()).
+
+        Args:
+            comp_matrices: Array of shape (num_rxns, num_elems, num_comp)
+            num_reactants: Number of reactants (leading columns) in every reaction
+
+        Returns:
+            Tuple of arrays: coefficients (num_rxns, num_comp), lowest number of errors
+            (num_rxns,), and number of constraints (num_rxns,)
+        """
+        num_rxns, num_elems, num_comp = comp_matrices.shape
+
+        sing_vals = np.linalg.svd(comp_matrices, compute_uv=False)
+        max_sing_vals = sing_vals.max(axis=1, keepdims=True, initial=0.0)
+        rank_tol = max_sing_vals * max(num_elems, num_comp) * np.finfo(float).eps
+        ranks = (sing_vals > rank_tol).sum(axis=1)
+
+        diffs = num_comp - ranks
+        all_num_constraints = np.where(diffs >= 2, diffs, 1)
+
+        lowest_num_errors = np.full(num_rxns, np.inf)
+        best_solns = np.zeros((num_rxns, num_comp))
+        solved = np.zeros(num_rxns, dtype=bool)
+
+        is_int = (comp_matrices == np.round(comp_matrices)).all(axis=(1, 2))
+        near_rank_cutoff = (
+            (sing_vals > rank_tol) & (sing_vals <= RANK_MARGIN * max_sing_vals)
+        ).any(axis=1)
+        use_exact = ~is_int | near_rank_cutoff
+
+        expected_signs = np.array(
+            [-1] * num_reactants + [+1] * (num_comp - num_reactants)
+        )
+
+        for num_constraints in np.unique(all_num_constraints):
+            group = np.flatnonzero(all_num_constraints == num_constraints)
+
+            for constraints in cls._get_constraints(
+                num_comp, num_reactants, num_constraints
+            ):
+                active = group[~solved[group] & ~use_exact[group]]
+                if active.size == 0:
+                    break
+
+                n_constr = len(constraints)
+
+                comp_and_constraints = np.zeros(
+                    (len(active), num_elems + n_constr, num_comp)
+                )
+                comp_and_constraints[:, :num_elems] = comp_matrices[active]
+                constraint_rows = num_elems + np.arange(n_constr)
+                comp_and_constraints[:, constraint_rows, constraints] = 1
+
+                b = np.zeros(num_elems + n_constr)
+                b[-n_constr:] = 1 if min(constraints) >= num_reactants else -1
+
+                coeffs = np.linalg.pinv(comp_and_constraints) @ b
+                coeffs[np.abs(coeffs) <= ZERO_TOLERANCE] = 0.0
+
+                residuals = np.einsum("kij,kj->ki", comp_matrices[active], coeffs)
+                max_residuals = np.abs(residuals).max(axis=1, initial=0.0)
+                is_balanced = max_residuals <= 1e-8
+
+                near_zero = (np.abs(coeffs) > 0) & (np.abs(coeffs) < TOLERANCE)
+                use_exact[active] |= (max_residuals > 1e-8) & (
+                    max_residuals <= RESIDUAL_MARGIN
+                )
+                use_exact[active] |= is_balanced & near_zero.any(axis=1)
+
+                num_errors = np.sum(expected_signs * coeffs <= 0, axis=1)
+
+                improved = is_balanced & (num_errors < lowest_num_errors[active])
+                lowest_num_errors[active[improved]] = num_errors[improved]
+                best_solns[active[improved]] = coeffs[improved]
+                solved[active[is_balanced & (num_errors == 0)]] = True
+
+        for i in np.flatnonzero(use_exact):
+            (
+                best_solns[i],
+                lowest_num_errors[i],
+                all_num_constraints[i],
+            ) = cls._solve_comp_matrix(comp_matrices[i], num_reactants)
+
+        return best_solns, lowest_num_errors, all_num_constraints
+
+    @staticmethod
+    def _get_constraints(
+        num_comp: int, first_product_idx: int, num_constraints: int
+    ) -> Iterable[Tuple[int, ...]]:
+        """
+        Returns the ordered sequence of coefficient constraints tried during reaction
+        balancing. Starts with the simplest product constraints and works up to more
+        complex constraints, followed by the same for reactants.
+        """
         product_constraints = chain.from_iterable(
             [
                 combinations(range(first_product_idx, num_comp), n_constr)
@@ -449,36 +714,7 @@ class BasicReaction(Reaction):
                 for n_constr in range(num_constraints, 0, -1)
             ]
         )
-        best_soln = np.zeros(num_comp)
-
-        for constraints in chain(product_constraints, reactant_constraints):
-            n_constr = len(constraints)
-
-            comp_and_constraints = np.append(
-                comp_matrix, np.zeros((n_constr, num_comp)), axis=0
-            )
-            b = np.zeros((num_elems + n_constr, 1))
-            b[-n_constr:] = 1 if min(constraints) >= first_product_idx else -1
-
-            for num, idx in enumerate(constraints):
-                comp_and_constraints[num_elems + num, idx] = 1
-                # arbitrarily fix coeff to 1
-
-            coeffs = np.matmul(np.linalg.pinv(comp_and_constraints), b)
-
-            num_errors = 0
-            if np.allclose(np.matmul(comp_matrix, coeffs), np.zeros((num_elems, 1))):
-                expected_signs = np.array([-1] * len(reactants) + [+1] * len(products))
-                num_errors = np.sum(np.multiply(expected_signs, coeffs.T) < TOLERANCE)
-                if num_errors == 0:
-                    lowest_num_errors = 0
-                    best_soln = coeffs
-                    break
-                if num_errors < lowest_num_errors:
-                    lowest_num_errors = num_errors
-                    best_soln = coeffs
-
-        return np.squeeze(best_soln), lowest_num_errors, num_constraints
+        return chain(product_constraints, reactant_constraints)
 
     @staticmethod
     def _from_coeff_dicts(reactant_coeffs, product_coeffs) -> "BasicReaction":
@@ -519,34 +755,61 @@ class BasicReaction(Reaction):
             factor = 1
         return cls._str_from_formulas(r_coeffs, r_formulas), factor
 
+    @cached_property
+    def _key(self) -> tuple:
+        """
+        Hashable key of the reaction, computed once per reaction and used for both
+        hashing and (as a first check) equality: the sorted reduced formulas of the
+        compositions, each with the sign of its coefficient (i.e., its side of the
+        reaction). Coefficient values are compared with a tolerance in __eq__(), and
+        any rounding of them would split reactions which compare equal across the
+        rounding boundary. The key does not depend on the order of the compositions.
+        """
+        return tuple(
+            sorted(
+                (comp.reduced_formula, 1 if coeff > 0 else -1 if coeff < 0 else 0)
+                for comp, coeff in zip(self._compositions, self._coefficients)
+            )
+        )
+
+    @cached_property
+    def _coeffs_by_comp(self) -> Dict[Composition, np.ndarray]:
+        """The (sorted) coefficients of each unique composition in the reaction."""
+        coeffs: Dict[Composition, List[float]] = {}
+        for comp, coeff in zip(self._compositions, self._coefficients):
+            coeffs.setdefault(comp, []).append(coeff)
+        return {comp: np.sort(amts) for comp, amts in coeffs.items()}
+
     def __eq__(self, other):
         if self is other:
             return True
 
-        if not self.chemical_system == other.chemical_system:
+        if not isinstance(other, BasicReaction):
             return False
 
-        if not len(self.products) == len(other.products):
+        if self._key != other._key:
             return False
 
-        if not len(self.reactants) == len(other.reactants):
+        coeffs, other_coeffs = self._coeffs_by_comp, other._coeffs_by_comp
+        if coeffs.keys() != other_coeffs.keys():
             return False
 
-        if not np.allclose(sorted(self.coefficients), sorted(other.coefficients)):
+        if any(len(amts) != len(other_coeffs[c]) for c, amts in coeffs.items()):
             return False
 
-        if not set(self.reactants) == set(other.reactants):
-            return False
-
-        if not set(self.products) == set(other.products):
-            return False
+        if not coeffs:
+            return True
 
-        return True
+        return bool(
+            np.allclose(
+                np.concatenate(list(coeffs.values())),
+                np.concatenate([other_coeffs[c] for c in coeffs]),
+                equal_nan=True,
+            )
+        )
 
     def __hash__(self):
-        return hash(
-            (self.chemical_system, tuple(sorted(self.coefficients)))
-        )  # not checking here for reactions that are multiples (too expensive)
+        return hash(self._key)
 
     def __str__(self):
         return self._str_from_comp(self.coefficients, self.compositions)[0]
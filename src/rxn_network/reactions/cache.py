@@ -0,0 +1,256 @@
+"""
+A cache for reaction balancing results, shared by all reaction classes (and therefore
+by all enumerators and solvers running in the same process).
+"""
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from monty.serialization import dumpfn, loadfn
+from pymatgen.core.composition import Composition
+
+BALANCING_CACHE_ENV_VAR = "RN_BALANCING_CACHE"
+
+CompositionKey = Tuple[Tuple[Tuple[str, float], ...], float]
+BalancingKey = Tuple[Tuple[CompositionKey, ...], Tuple[CompositionKey, ...]]
+Basis = List[Tuple[int, ...]]
+
+
+class BalancingCache:
+    """
+    LRU cache of the exact nullspaces (i.e., the spaces of all balanced reactions)
+    found while balancing reactions. Nullspaces are keyed by the (sorted) multisets of
+    reactant and product compositions and are always solved with the compositions in
+    this canonical order. Upon retrieval, the basis is permuted back to the order of
+    the provided compositions, and coefficients are then chosen from it exactly as if
+    the reaction had been balanced without the cache (see
+    BasicReaction._solve_basis()). Results therefore never depend on the order in
+    which reactions were previously balanced.
+
+    The cache can optionally be backed by a file on disk, which is loaded upon
+    initialization and written with save().
+    """
+
+    def __init__(self, maxsize: int = 1000000, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            maxsize: Maximum number of nullspaces to store. The least recently used
+                nullspaces are evicted first. Defaults to 1,000,000.
+            path: Optional path to a file (e.g. "balancing_cache.json.gz") used for
+                storing the cache on disk. If the file exists, it is loaded.
+        """
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+
+        self._cache: OrderedDict = OrderedDict()
+        self._new: Dict[BalancingKey, Basis] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.path and self.path.exists():
+            self.load(self.path)
+
+    @classmethod
+    def get_key(
+        cls, reactants: Sequence[Composition], products: Sequence[Composition]
+    ) -> Tuple[BalancingKey, np.ndarray]:
+        """
+        Returns the canonical key for a set of reactants/products, along with the order
+        (indices into reactants + products) of the compositions in the key. Each
+        composition is represented by its reduced composition (with exact amounts) and
+        its reduction factor.
+        """
+        return cls.get_key_from_composition_keys(
+            [get_composition_key(c) for c in reactants],
+            [get_composition_key(c) for c in products],
+        )
+
+    @staticmethod
+    def get_key_from_composition_keys(
+        reactant_keys: Sequence[CompositionKey], product_keys: Sequence[CompositionKey]
+    ) -> Tuple[BalancingKey, np.ndarray]:
+        """
+        Same as get_key(), but for precomputed composition keys (see
+        get_composition_key()). This avoids recomputing the key of each composition
+        when balancing many reactions made from the same compositions.
+        """
+        reactant_order = sorted(
+            range(len(reactant_keys)), key=reactant_keys.__getitem__
+        )
+        product_order = sorted(range(len(product_keys)), key=product_keys.__getitem__)
+
+        key = (
+            tuple(reactant_keys[i] for i in reactant_order),
+            tuple(product_keys[i] for i in product_order),
+        )
+        order = np.array(
+            reactant_order + [i + len(reactant_keys) for i in product_order],
+            dtype=int,
+        )
+
+        return key, order
+
+    def get(self, key: BalancingKey, order: np.ndarray) -> Optional[Basis]:
+        """
+        Returns the cached nullspace basis for the key, with the entries of each basis
+        vector permuted to the original order of the compositions, or None if the key
+        is not in the cache.
+        """
+        basis = self._cache.get(key)
+        if basis is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+
+        return self.permute(basis, order)
+
+    def set(self, key: BalancingKey, basis: Sequence[Tuple[int, ...]]):
+        """
+        Stores a nullspace basis in the cache. The basis must have been found with the
+        compositions in the canonical order of the key (see get_key()).
+        """
+        basis = [tuple(v) for v in basis]
+        self._new[key] = basis
+        self._store(key, basis)
+
+    def update(self, nullspaces: Dict[BalancingKey, Basis]):
+        """
+        Stores many nullspace bases in the cache, e.g., those found by another process
+        (see pop_new()).
+
+        Args:
+            nullspaces: Dictionary of canonical keys to nullspace bases.
+        """
+        for key, basis in nullspaces.items():
+            self._store(key, basis)
+
+    def pop_new(self) -> Dict[BalancingKey, Basis]:
+        """
+        Returns the nullspaces stored with set() since the last call to this method.
+        This is used for returning the nullspaces found by parallel workers, which
+        balance reactions with their own copy of the cache, to the main process.
+        """
+        new, self._new = self._new, {}
+        return new
+
+    def _store(self, key: BalancingKey, basis: Basis):
+        self._cache[key] = basis
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.maxsize:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self._new.pop(evicted_key, None)
+
+    @staticmethod
+    def permute(basis: Sequence[Tuple[int, ...]], order: np.ndarray) -> Basis:
+        """
+        Permutes the entries of each vector of a basis found in canonical order back
+        to the original order of the compositions (see get_key()).
+        """
+        order_list = order.tolist()
+        permuted = []
+        for v in basis:
+            w = [0] * len(v)
+            for i, x in zip(order_list, v):
+                w[i] = x
+            permuted.append(tuple(w))
+        return permuted
+
+    def clear(self):
+        """Removes all nullspaces from the cache."""
+        self._cache.clear()
+        self._new.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """
+        Writes the cache to disk.
+
+        Args:
+            path: Path of the file. Defaults to the path provided upon initialization.
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No path provided for saving the balancing cache!")
+
+        dumpfn([[key, basis] for key, basis in self._cache.items()], path)
+
+    def load(self, path: Union[str, Path]):
+        """
+        Loads nullspaces from a file written by save() into the cache.
+
+        Args:
+            path: Path of the file.
+        """
+        for key, basis in loadfn(path):
+            key = tuple(
+                tuple(
+                    (tuple((el, amt) for el, amt in items), factor)
+                    for items, factor in comp_keys
+                )
+                for comp_keys in key
+            )
+            self._cache[key] = [tuple(v) for v in basis]
+
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def __getstate__(self):
+        # copies sent to other processes only report back what they find themselves
+        # (see pop_new()), and never write to the backing file of the original
+        state = self.__dict__.copy()
+        state["_new"] = {}
+        state["path"] = None
+        state["hits"] = 0
+        state["misses"] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+
+def get_composition_key(comp: Composition) -> CompositionKey:
+    """
+    Returns a hashable key of a composition: its reduced composition (as sorted
+    element symbols and exact amounts) and its reduction factor.
+    """
+    reduced, factor = comp.get_reduced_composition_and_factor()
+    return tuple(sorted((el.symbol, amt) for el, amt in reduced.items())), factor
+
+
+_balancing_cache: Optional[BalancingCache] = (
+    BalancingCache(path=os.environ[BALANCING_CACHE_ENV_VAR])
+    if os.environ.get(BALANCING_CACHE_ENV_VAR)
+    else None
+)
+
+
+def get_balancing_cache() -> Optional[BalancingCache]:
+    """
+    Returns the balancing cache currently in use (or None if caching is disabled).
+    Caching is disabled by default, unless the RN_BALANCING_CACHE environment variable
+    provides a path to a backing file. It can be enabled with set_balancing_cache().
+    """
+    return _balancing_cache
+
+
+def set_balancing_cache(cache: Optional[BalancingCache]):
+    """
+    Sets the balancing cache used by all reaction classes.
+
+    Args:
+        cache: A BalancingCache object, or None to disable caching.
+    """
+    global _balancing_cache  # pylint: disable=global-statement
+    _balancing_cache = cache
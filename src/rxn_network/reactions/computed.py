@@ -3,15 +3,22 @@ A reaction class that builds reactions based on ComputedEntry objects and provid
 information about reaction thermodynamics.
 """
 from functools import cached_property
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from pymatgen.core.composition import Composition as PymatgenComposition
 from pymatgen.core.composition import Element
 from pymatgen.entries.computed_entries import ComputedEntry
-from uncertainties import ufloat
 
 from rxn_network.core.composition import Composition
 from rxn_network.reactions.basic import BasicReaction
+from rxn_network.reactions.cache import (
+    BalancingKey,
+    Basis,
+    get_balancing_cache,
+    get_composition_key,
+)
+from rxn_network.reactions.nullspace import get_nullspace
 
 
 class ComputedReaction(BasicReaction):
@@ -83,6 +90,115 @@ class ComputedReaction(BasicReaction):
             lowest_num_errors=lowest_num_errors,
         )
 
+    @classmethod
+    def balance_batch(
+        cls,
+        all_reactant_entries: List[List[ComputedEntry]],
+        all_product_entries: List[List[ComputedEntry]],
+    ) -> List["ComputedReaction"]:
+        """
+        Balances many reactions at once and returns a list of new ComputedReaction
+        objects (in the same order as provided). Reactions are grouped by their number
+        of reactants/products and each group is solved as a single stack of
+        composition matrices (see BasicReaction._balance_coeffs_batch()).
+
+        If a balancing cache is set, reactions whose nullspace is already cached are
+        instead solved exactly from it (see BasicReaction._solve_bases_batch()), and
+        the nullspaces of all other reactions are added to the cache. Results are
+        therefore the same as those of the exact solver (and the same as without a
+        cache, up to floating point rounding).
+
+        Args:
+            all_reactant_entries: List of reactant entry collections (one per reaction)
+            all_product_entries: List of product entry collections (one per reaction)
+        """
+        all_entries = [
+            list(r) + list(p) for r, p in zip(all_reactant_entries, all_product_entries)
+        ]
+
+        comps: Dict[int, PymatgenComposition] = {}
+        for entries in all_entries:
+            for e in entries:
+                if id(e) not in comps:
+                    comps[id(e)] = e.composition.reduced_composition
+
+        elems = sorted({el for c in comps.values() for el in c.elements})
+        comp_vectors = {
+            idx: np.array([c[el] for el in elems]) for idx, c in comps.items()
+        }
+
+        cache = get_balancing_cache()
+        if cache is not None:
+            comp_keys = {idx: get_composition_key(c) for idx, c in comps.items()}
+
+        results: Dict[int, Tuple] = {}
+        cache_keys: Dict[int, Tuple[BalancingKey, np.ndarray]] = {}
+
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        cached_groups: Dict[Tuple[int, int], List[Tuple[int, Basis]]] = {}
+        for i, (r, entries) in enumerate(zip(all_reactant_entries, all_entries)):
+            if cache is not None:
+                key, order = cache.get_key_from_composition_keys(
+                    [comp_keys[id(e)] for e in entries[: len(r)]],
+                    [comp_keys[id(e)] for e in entries[len(r) :]],
+                )
+                basis = cache.get(key, order)
+                if basis is not None:
+                    cached_groups.setdefault((len(r), len(entries)), []).append(
+                        (i, basis)
+                    )
+                    continue
+
+                cache_keys[i] = (key, order)
+
+            groups.setdefault((len(r), len(entries)), []).append(i)
+
+        for (num_reactants, num_comp), cached in cached_groups.items():
+            cached_idxs, bases = zip(*cached)
+            solns = cls._solve_bases_batch(list(bases), num_comp, num_reactants)
+            for i, c, errors, n_constr in zip(cached_idxs, *solns):
+                results[i] = (
+                    c,
+                    errors if errors == np.inf else int(errors),
+                    int(n_constr),
+                )
+
+        for (num_reactants, _), rxn_idxs in groups.items():
+            comp_matrices = np.array(
+                [[comp_vectors[id(e)] for e in all_entries[i]] for i in rxn_idxs]
+            ).transpose(0, 2, 1)
+
+            coeffs, lowest_num_errors, num_constraints = cls._balance_coeffs_batch(
+                comp_matrices, num_reactants
+            )
+            for i, c, errors, n_constr in zip(
+                rxn_idxs, coeffs, lowest_num_errors, num_constraints
+            ):
+                results[i] = (
+                    c,
+                    errors if errors == np.inf else int(errors),
+                    int(n_constr),
+                )
+
+            if cache is not None:
+                for i, comp_matrix in zip(rxn_idxs, comp_matrices):
+                    key, order = cache_keys[i]
+                    cache.set(key, get_nullspace(comp_matrix[:, order]))
+
+        rxns = []
+        for i, entries in enumerate(all_entries):
+            c, errors, n_constr = results[i]
+            rxns.append(
+                cls(
+                    entries=entries,
+                    coefficients=c,
+                    data={"num_constraints": n_constr},
+                    lowest_num_errors=errors,
+                )
+            )
+
+        return rxns
+
     def get_new_temperature(self, new_temperature: float):
         """
         Returns a new reaction with the temperature changed.
@@ -108,7 +224,7 @@ class ComputedReaction(BasicReaction):
 
     def get_energy(self):
         """ """
-        calc_energies: Dict[Composition, float] = {}
+        calc_energies: Dict[PymatgenComposition, float] = {}
 
         for entry in self._entries:
             (comp, factor) = entry.composition.get_reduced_composition_and_factor()
@@ -127,7 +243,7 @@ class ComputedReaction(BasicReaction):
         Returns (float):
             The calculated reaction energy.
         """
-        calc_energies: Dict[Composition, float] = {}
+        calc_energies: Dict[PymatgenComposition, float] = {}
 
         for entry in self._entries:
             (comp, factor) = entry.composition.get_reduced_composition_and_factor()
@@ -153,24 +269,27 @@ class ComputedReaction(BasicReaction):
     def energy_uncertainty(self) -> float:
         """
         Calculates the uncertainty in the reaction energy based on the uncertainty in
-        the energies of the reactants/products.
+        the energies of the reactants/products. The uncertainties of the entries are
+        treated as independent and propagated analytically (i.e., the square root of
+        the sum of squares of the coefficient-weighted uncertainties).
         """
-
-        calc_energies: Dict[Composition, ufloat] = {}
+        calc_energies: Dict[PymatgenComposition, Tuple[float, float]] = {}
 
         for entry in self._entries:
             (comp, factor) = entry.composition.get_reduced_composition_and_factor()
-            energy_ufloat = ufloat(entry.energy, entry.correction_uncertainty)
-            calc_energies[comp] = min(
-                calc_energies.get(comp, float("inf")), energy_ufloat / factor
-            )
+            energy = entry.energy / factor
+            if comp not in calc_energies or energy < calc_energies[comp][0]:
+                calc_energies[comp] = (energy, entry.correction_uncertainty / factor)
 
-        energy_with_uncertainty = sum(
-            amt * calc_energies[c]
-            for amt, c in zip(self.coefficients, self.compositions)
-        )
+        derivatives: Dict[Composition, float] = {}  # repeated compositions add up
+        for amt, c in zip(self.coefficients, self.compositions):
+            derivatives[c] = derivatives.get(c, 0.0) + amt
 
-        return energy_with_uncertainty.s  # type: ignore
+        return float(
+            np.sqrt(
+                sum((amt * calc_energies[c][1]) ** 2 for c, amt in derivatives.items())
+            )
+        )
 
     @cached_property
     def energy_uncertainty_per_atom(self) -> float:
@@ -258,7 +377,12 @@ class ComputedReaction(BasicReaction):
     def __eq__(self, other):
         is_equal = BasicReaction.__eq__(self, other)
 
-        if is_equal:
-            is_equal = np.isclose(self.energy_per_atom, other.energy_per_atom)
+        if is_equal and self is not other:
+            if not isinstance(other, ComputedReaction):
+                return False
+            with np.errstate(divide="ignore", invalid="ignore"):  # e.g., unbalanced
+                is_equal = np.isclose(
+                    self.energy_per_atom, other.energy_per_atom, equal_nan=True
+                )
 
-        return is_equal
+        return bool(is_equal)
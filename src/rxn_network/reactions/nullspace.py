@@ -0,0 +1,237 @@
+"""
+Exact (rational) linear algebra used for balancing reactions. Composition matrices are
+converted to integers, such that the nullspace of a composition matrix (i.e., the space
+of balanced reactions) is found by fraction-free elimination without numerical error.
+"""
+from fractions import Fraction
+from functools import lru_cache, reduce
+from math import gcd
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAX_DENOMINATOR = 1000000  # for converting non-integer amounts to fractions
+
+IntVector = Tuple[int, ...]
+
+
+def get_nullspace(comp_matrix: np.ndarray) -> List[IntVector]:
+    """
+    Returns an integer basis of the nullspace of a composition matrix. Results are
+    memoized, such that reactions with the same compositions are only solved once.
+
+    Args:
+        comp_matrix: Array of shape (num_elems, num_comp), i.e. one column per
+            composition. Non-integer amounts are converted to fractions (with a
+            denominator of at most MAX_DENOMINATOR).
+
+    Returns:
+        List of basis vectors, each of which contains num_comp integers with a greatest
+        common divisor of 1. The list is empty if the matrix has full column rank
+        (i.e., the reaction can not be balanced).
+    """
+    comp_matrix = np.asarray(comp_matrix, dtype=float)
+    is_int = (comp_matrix == np.round(comp_matrix)).all(axis=0)
+
+    columns, scales = comp_matrix.T.astype(int).tolist(), [1] * len(is_int)
+    for idx in np.flatnonzero(~is_int):
+        fracs = [
+            Fraction(x).limit_denominator(MAX_DENOMINATOR)
+            for x in comp_matrix[:, idx].tolist()
+        ]
+        scale = reduce(_lcm, (f.denominator for f in fracs), 1)
+        columns[idx] = [int(f * scale) for f in fracs]
+        scales[idx] = scale
+
+    rows = tuple(row for row in zip(*columns) if any(row))
+    basis = _get_int_nullspace(rows, len(columns))
+
+    if all(s == 1 for s in scales):
+        return list(basis)
+
+    # scaling a column by s scales the corresponding coefficient by 1/s
+    return [_reduce([s * x for s, x in zip(scales, v)]) for v in basis]
+
+
+def solve_constrained(
+    basis: Sequence[IntVector], constraints: Sequence[int], value: int
+) -> Optional[Tuple[List[int], int]]:
+    """
+    Finds the vector of minimum (Euclidean) norm within the span of the provided basis
+    whose entries at the constrained indices are all equal to value. This is the exact
+    equivalent of solving the composition matrix (with added constraint rows) by
+    least squares via the pseudoinverse.
+
+    Args:
+        basis: Integer basis vectors (see get_nullspace())
+        constraints: Indices of the constrained entries
+        value: Value of the constrained entries (e.g., 1 or -1)
+
+    Returns:
+        The solution as a tuple of integer numerators and a (positive) common
+        denominator, or None if no solution exists.
+    """
+    if not basis:
+        return None
+
+    if len(basis) == 1:
+        v = basis[0]
+        amt = v[constraints[0]]
+        if amt == 0 or any(v[i] != amt for i in constraints):
+            return None
+        sign = 1 if amt > 0 else -1
+        return [sign * value * x for x in v], abs(amt)
+
+    k, m = len(basis), len(constraints)
+    if k == 2 and m <= 2:
+        soln = _solve_constrained_2d(basis[0], basis[1], constraints, value)
+    else:
+        soln = _solve_min_norm(basis, constraints, value)
+
+    if soln is None:
+        return None
+
+    y, denominator = soln
+    sign = 1 if denominator > 0 else -1
+    numerators = [sign * sum(a * b for a, b in zip(y, col)) for col in zip(*basis)]
+
+    return numerators, abs(denominator)
+
+
+def _solve_constrained_2d(
+    u: IntVector, v: IntVector, constraints: Sequence[int], value: int
+) -> Optional[Tuple[List[int], int]]:
+    """Closed-form version of solve_constrained() for a two-dimensional nullspace
+    (the most common case), returning the coordinates y in the basis (u, v) as a
+    tuple of integer numerators and a common denominator."""
+    if len(constraints) == 2:
+        c1, c2 = constraints
+        det = u[c1] * v[c2] - v[c1] * u[c2]
+        if det == 0:  # the solution is not unique (if it exists)
+            return _solve_min_norm([u, v], constraints, value)
+        return [value * (v[c2] - v[c1]), value * (u[c1] - u[c2])], det
+
+    # y is proportional to G^-1 b, where b = (u[c], v[c]); the adjugate of the Gram
+    # matrix G is used instead of its inverse, as the determinant cancels out
+    c = constraints[0]
+    uu = sum(x * x for x in u)
+    uv = sum(x * y for x, y in zip(u, v))
+    vv = sum(y * y for y in v)
+    w = [vv * u[c] - uv * v[c], uu * v[c] - uv * u[c]]
+    denominator = w[0] * u[c] + w[1] * v[c]
+    if denominator == 0:
+        return None
+    return [value * w[0], value * w[1]], denominator
+
+
+def _solve_min_norm(
+    basis: Sequence[IntVector], constraints: Sequence[int], value: int
+) -> Optional[Tuple[List[int], int]]:
+    """Returns the coordinates y (in the provided basis) of the minimum-norm solution
+    of solve_constrained() as a tuple of integer numerators and a common denominator,
+    or None if no solution exists. The solution does not depend on the choice of
+    basis, even if the constraints do not determine it uniquely."""
+    # minimize |N y|^2 subject to N[constraints] y = value, via the KKT conditions:
+    # G y - B^T z = 0 and B y = value, where G = N^T N and B = N[constraints]. G is
+    # positive definite, so y is unique even if B does not have full rank.
+    k, m = len(basis), len(constraints)
+    gram = [[sum(a * b for a, b in zip(u, v)) for v in basis] for u in basis]
+    kkt = [gram[i] + [-basis[i][c] for c in constraints] for i in range(k)]
+    kkt += [[basis[i][c] for i in range(k)] + [0] * m for c in constraints]
+
+    soln = _solve_rational(kkt, [0] * k + [value] * m)
+    if soln is None:
+        return None
+
+    x, denominator = soln
+    return x[:k], denominator
+
+
+@lru_cache(maxsize=100000)
+def _get_int_nullspace(
+    rows: Tuple[IntVector, ...], num_cols: int
+) -> Tuple[IntVector, ...]:
+    """Returns an integer nullspace basis of an integer matrix using fraction-free
+    Gauss-Jordan elimination (rows are divided by their gcd to limit their size)."""
+    reduced: List[IntVector] = list(rows)
+    pivots: List[int] = []
+
+    for col in range(num_cols):
+        r = len(pivots)
+        if r == len(reduced):
+            break
+
+        pivot = next((i for i in range(r, len(reduced)) if reduced[i][col]), None)
+        if pivot is None:
+            continue
+
+        reduced[r], reduced[pivot] = reduced[pivot], reduced[r]
+        a = reduced[r][col]
+        for i, row in enumerate(reduced):
+            b = row[col]
+            if i != r and b:
+                reduced[i] = _reduce([a * x - b * y for x, y in zip(row, reduced[r])])
+
+        pivots.append(col)
+
+    scale = reduce(_lcm, (abs(reduced[i][c]) for i, c in enumerate(pivots)), 1)
+
+    basis = []
+    for free_col in (c for c in range(num_cols) if c not in pivots):
+        v = [0] * num_cols
+        v[free_col] = scale
+        for i, c in enumerate(pivots):
+            v[c] = -reduced[i][free_col] * (scale // reduced[i][c])
+        basis.append(_reduce(v))
+
+    return tuple(basis)
+
+
+def _solve_rational(
+    a: List[List[int]], b: List[int]
+) -> Optional[Tuple[List[int], int]]:
+    """Solves the integer linear system a x = b exactly by fraction-free Gauss-Jordan
+    elimination. Returns a solution (with any free variables set to zero) as a tuple
+    of integer numerators and a common denominator, or None if the system is
+    inconsistent."""
+    rows = [_reduce(list(row) + [y]) for row, y in zip(a, b)]
+    num_cols = len(a[0])
+    pivots: List[int] = []
+
+    for col in range(num_cols):
+        r = len(pivots)
+        pivot = next((i for i in range(r, len(rows)) if rows[i][col]), None)
+        if pivot is None:
+            continue
+
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        p = rows[r][col]
+        for i, row in enumerate(rows):
+            q = row[col]
+            if i != r and q:
+                rows[i] = _reduce([p * x - q * y for x, y in zip(row, rows[r])])
+
+        pivots.append(col)
+
+    if any(row[-1] for row in rows[len(pivots) :]):
+        return None
+
+    denominator = reduce(_lcm, (rows[i][c] for i, c in enumerate(pivots)), 1)
+
+    x = [0] * num_cols
+    for i, col in enumerate(pivots):
+        x[col] = rows[i][-1] * (denominator // rows[i][col])
+
+    return x, denominator
+
+
+def _reduce(v: List[int]) -> IntVector:
+    """Divides an integer vector by the gcd of its entries."""
+    divisor = reduce(gcd, v, 0)
+    if divisor > 1:
+        return tuple(x // divisor for x in v)
+    return tuple(v)
+
+
+def _lcm(a: int, b: int) -> int:
+    return a * b // gcd(a, b)
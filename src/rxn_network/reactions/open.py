@@ -4,7 +4,8 @@ presence of an open entry (e.g. O2), and provides information about reaction
 thermodynamics computed as changes in grand potential.
 """
 from functools import cached_property
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+from weakref import WeakValueDictionary
 
 import numpy as np
 from pymatgen.analysis.phase_diagram import GrandPotPDEntry
@@ -14,6 +15,8 @@ from pymatgen.entries.computed_entries import ComputedEntry
 from rxn_network.core.composition import Composition
 from rxn_network.reactions.computed import ComputedReaction
 
+_grand_entry_cache: WeakValueDictionary = WeakValueDictionary()
+
 
 class OpenComputedReaction(ComputedReaction):
     """
@@ -48,15 +51,24 @@ class OpenComputedReaction(ComputedReaction):
         self.chempots = chempots
         self.open_elems = list(chempots.keys())
 
-        grand_entries = []
-        for e in entries:
-            comp = e.composition.reduced_composition
+    @cached_property
+    def grand_entries(self) -> List[Union[ComputedEntry, GrandPotPDEntry]]:
+        """
+        Returns the entries transformed to grand potential entries (entries of the open
+        elements are not transformed). Grand potential entries are shared by all
+        reactions with the same chemical potentials (see get_grand_entry()).
+        """
+        chempots_key = _get_chempots_key(self.chempots)
+
+        grand_entries: List[Union[ComputedEntry, GrandPotPDEntry]] = []
+        for e in self._entries:
+            comp = e.composition
             if len(comp.elements) == 1 and comp.elements[0] in self.open_elems:
                 grand_entries.append(e)
             else:
-                grand_entries.append(GrandPotPDEntry(e, chempots))
+                grand_entries.append(get_grand_entry(e, self.chempots, chempots_key))
 
-        self.grand_entries = grand_entries
+        return grand_entries
 
     @classmethod
     def balance(  # type: ignore
@@ -108,11 +120,11 @@ class OpenComputedReaction(ComputedReaction):
 
         return rxn
 
-    @property
+    @cached_property
     def energy(self) -> float:
         """
         Returns (float):
-            The calculated reaction energy.
+            The calculated reaction energy (change in grand potential).
         """
         calc_energies: Dict[Composition, float] = {}
 
@@ -233,3 +245,46 @@ class OpenComputedReaction(ComputedReaction):
     def __repr__(self):
         cp = f"({','.join([f'mu_{e}={m}' for e, m in self.chempots.items()])})"
         return f"{super().__repr__()} {cp}"
+
+
+def get_grand_entry(
+    entry: ComputedEntry,
+    chempots: Dict[Element, float],
+    chempots_key: Optional[Tuple] = None,
+) -> GrandPotPDEntry:
+    """
+    Returns a GrandPotPDEntry for the entry at the provided chemical potentials. These
+    are memoized (per entry object, entry energy, and chemical potentials), such that
+    the grand potential entries are only created once when building many reactions
+    from the same entries. The memo only holds weak references: a grand potential entry
+    is dropped once no reaction (or other object) refers to it anymore.
+
+    Args:
+        entry: The entry to transform
+        chempots: Dict of chemical potentials of the open elements
+        chempots_key: Optional hashable key of the chemical potentials (computed from
+            chempots if not provided)
+    """
+    if chempots_key is None:
+        chempots_key = _get_chempots_key(chempots)
+
+    # a cached grand entry refers to its original entry, so the id is not reused while
+    # cached; the energy is part of the key since it is copied into the grand entry
+    key = (id(entry), entry.energy, chempots_key)
+    grand_entry = _grand_entry_cache.get(key)
+    if grand_entry is None:
+        grand_entry = GrandPotPDEntry(entry, chempots)
+        _grand_entry_cache[key] = grand_entry
+
+    return grand_entry
+
+
+def clear_grand_entry_cache():
+    """
+    Clears the memoized grand potential entries (see get_grand_entry()).
+    """
+    _grand_entry_cache.clear()
+
+
+def _get_chempots_key(chempots: Dict[Element, float]) -> Tuple:
+    return tuple(sorted((el.symbol, float(mu)) for el, mu in chempots.items()))
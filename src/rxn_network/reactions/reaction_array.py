@@ -0,0 +1,435 @@
+"""
+A columnar ("struct-of-arrays") container for reactions which share a list of entries.
+Reaction thermodynamics are computed for all reactions at once, and reaction objects
+are only created on demand.
+"""
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pymatgen.core.composition import Element
+from pymatgen.entries.computed_entries import ComputedEntry
+from scipy.sparse import csr_matrix
+
+from rxn_network.entries.entry_set import (
+    GibbsEntrySet,
+    get_energy_matrix,
+    get_energy_vector,
+    get_num_atoms_vector,
+    get_uncertainty_vector,
+)
+from rxn_network.reactions.computed import ComputedReaction
+from rxn_network.reactions.open import OpenComputedReaction
+
+
+class ReactionArray:
+    """
+    Stores a set of reactions as a (padded) matrix of entry indices and a matching
+    matrix of coefficients. Reaction energies and numbers of atoms are calculated for
+    every reaction at once, as the product of a sparse coefficient matrix with
+    per-entry vectors. As in ComputedReaction, entries of the same composition within a
+    reaction are all assigned the lowest energy among them.
+
+    Indexing the array with an integer returns a lightweight ReactionView; indexing
+    with a slice, boolean mask, or array of indices returns a new ReactionArray.
+    """
+
+    def __init__(
+        self,
+        entries: Union[List[ComputedEntry], GibbsEntrySet],
+        indices: Sequence[Sequence[int]],
+        coeffs: Sequence[Sequence[float]],
+        chempots: Optional[Dict[Element, float]] = None,
+        all_data: Optional[List[Dict]] = None,
+    ):
+        """
+        Args:
+            entries: List of ComputedEntry objects shared by reactions. If a
+                GibbsEntrySet is provided, the indices refer to its entries_list and
+                its (cached) energy and atom count vectors are used.
+            indices: Entry indices of each reaction
+            coeffs: Coefficients of each reaction (in the same order as the indices)
+            chempots: Optional chemical potentials of open elements. If provided,
+                reaction energies are changes in grand potential and views
+                materialize OpenComputedReaction objects.
+            all_data: Optional list of data for each reaction
+        """
+        self._set_entries(entries)
+        self.chempots = chempots or {}
+        self.all_data = list(all_data) if all_data else [{} for _ in indices]
+
+        self.lengths = np.array([len(i) for i in indices], dtype=int)
+        width = int(self.lengths.max()) if len(self.lengths) else 0
+
+        self.entry_indices = np.zeros((len(self.lengths), width), dtype=int)
+        self.coeffs = np.zeros((len(self.lengths), width))
+        for row, (idxs, c) in enumerate(zip(indices, coeffs)):
+            self.entry_indices[row, : len(idxs)] = idxs
+            self.coeffs[row, : len(c)] = c
+
+    @classmethod
+    def from_csr(
+        cls,
+        entries: Union[List[ComputedEntry], GibbsEntrySet],
+        flat_indices: np.ndarray,
+        flat_coeffs: np.ndarray,
+        offsets: np.ndarray,
+        chempots: Optional[Dict[Element, float]] = None,
+        all_data: Optional[List[Dict]] = None,
+    ) -> "ReactionArray":
+        """
+        Creates a ReactionArray from reactions stored in a compressed sparse row (CSR)
+        layout, as in ReactionSet. The padded matrices are filled (and the sparse
+        coefficient matrix is created) without iterating over the reactions.
+
+        Args:
+            entries: List of ComputedEntry objects (or a GibbsEntrySet) shared by
+                reactions
+            flat_indices: Entry indices of all reactions, concatenated
+            flat_coeffs: Coefficients of all reactions, concatenated
+            offsets: Array of length num_rxns + 1; reaction i is stored in positions
+                offsets[i] to offsets[i+1] of the flat arrays
+            chempots: Optional chemical potentials of open elements
+            all_data: Optional list of data for each reaction
+        """
+        lengths = np.diff(offsets)
+        num_rxns = len(lengths)
+        width = int(lengths.max()) if num_rxns else 0
+
+        rows = np.repeat(np.arange(num_rxns), lengths)
+        cols = np.arange(len(flat_indices)) - np.repeat(offsets[:-1], lengths)
+
+        array = cls.__new__(cls)
+        array._set_entries(entries)
+        array.chempots = chempots or {}
+        array.all_data = list(all_data) if all_data else [{} for _ in lengths]
+        array.lengths = lengths
+        array.entry_indices = np.zeros((num_rxns, width), dtype=int)
+        array.entry_indices[rows, cols] = flat_indices
+        array.coeffs = np.zeros((num_rxns, width))
+        array.coeffs[rows, cols] = flat_coeffs
+
+        array.matrix = csr_matrix(  # type: ignore
+            (flat_coeffs, flat_indices, offsets), shape=(num_rxns, len(array.entries))
+        )
+
+        return array
+
+    def _set_entries(self, entries: Union[List[ComputedEntry], GibbsEntrySet]):
+        """Sets the entries (and the entry set, if provided) of the array."""
+        self.entry_set: Optional[GibbsEntrySet] = None
+        if isinstance(entries, GibbsEntrySet):
+            self.entry_set = entries
+            entries = entries.entries_list
+
+        self.entries = entries
+
+    @cached_property
+    def entry_energies(self) -> np.ndarray:
+        """
+        Energy of every entry per reduced formula unit; this is the grand potential if
+        chemical potentials were provided (see get_energy_vector()).
+        """
+        if self.entry_set is not None and not self.chempots:
+            return self.entry_set.energy_vector
+        return get_energy_vector(self.entries, self.chempots)
+
+    @cached_property
+    def entry_num_atoms(self) -> np.ndarray:
+        """
+        Number of atoms of every entry per reduced formula unit, excluding any open
+        elements (see get_num_atoms_vector()).
+        """
+        if self.entry_set is not None and not self.chempots:
+            return self.entry_set.num_atoms_vector
+        return get_num_atoms_vector(self.entries, self.chempots)
+
+    @cached_property
+    def entry_comp_ids(self) -> np.ndarray:
+        """
+        Index of the reduced composition of every entry; entries with the same reduced
+        composition share an index.
+        """
+        comp_ids: Dict = {}
+        return np.array(
+            [
+                comp_ids.setdefault(e.composition.reduced_composition, len(comp_ids))
+                for e in self.entries
+            ],
+            dtype=int,
+        )
+
+    @cached_property
+    def entry_uncertainties(self) -> np.ndarray:
+        """
+        Energy uncertainty of every entry per reduced formula unit (see
+        get_uncertainty_vector()).
+        """
+        return get_uncertainty_vector(self.entries)
+
+    @cached_property
+    def matrix(self) -> csr_matrix:
+        """
+        Sparse matrix of shape (num_rxns, num_entries) containing the coefficient of
+        every entry in every reaction.
+        """
+        mask = np.arange(self.coeffs.shape[1]) < self.lengths[:, None]
+        indptr = np.concatenate([[0], np.cumsum(self.lengths)])
+
+        return csr_matrix(
+            (self.coeffs[mask], self.entry_indices[mask], indptr),
+            shape=(len(self), len(self.entries)),
+        )
+
+    @cached_property
+    def energy_matrix(self) -> csr_matrix:
+        """
+        Coefficient matrix used to calculate reaction energies. Where a reaction
+        contains several entries of the same composition, their coefficients are
+        summed onto the lowest-energy entry among them (as in ComputedReaction.energy).
+        Otherwise, this is the same as the matrix.
+        """
+        groups = self._comp_groups
+        if groups is None:
+            return self.matrix
+
+        order, starts, rows = groups
+        m = self.matrix
+
+        return csr_matrix(
+            (np.add.reduceat(m.data[order], starts), (rows, m.indices[order][starts])),
+            shape=m.shape,
+        )
+
+    @cached_property
+    def energies(self) -> np.ndarray:
+        """Reaction energies (eV)"""
+        return self.energy_matrix @ self.entry_energies
+
+    @cached_property
+    def num_atoms(self) -> np.ndarray:
+        """
+        Total number of atoms in each reaction. As in ComputedReaction.num_atoms, only
+        the atoms on the product side are counted (excluding any open elements), which
+        also applies to unbalanced reactions.
+        """
+        m = self.matrix
+        products = csr_matrix(
+            (np.maximum(m.data, 0), m.indices, m.indptr), shape=m.shape
+        )
+        return products @ self.entry_num_atoms
+
+    @cached_property
+    def energies_per_atom(self) -> np.ndarray:
+        """Reaction energies divided by the total number of atoms (eV/atom)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.energies / self.num_atoms
+
+    @cached_property
+    def energy_uncertainties(self) -> np.ndarray:
+        """
+        Uncertainties in the reaction energies (eV), propagated from the entry
+        uncertainties assuming they are independent.
+        """
+        m = self.energy_matrix
+        squared = csr_matrix((m.data**2, m.indices, m.indptr), shape=m.shape)
+        return np.sqrt(squared @ self.entry_uncertainties**2)
+
+    @cached_property
+    def energy_uncertainties_per_atom(self) -> np.ndarray:
+        """Reaction energy uncertainties divided by the total number of atoms"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.energy_uncertainties / self.num_atoms
+
+    def get_energies_at_temperatures(
+        self, temperatures: Iterable[float], per_atom: bool = False
+    ) -> np.ndarray:
+        """
+        Calculates the energies of all reactions at each of the provided temperatures.
+        Entry energies are evaluated for all temperatures at once (see
+        get_energy_matrix()), so no new entry or reaction objects are created. Entries
+        of the same composition within a reaction are assigned the lowest energy among
+        them at each temperature.
+
+        Args:
+            temperatures: Temperatures at which to evaluate the energies [K]
+            per_atom: Whether to divide the reaction energies by the total number of
+                atoms in each reaction (eV/atom). Defaults to False.
+
+        Returns:
+            Array of reaction energies with shape (num_rxns, num_temperatures)
+        """
+        entry_energies = get_energy_matrix(self.entries, temperatures, self.chempots)
+
+        groups = self._comp_groups
+        if groups is None:
+            energies = self.matrix @ entry_energies
+        else:
+            order, starts, rows = groups
+            m = self.matrix
+            min_energies = np.minimum.reduceat(
+                entry_energies[m.indices[order]], starts, axis=0
+            )
+            group_coeffs = np.add.reduceat(m.data[order], starts)
+            group_matrix = csr_matrix(
+                (group_coeffs, (rows, np.arange(len(starts)))),
+                shape=(len(self), len(starts)),
+            )
+            energies = group_matrix @ min_energies
+
+        if per_atom:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                energies = energies / self.num_atoms[:, None]
+
+        return energies
+
+    @cached_property
+    def _comp_groups(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Groups the entries of each reaction by their reduced composition. Returns None
+        if no reaction contains more than one entry of the same composition. Otherwise,
+        returns a tuple of:
+
+            1. the order of the (flat) matrix entries, sorted by reaction, composition,
+                and energy
+            2. the positions in this order at which each group starts (i.e., the
+                lowest-energy entry of the group)
+            3. the reaction of each group
+        """
+        m = self.matrix
+        rows = np.repeat(np.arange(len(self)), np.diff(m.indptr))
+        comp_ids = self.entry_comp_ids[m.indices]
+
+        order = np.lexsort((self.entry_energies[m.indices], comp_ids, rows))
+        rows, comp_ids = rows[order], comp_ids[order]
+
+        is_start = np.ones(len(order), dtype=bool)
+        is_start[1:] = (rows[1:] != rows[:-1]) | (comp_ids[1:] != comp_ids[:-1])
+        if is_start.all():
+            return None
+
+        starts = np.flatnonzero(is_start)
+        return order, starts, rows[starts]
+
+    def get_rxn(self, idx: int) -> Union[ComputedReaction, OpenComputedReaction]:
+        """
+        Creates the reaction object at the provided index.
+
+        Args:
+            idx: Index of the reaction
+
+        Returns:
+            An OpenComputedReaction if chemical potentials were provided, otherwise a
+            ComputedReaction.
+        """
+        length = self.lengths[idx]
+        entries = [self.entries[i] for i in self.entry_indices[idx, :length]]
+        coeffs = self.coeffs[idx, :length]
+        data = self.all_data[idx]
+
+        if self.chempots:
+            return OpenComputedReaction(
+                entries=entries, coefficients=coeffs, chempots=self.chempots, data=data
+            )
+
+        return ComputedReaction(entries=entries, coefficients=coeffs, data=data)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("Reaction index out of range!")
+            return ReactionView(self, int(key))
+
+        idxs = np.arange(len(self))[key]
+        new = ReactionArray.__new__(ReactionArray)
+        new.entries = self.entries
+        new.entry_set = self.entry_set
+        new.chempots = self.chempots
+        new.all_data = [self.all_data[i] for i in idxs]
+        new.lengths = self.lengths[idxs]
+        new.entry_indices = self.entry_indices[idxs]
+        new.coeffs = self.coeffs[idxs]
+
+        shared_attrs = [
+            "entry_energies",
+            "entry_num_atoms",
+            "entry_uncertainties",
+            "entry_comp_ids",
+        ]
+        for attr in shared_attrs:  # shared by all reactions
+            if attr in self.__dict__:
+                setattr(new, attr, self.__dict__[attr])
+
+        return new
+
+    def __iter__(self):
+        return (ReactionView(self, i) for i in range(len(self)))
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+class ReactionView:
+    """
+    A lightweight, read-only view of a single reaction within a ReactionArray.
+    Energies are taken from the array; any other attribute is looked up on the
+    corresponding reaction object, which is only created on first access.
+    """
+
+    __slots__ = ("array", "idx", "_rxn")
+
+    def __init__(self, array: ReactionArray, idx: int):
+        """
+        Args:
+            array: The ReactionArray containing the reaction
+            idx: Index of the reaction within the array
+        """
+        self.array = array
+        self.idx = idx
+        self._rxn: Optional[Union[ComputedReaction, OpenComputedReaction]] = None
+
+    @property
+    def data(self) -> Dict:
+        """Data associated with the reaction"""
+        return self.array.all_data[self.idx]
+
+    @property
+    def energy(self) -> float:
+        """The reaction energy (eV)"""
+        return float(self.array.energies[self.idx])
+
+    @property
+    def energy_per_atom(self) -> float:
+        """The reaction energy divided by the total number of atoms (eV/atom)"""
+        return float(self.array.energies_per_atom[self.idx])
+
+    @property
+    def energy_uncertainty(self) -> float:
+        """The uncertainty in the reaction energy (eV)"""
+        return float(self.array.energy_uncertainties[self.idx])
+
+    @property
+    def energy_uncertainty_per_atom(self) -> float:
+        """The reaction energy uncertainty divided by the total number of atoms"""
+        return float(self.array.energy_uncertainties_per_atom[self.idx])
+
+    @property
+    def num_atoms(self) -> float:
+        """Total number of atoms in the reaction"""
+        return float(self.array.num_atoms[self.idx])
+
+    def to_rxn(self) -> Union[ComputedReaction, OpenComputedReaction]:
+        """Returns the (cached) reaction object for this view."""
+        if self._rxn is None:
+            self._rxn = self.array.get_rxn(self.idx)
+        return self._rxn
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.to_rxn(), name)
+
+    def __repr__(self):
+        return f"ReactionView({self.to_rxn()})"
@@ -3,20 +3,23 @@ Implements a class for conveniently and efficiently storing sets of ComputedReac
 objects which share entries.
 """
 from collections import OrderedDict
-from functools import lru_cache
-from itertools import combinations, groupby
-from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Union
+from functools import cached_property, lru_cache
+from itertools import chain
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import numpy as np
-from monty.json import MSONable
+from monty.json import MontyDecoder, MSONable
 from pandas import DataFrame
 from pymatgen.core.composition import Element
 from pymatgen.entries.computed_entries import ComputedEntry
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from rxn_network.core.composition import Composition
 from rxn_network.core.cost_function import CostFunction
 from rxn_network.reactions.computed import ComputedReaction
-from rxn_network.reactions.open import OpenComputedReaction
+from rxn_network.reactions.open import OpenComputedReaction, get_grand_entry
+from rxn_network.reactions.reaction_array import ReactionArray
 
 
 class ReactionSet(MSONable):
@@ -26,6 +29,12 @@ class ReactionSet(MSONable):
     a second array linking to a corresponding list of shared entries. This is useful for
     dumping large amounts of reaction data to a database.
 
+    The reactions are stored in a compressed sparse row (CSR) layout: flat arrays of
+    entry indices (int32) and coefficients (float64) for all reactions, with an array
+    of offsets marking where each reaction begins. Reaction data is stored as typed
+    columns for any numeric keys shared by all reactions (e.g., "num_constraints"),
+    with any remaining data kept as a list of dicts.
+
     Note: this is not a true "set"; there is the option for filtering duplicates but it
         is not explicitly required.
     """
@@ -49,17 +58,132 @@ class ReactionSet(MSONable):
             chempot: Chemical potential (mu) of open element in equation: Phi = G - mu*N
             all_data: Optional list of data for each reaction
         """
+        lengths = np.fromiter((len(i) for i in indices), dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        flat_indices = np.fromiter(
+            chain.from_iterable(indices), dtype=np.int32, count=offsets[-1]
+        )
+        flat_coeffs = np.fromiter(
+            chain.from_iterable(coeffs), dtype=np.float64, count=offsets[-1]
+        )
+        data_columns, other_data = self._get_data_columns(all_data, len(lengths))
+
+        self._set_arrays(
+            entries,
+            flat_indices,
+            flat_coeffs,
+            offsets,
+            open_elem,
+            chempot,
+            data_columns,
+            other_data,
+        )
+
+    @classmethod
+    def from_csr(
+        cls,
+        entries: List[ComputedEntry],
+        flat_indices: np.ndarray,
+        flat_coeffs: np.ndarray,
+        offsets: np.ndarray,
+        open_elem: Optional[Union[str, Element]] = None,
+        chempot: float = 0.0,
+        data_columns: Optional[Dict[str, np.ndarray]] = None,
+        other_data: Optional[List[Dict]] = None,
+    ) -> "ReactionSet":
+        """
+        Initiate a ReactionSet object directly from its CSR arrays. The arrays are not
+        copied if they already have the correct dtypes.
+
+        Args:
+            entries: List of ComputedEntry objects shared by reactions
+            flat_indices: Entry indices of all reactions, concatenated
+            flat_coeffs: Coefficients of all reactions, concatenated
+            offsets: Array of length num_rxns + 1; reaction i is stored in positions
+                offsets[i] to offsets[i+1] of the flat arrays
+            open_elem: Open element, e.g., "O"
+            chempot: Chemical potential (mu) of open element in equation: Phi = G - mu*N
+            data_columns: Optional dict of typed data columns, each of length num_rxns
+            other_data: Optional list of any other data (dicts) for each reaction
+        """
+        rxn_set = cls.__new__(cls)
+        rxn_set._set_arrays(
+            entries,
+            np.asarray(flat_indices, dtype=np.int32),
+            np.asarray(flat_coeffs, dtype=np.float64),
+            np.asarray(offsets, dtype=np.int64),
+            open_elem,
+            chempot,
+            data_columns or {},
+            other_data,
+        )
+        return rxn_set
+
+    def _set_arrays(
+        self,
+        entries,
+        flat_indices,
+        flat_coeffs,
+        offsets,
+        open_elem,
+        chempot,
+        data_columns,
+        other_data,
+    ):
+        """Sets the attributes of the reaction set (see from_csr())."""
         self.entries = entries
-        self.indices = indices
-        self.coeffs = coeffs
+        self.flat_indices = flat_indices
+        self.flat_coeffs = flat_coeffs
+        self.offsets = offsets
         self.open_elem = open_elem
         self.chempot = chempot
-        self.all_data = all_data if all_data else []
+        self.data_columns = data_columns
+        self.other_data = other_data
+
+        self.metrics: Optional[Any] = None  # set by enumerators (EnumerationMetrics)
 
         self.mu_dict = None
         if open_elem:
             self.mu_dict = {Element(open_elem): chempot}  # type: ignore
 
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of entries in each reaction"""
+        return np.diff(self.offsets)
+
+    @property
+    def indices(self) -> List[np.ndarray]:
+        """Entry indices of each reaction (as views into flat_indices)"""
+        if len(self) == 0:
+            return []
+        return np.split(self.flat_indices, self.offsets[1:-1])
+
+    @property
+    def coeffs(self) -> List[np.ndarray]:
+        """Coefficients of each reaction (as views into flat_coeffs)"""
+        if len(self) == 0:
+            return []
+        return np.split(self.flat_coeffs, self.offsets[1:-1])
+
+    @property
+    def all_data(self) -> List[Dict]:
+        """
+        Data of each reaction, assembled from the typed data columns and any other
+        data.
+        """
+        if self.other_data is None:
+            all_data: List[Dict] = [{} for _ in range(len(self))]
+        else:
+            all_data = [dict(d) for d in self.other_data]
+
+        for key, column in self.data_columns.items():
+            for data, value in zip(all_data, column.tolist()):
+                data[key] = value
+
+        return all_data
+
     def get_rxns(
         self,
     ) -> Iterable[Union[ComputedReaction, OpenComputedReaction]]:
@@ -67,7 +191,22 @@ class ReactionSet(MSONable):
         Returns list of ComputedReaction objects or OpenComputedReaction objects (when
         open element and chempot are specified) for the reaction set.
         """
-        return self._get_rxns_by_indices(idxs=range(len(self.coeffs)))
+        return self._get_rxns_by_indices(idxs=range(len(self)))
+
+    def to_array(self) -> ReactionArray:
+        """
+        Returns the reactions as a ReactionArray, i.e. in a columnar format where
+        reaction energies are calculated for all reactions at once and reaction objects
+        are only created when needed.
+        """
+        return ReactionArray.from_csr(
+            self.entries,
+            self.flat_indices,
+            self.flat_coeffs,
+            self.offsets,
+            chempots=self.mu_dict,
+            all_data=self.all_data,
+        )
 
     @classmethod
     def from_rxns(
@@ -204,11 +343,12 @@ class ReactionSet(MSONable):
 
         data.update({k: [] for k in attrs + ["cost"]})
 
-        for rxn in self.get_rxns():
+        for view in self.to_array():
+            rxn = view.to_rxn()
             data["rxn"].append(rxn)
-            data["energy"].append(rxn.energy_per_atom)
+            data["energy"].append(view.energy_per_atom)
             if calculate_uncertainties:
-                data["dE"].append(rxn.energy_uncertainty_per_atom)
+                data["dE"].append(view.energy_uncertainty_per_atom)
             if target:
                 data["added_elems"].append(self._get_added_elems(rxn, target))
                 if calculate_separable:
@@ -236,7 +376,7 @@ class ReactionSet(MSONable):
             for attr in attrs:
                 data[attr].append(rxn.data.get(attr))
 
-            data["cost"].append(cost_function.evaluate(rxn))
+            data["cost"].append(cost_function.evaluate(view))
 
         df = DataFrame(data).sort_values("cost").reset_index(drop=True)
         return df
@@ -246,12 +386,33 @@ class ReactionSet(MSONable):
         cf: CostFunction,
     ) -> List[float]:
         """
-        Evaluate a cost function on an acquired set of reactions.
+        Evaluate a cost function on an acquired set of reactions. The cost function is
+        evaluated on lightweight views of the reactions (see ReactionArray), such that
+        reaction objects are only created if the cost function requires them.
 
         Args:
             cf: CostFunction object, e.g. Softplus()
         """
-        return [cf.evaluate(rxn) for rxn in self.get_rxns()]
+        return [cf.evaluate(rxn) for rxn in self.to_array()]
+
+    def get_energies_at_temperatures(
+        self, temperatures: Iterable[float], per_atom: bool = False
+    ) -> np.ndarray:
+        """
+        Calculates the energies of all reactions in the set at each of the provided
+        temperatures. This is much faster than calling get_new_temperature() on each
+        reaction, as no new entries or reactions are created (see ReactionArray).
+
+        Args:
+            temperatures: Temperatures at which to evaluate the energies [K]
+            per_atom: Whether to return energies per atom (eV/atom). Defaults to False.
+
+        Returns:
+            Array of reaction energies with shape (num_rxns, num_temperatures)
+        """
+        return self.to_array().get_energies_at_temperatures(
+            temperatures, per_atom=per_atom
+        )
 
     def add_rxns(self, rxns):
         """
@@ -266,15 +427,17 @@ class ReactionSet(MSONable):
             new_coeffs.append(list(rxn.coefficients))
             new_data.append(rxn.data)
 
-        return ReactionSet(
+        new_rxn_set = ReactionSet(
             self.entries,
-            self.indices + new_indices,
-            self.coeffs + new_coeffs,
+            new_indices,
+            new_coeffs,
             self.open_elem,
             self.chempot,
-            self.all_data + new_data,
+            new_data,
         )
 
+        return self._concat(new_rxn_set)
+
     def add_rxn_set(self, rxn_set):
         """Adds a new reaction set to current reaction set.
 
@@ -286,121 +449,182 @@ class ReactionSet(MSONable):
             raise ValueError(
                 "Reaction sets must have identical entries property to add."
             )
-        open_elem = self.open_elem
-        chempot = self.chempot
-
-        indices = self.indices + rxn_set.indices
-        coeffs = self.coeffs + rxn_set.coeffs
-        all_data = self.all_data + rxn_set.all_data
 
-        return ReactionSet(self.entries, indices, coeffs, open_elem, chempot, all_data)
+        return self._concat(rxn_set)
 
     def get_rxns_by_reactants(self, reactants: List[str]):
         """
         Return a list of reactions with the given reactants.
         """
-        idxs = []
         reactants = [Composition(r).reduced_formula for r in reactants]
 
-        reactant_indices = {
+        reactant_indices = [
             idx
             for idx, e in enumerate(self.entries)
             if e.composition.reduced_formula in reactants
-        }
+        ]
 
         if not reactant_indices:
             return []
 
-        for idx, (coeffs, indices) in enumerate(zip(self.coeffs, self.indices)):
-            r_indices = {i for c, i in zip(coeffs, indices) if c < 1e-12}
-            if r_indices.issubset(reactant_indices):
-                idxs.append(idx)
+        _, _, num_reactants = self._entry_rxn_index["reactants"]
+        num_matched = np.bincount(
+            self._get_rxn_ids(reactant_indices, "reactants"), minlength=len(self)
+        )
+        idxs = np.flatnonzero(num_matched == num_reactants)
 
-        return self._get_rxns_by_indices(idxs)
+        return self._get_rxns_by_indices(idxs.tolist())
 
     def get_rxns_by_product(self, product: str):
         """
         Return a list of reactions which contain the given product formula.
         """
-        idxs = []
         product = Composition(product).reduced_formula
 
-        product_index = None
-        for idx, e in enumerate(self.entries):
-            if e.composition.reduced_formula == product:
-                product_index = idx
-                break
+        product_indices = [
+            idx
+            for idx, e in enumerate(self.entries)
+            if e.composition.reduced_formula == product
+        ]
 
-        if not product_index:
+        if not product_indices:
             return []
 
-        for idx, (coeffs, indices) in enumerate(zip(self.coeffs, self.indices)):
-            p_indices = {i for c, i in zip(coeffs, indices) if c > -1e-12}
-            if product_index in p_indices:
-                idxs.append(idx)
+        idxs = np.unique(self._get_rxn_ids(product_indices, "products"))
 
-        return self._get_rxns_by_indices(idxs)
+        return self._get_rxns_by_indices(idxs.tolist())
 
     def filter_duplicates(self):
         """
-        Return a new ReactionSet object with duplicate reactions removed
+        Return a new ReactionSet object with duplicate reactions removed. Two reactions
+        are duplicates if they contain the same entries and their coefficients differ
+        only by a positive factor (i.e., their normalized coefficients have the same
+        signs and are np.isclose); only the first of each set of duplicates is kept.
+        As before, reactions with a coefficient of zero are never removed.
+
+        Each reaction is reduced to a canonical key: its sorted entry indices, the
+        signs of its coefficients, and the logarithms of their magnitudes (normalized
+        by the first coefficient) quantized into bins of the relative tolerance of
+        np.isclose. All keys are lexsorted once, after which every row is compared
+        against the previous one. Duplicates whose coefficients fall on either side of
+        a bin boundary are found by a second pass with bins shifted by half their
+        width.
         """
-        indices_to_remove = set()
-        if len(self.coeffs) == 0:
+        if len(self) == 0:
             return self
 
-        # groupby only works with pre-sorted arrays
-        sorted_coeffs, sorted_idxs, sorted_indices = zip(
-            *list(
-                sorted(
-                    zip(self.coeffs, range(len(self.indices)), self.indices),
-                    key=lambda x: sorted(x[2]),
-                )
-            )
+        lengths = self.lengths
+        rows = np.repeat(np.arange(len(self)), lengths)
+        order = np.lexsort((self.flat_indices, rows))  # sort entries within each row
+
+        width = int(lengths.max())
+        cols = np.arange(len(rows)) - np.repeat(self.offsets[:-1], lengths)
+
+        index_keys = np.full((len(self), width), -1, dtype=np.int64)
+        index_keys[rows, cols] = self.flat_indices[order]
+        coeffs = np.zeros((len(self), width))
+        coeffs[rows, cols] = self.flat_coeffs[order]
+
+        index_keys = np.ascontiguousarray(index_keys).view(
+            np.dtype((np.void, index_keys.dtype.itemsize * width))
         )
+        _, group_ids, counts = np.unique(
+            index_keys.ravel(), return_inverse=True, return_counts=True
+        )
+        if counts.max() == 1:
+            return self
 
-        for i, group in groupby(
-            zip(sorted_coeffs, sorted_idxs, sorted_indices),
-            key=lambda i: sorted(i[2]),
-        ):
-            coeffs_group, idx_group, indices_group = zip(*group)
-            if len(idx_group) > 1:
-                for (_, coeffs1, indices1), (
-                    idx2,
-                    coeffs2,
-                    indices2,
-                ) in combinations(zip(idx_group, coeffs_group, indices_group), 2):
-                    if idx2 in indices_to_remove:
-                        continue
-
-                    coeffs2_sorted = [coeffs2[indices2.index(i)] for i in indices1]
-
-                    ratios = np.array(coeffs1) / np.array(coeffs2_sorted)
-                    if (
-                        ratios <= 1e-8
-                    ).any():  # do not remove any reaction with negative ratio
-                        continue
-
-                    if np.isclose(ratios[0], ratios).all():
-                        indices_to_remove.add(idx2)
-
-        new_indices = []
-        new_coeffs = []
-        new_all_data = []
-
-        for idx in set(range(len(self))) - indices_to_remove:
-            new_indices.append(self.indices[idx])
-            new_coeffs.append(self.coeffs[idx])
-            new_all_data.append(self.all_data[idx])
-
-        return ReactionSet(
-            self.entries,
-            new_indices,
-            new_coeffs,
-            self.open_elem,
-            self.chempot,
-            new_all_data,
+        group_ids = group_ids.ravel()
+        is_padding = np.arange(width) >= lengths[:, None]
+        has_zero = ((coeffs == 0) & ~is_padding).any(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coeffs = coeffs / np.abs(coeffs[:, :1])
+            coeffs[has_zero] = 0.0  # never duplicates; avoids nan/inf keys
+            log_coeffs = np.where(coeffs == 0, 0.0, np.log(np.abs(coeffs)))
+        signs = np.sign(coeffs)
+
+        tol = 1e-5  # relative tolerance of np.isclose
+        prev_rows, curr_rows = [], []
+        for shift in [0.0, 0.5]:
+            bins = np.floor(log_coeffs / tol + shift).astype(np.int64)
+            sorted_rows = np.lexsort(
+                tuple(bins[:, col] for col in reversed(range(width)))
+                + tuple(signs[:, col] for col in reversed(range(width)))
+                + (group_ids,)
+            )
+            prev, curr = sorted_rows[:-1], sorted_rows[1:]
+
+            is_close = np.isclose(coeffs[prev], coeffs[curr], rtol=tol)
+            is_duplicate = (
+                (group_ids[prev] == group_ids[curr])
+                & (signs[prev] == signs[curr]).all(axis=1)
+                & (is_close | is_padding[curr]).all(axis=1)
+                & ~has_zero[prev]
+                & ~has_zero[curr]
+            )
+            prev_rows.append(prev[is_duplicate])
+            curr_rows.append(curr[is_duplicate])
+
+        prev, curr = np.concatenate(prev_rows), np.concatenate(curr_rows)
+        if len(prev) == 0:
+            return self
+
+        graph = coo_matrix(
+            (np.ones(len(prev)), (prev, curr)), shape=(len(self), len(self))
         )
+        _, duplicate_ids = connected_components(graph, directed=False)
+        _, keep = np.unique(duplicate_ids, return_index=True)  # first in original order
+
+        return self[np.sort(keep)]
+
+    @cached_property
+    def _entry_rxn_index(self) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Inverted index from entries to the reactions containing them, built on first
+        use. For each side ("reactants" or "products"), this is a tuple of:
+
+            1. the ids of the reactions containing each entry on that side, in a CSR
+                layout; i.e., the reactions containing entry i are
+                rxn_ids[offsets[i]:offsets[i+1]]
+            2. the offsets into the reaction ids
+            3. the number of entries on that side of each reaction
+
+        As before, entries with a zero coefficient count as both reactants and
+        products.
+        """
+        rows = np.repeat(np.arange(len(self)), self.lengths)
+        masks = {
+            "reactants": self.flat_coeffs < 1e-12,
+            "products": self.flat_coeffs > -1e-12,
+        }
+
+        index = {}
+        for side, mask in masks.items():
+            entry_idxs = self.flat_indices[mask]
+            side_rows = rows[mask]
+
+            counts = np.bincount(entry_idxs, minlength=len(self.entries))
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+
+            rxn_ids = side_rows[np.argsort(entry_idxs, kind="stable")]
+            num_per_rxn = np.bincount(side_rows, minlength=len(self))
+
+            index[side] = (rxn_ids, offsets, num_per_rxn)
+
+        return index
+
+    def _get_rxn_ids(self, entry_idxs: Iterable[int], side: str) -> np.ndarray:
+        """
+        Return the ids of all reactions containing any of the given entries on the
+        given side ("reactants" or "products"). An id is repeated for every matching
+        entry in the reaction.
+        """
+        rxn_ids, offsets, _ = self._entry_rxn_index[side]
+        matches = [rxn_ids[offsets[i] : offsets[i + 1]] for i in entry_idxs]
+
+        return np.concatenate(matches) if matches else np.array([], dtype=int)
 
     def _get_rxns_by_indices(
         self, idxs: Union[List[int], range]
@@ -408,22 +632,22 @@ class ReactionSet(MSONable):
         """
         Return a list of reactions with the given indices.
         """
-        if idxs == range(len(self.coeffs)):
-            indices_slice = self.indices
-            coeffs_slice = self.coeffs
+        if idxs == range(len(self)):
             data_slice = self.all_data
         else:
-            indices_slice = []
-            coeffs_slice = []
-            data_slice = []
+            data_slice = [self._get_data(idx) for idx in idxs]
+
+        # the memoized grand entries (see get_grand_entry()) are only weakly cached, so
+        # they are kept alive here to be shared by all reactions while iterating
+        grand_entries = []
+        if self.mu_dict:
+            grand_entries = [get_grand_entry(e, self.mu_dict) for e in self.entries]
 
-            for idx in idxs:
-                indices_slice.append(self.indices[idx])
-                coeffs_slice.append(self.coeffs[idx])
-                data_slice.append(self.all_data[idx])
+        for idx, data in zip(idxs, data_slice):
+            start, end = self.offsets[idx], self.offsets[idx + 1]
+            entries = [self.entries[i] for i in self.flat_indices[start:end].tolist()]
+            coeffs = self.flat_coeffs[start:end]
 
-        for indices, coeffs, data in zip(indices_slice, coeffs_slice, data_slice):
-            entries = [self.entries[i] for i in indices]
             if self.mu_dict:
                 rxn = OpenComputedReaction(
                     entries=entries,
@@ -436,6 +660,131 @@ class ReactionSet(MSONable):
 
             yield rxn
 
+        del grand_entries
+
+    def _get_data(self, idx: int) -> Dict:
+        """
+        Return the data of the reaction at the given index.
+        """
+        data = {} if self.other_data is None else dict(self.other_data[idx])
+        for key, column in self.data_columns.items():
+            data[key] = column[idx].item()
+
+        return data
+
+    def _get_subset(self, idxs: Union[slice, np.ndarray]) -> "ReactionSet":
+        """
+        Return a new ReactionSet containing the reactions at the given indices. For
+        contiguous slices, the arrays of the new reaction set are views into the arrays
+        of this reaction set (i.e., no data is copied).
+        """
+        if isinstance(idxs, slice) and idxs.step in (None, 1):
+            start, stop, _ = idxs.indices(len(self))
+            stop = max(start, stop)
+            first, last = self.offsets[start], self.offsets[stop]
+
+            flat_indices = self.flat_indices[first:last]
+            flat_coeffs = self.flat_coeffs[first:last]
+            offsets = self.offsets[start : stop + 1] - first
+            rows: Union[slice, np.ndarray] = slice(start, stop)
+        else:
+            row_idxs = np.arange(len(self))[idxs]
+            lengths = self.lengths[row_idxs]
+
+            offsets = np.zeros(len(row_idxs) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            positions = np.repeat(self.offsets[row_idxs] - offsets[:-1], lengths)
+            positions += np.arange(offsets[-1])
+
+            flat_indices = self.flat_indices[positions]
+            flat_coeffs = self.flat_coeffs[positions]
+            rows = row_idxs
+
+        data_columns = {key: col[rows] for key, col in self.data_columns.items()}
+
+        other_data = None
+        if self.other_data is not None:
+            if isinstance(rows, slice):
+                other_data = self.other_data[rows]
+            else:
+                other_data = [self.other_data[i] for i in rows]
+
+        return ReactionSet.from_csr(
+            self.entries,
+            flat_indices,
+            flat_coeffs,
+            offsets,
+            self.open_elem,
+            self.chempot,
+            data_columns,
+            other_data,
+        )
+
+    def _concat(self, rxn_set: "ReactionSet") -> "ReactionSet":
+        """
+        Return a new ReactionSet containing the reactions of this set followed by
+        those of the provided set (which must share the same entries).
+        """
+        flat_indices = np.concatenate([self.flat_indices, rxn_set.flat_indices])
+        flat_coeffs = np.concatenate([self.flat_coeffs, rxn_set.flat_coeffs])
+        offsets = np.concatenate([self.offsets, rxn_set.offsets[1:] + self.offsets[-1]])
+
+        same_columns = {k: c.dtype for k, c in self.data_columns.items()} == {
+            k: c.dtype for k, c in rxn_set.data_columns.items()
+        }
+        if same_columns and self.other_data is None and rxn_set.other_data is None:
+            data_columns = {
+                k: np.concatenate([c, rxn_set.data_columns[k]])
+                for k, c in self.data_columns.items()
+            }
+            other_data = None
+        else:
+            data_columns, other_data = self._get_data_columns(
+                self.all_data + rxn_set.all_data, len(offsets) - 1
+            )
+
+        return ReactionSet.from_csr(
+            self.entries,
+            flat_indices,
+            flat_coeffs,
+            offsets,
+            self.open_elem,
+            self.chempot,
+            data_columns,
+            other_data,
+        )
+
+    @staticmethod
+    def _get_data_columns(
+        all_data: Optional[List[Dict]], num_rxns: int
+    ) -> Tuple[Dict[str, np.ndarray], Optional[List[Dict]]]:
+        """
+        Split the data of each reaction into typed columns (for numeric keys which are
+        shared by all reactions and have a consistent type) and a list of dicts
+        containing any remaining data (None if there is no remaining data).
+        """
+        if not all_data or num_rxns == 0:
+            return {}, None
+
+        shared_keys = set(all_data[0]).intersection(*all_data[1:])
+
+        data_columns = {}
+        for key in sorted(shared_keys):
+            values = [d[key] for d in all_data]
+            types = {type(v) for v in values}
+            if len(types) == 1 and types.pop() in (bool, int, float):
+                column = np.array(values)
+                if column.dtype.kind in "bif":
+                    data_columns[key] = column
+
+        other_data = None
+        if any(len(d) > len(data_columns) for d in all_data):
+            other_data = [
+                {k: v for k, v in d.items() if k not in data_columns} for d in all_data
+            ]
+
+        return data_columns, other_data
+
     @staticmethod
     def _get_added_elems(
         rxn: Union[ComputedReaction, OpenComputedReaction], target: Composition
@@ -472,6 +821,62 @@ class ReactionSet(MSONable):
             entries.update(r.entries)
         return entries
 
+    def as_dict(self) -> dict:
+        """
+        Returns an MSONable dict, in which the CSR arrays are stored as flat lists.
+        """
+        return {
+            "@module": self.__class__.__module__,
+            "@class": self.__class__.__name__,
+            "entries": [e.as_dict() for e in self.entries],
+            "flat_indices": self.flat_indices.tolist(),
+            "flat_coeffs": self.flat_coeffs.tolist(),
+            "offsets": self.offsets.tolist(),
+            "open_elem": str(self.open_elem) if self.open_elem else None,
+            "chempot": self.chempot,
+            "data_columns": {k: c.tolist() for k, c in self.data_columns.items()},
+            "other_data": self.other_data,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ReactionSet":
+        """
+        Returns a ReactionSet object from an MSONable dict. Dicts written by older
+        versions (storing nested lists of indices and coefficients) are also supported.
+        """
+        dec = MontyDecoder()
+        decoded = {
+            k: dec.process_decoded(v) for k, v in d.items() if not k.startswith("@")
+        }
+
+        if "offsets" not in decoded:
+            return cls(**decoded)
+
+        return cls.from_csr(
+            decoded["entries"],
+            decoded["flat_indices"],
+            decoded["flat_coeffs"],
+            decoded["offsets"],
+            decoded["open_elem"],
+            decoded["chempot"],
+            {k: np.array(c) for k, c in decoded["data_columns"].items()},
+            decoded["other_data"],
+        )
+
+    def __getitem__(self, key):
+        """
+        Return the reaction at an integer index, or a new ReactionSet for a slice,
+        boolean mask, or array of indices.
+        """
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("Reaction index out of range!")
+            return next(iter(self._get_rxns_by_indices([int(key)])))
+
+        return self._get_subset(key)
+
     def __iter__(self):
         """
         Iterate over the reactions in the set.
@@ -482,4 +887,4 @@ class ReactionSet(MSONable):
         """
         Return length of reactions stored in the set.
         """
-        return len(self.coeffs)
+        return len(self.offsets) - 1
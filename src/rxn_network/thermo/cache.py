@@ -0,0 +1,300 @@
+"""
+A cache for phase diagrams, shared by the entry sets, enumerators, and flows running in
+the same process.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from pymatgen.analysis.phase_diagram import GrandPotentialPhaseDiagram, PhaseDiagram
+from pymatgen.core.composition import Composition, Element
+from pymatgen.entries import Entry
+
+PhaseDiagramKey = Tuple[str, str, Tuple[Tuple[str, float], ...]]
+
+
+class PhaseDiagramCache:
+    """
+    LRU cache of phase diagrams. Phase diagrams are keyed by a fingerprint of the full
+    set of entries they were built from, the chemical system (i.e., the subset of
+    entries used), and optionally the chemical potentials of a grand potential phase
+    diagram. Many phase diagrams for the same entries can therefore be reused across
+    enumerators and chemical potentials.
+
+    Hull energies can be acquired from a cached phase diagram of any higher-dimensional
+    chemical system, which avoids building a phase diagram for every subsystem.
+    """
+
+    def __init__(self, maxsize: int = 100):
+        """
+        Args:
+            maxsize: Maximum number of phase diagrams to store. The least recently used
+                phase diagrams are evicted first. A maxsize of 0 disables caching.
+                Defaults to 100.
+        """
+        self.maxsize = maxsize
+
+        self._cache: OrderedDict = OrderedDict()
+        self._pd_keys: Dict[str, Dict[FrozenSet[str], PhaseDiagramKey]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_fingerprint(entries: Iterable[Entry]) -> str:
+        """
+        Returns a fingerprint (hash) of a collection of entries, which is independent of
+        the order of the entries.
+        """
+        entry_strs = sorted(
+            f"{e.composition.formula}|{e.energy:.8f}|{getattr(e, 'entry_id', None)}"
+            for e in entries
+        )
+        return hashlib.sha1("\n".join(entry_strs).encode()).hexdigest()
+
+    def get_pd(
+        self,
+        entries: Iterable[Entry],
+        chemsys: Optional[Iterable[str]] = None,
+        fingerprint: Optional[str] = None,
+    ) -> PhaseDiagram:
+        """
+        Returns the phase diagram of all entries within a chemical system (including its
+        subsystems).
+
+        Args:
+            entries: The full collection of entries.
+            chemsys: Elements of the chemical system, e.g. ["Mn", "O", "Y"]. Defaults to
+                the chemical system of all entries.
+            fingerprint: Fingerprint of the entries (see get_fingerprint()). Providing
+                this avoids recalculating the fingerprint on every call.
+
+        Returns:
+            A PhaseDiagram object.
+        """
+        entries = list(entries)
+        fingerprint = fingerprint or self.get_fingerprint(entries)
+        elems = self._get_elems(entries, chemsys)
+
+        key = self._get_key(fingerprint, elems)
+        pd = self._get(key)
+        if pd is None:
+            pd = PhaseDiagram(self._get_entries_in_chemsys(entries, elems))
+            self._set(key, pd)
+
+        return pd
+
+    def get_grand_pd(
+        self,
+        entries: Iterable[Entry],
+        chempots: Dict[Element, float],
+        chemsys: Optional[Iterable[str]] = None,
+        fingerprint: Optional[str] = None,
+    ) -> GrandPotentialPhaseDiagram:
+        """
+        Returns the grand potential phase diagram of the entries within a chemical
+        system (including its subsystems).
+
+        Args:
+            entries: The full collection of entries.
+            chempots: Chemical potentials of the open elements, e.g. {Element("O"): 0}
+            chemsys: Elements of the chemical system, e.g. ["Mn", "O", "Y"]. Defaults to
+                the chemical system of all entries.
+            fingerprint: Fingerprint of the entries (see get_fingerprint()).
+
+        Returns:
+            A GrandPotentialPhaseDiagram object.
+        """
+        entries = list(entries)
+        fingerprint = fingerprint or self.get_fingerprint(entries)
+        elems = self._get_elems(entries, chemsys)
+
+        key = self._get_key(fingerprint, elems, chempots)
+        grand_pd = self._get(key)
+        if grand_pd is None:
+            grand_pd = GrandPotentialPhaseDiagram(
+                self._get_entries_in_chemsys(entries, elems), chempots
+            )
+            self._set(key, grand_pd)
+
+        return grand_pd
+
+    def get_hull_energy(
+        self,
+        entries: Iterable[Entry],
+        composition: Composition,
+        fingerprint: Optional[str] = None,
+    ) -> float:
+        """
+        Returns the hull energy of a composition. Any cached phase diagram containing
+        the elements of the composition is used; otherwise, the phase diagram of the
+        composition's chemical system is built (and cached).
+
+        Args:
+            entries: The full collection of entries.
+            composition: The composition for which to calculate the hull energy.
+            fingerprint: Fingerprint of the entries (see get_fingerprint()).
+
+        Returns:
+            The hull energy (in eV) of the composition.
+        """
+        entries = list(entries)
+        fingerprint = fingerprint or self.get_fingerprint(entries)
+        elems = {str(el) for el in composition.elements}
+
+        pd = self._get_parent_pd(fingerprint, elems)
+        if pd is None:
+            pd = self.get_pd(entries, elems, fingerprint)
+
+        return pd.get_hull_energy(composition)
+
+    def get_cached(
+        self,
+        fingerprint: str,
+        chemsys: Iterable[str],
+        chempots: Optional[Dict[Element, float]] = None,
+    ) -> Optional[PhaseDiagram]:
+        """
+        Returns a cached phase diagram without building it, or None if it is not in the
+        cache.
+
+        Args:
+            fingerprint: Fingerprint of the entries (see get_fingerprint()).
+            chemsys: Elements of the chemical system, e.g. ["Mn", "O", "Y"]
+            chempots: Chemical potentials of the open elements, if this is a grand
+                potential phase diagram.
+        """
+        return self._get(self._get_key(fingerprint, chemsys, chempots))
+
+    def add(
+        self,
+        pd: PhaseDiagram,
+        fingerprint: str,
+        chemsys: Iterable[str],
+        chempots: Optional[Dict[Element, float]] = None,
+    ):
+        """
+        Adds a phase diagram which was built elsewhere (e.g., by a worker process) to
+        the cache.
+
+        Args:
+            pd: The phase diagram (or grand potential phase diagram)
+            fingerprint: Fingerprint of the entries it was built from (see
+                get_fingerprint()).
+            chemsys: Elements of the chemical system, e.g. ["Mn", "O", "Y"]
+            chempots: Chemical potentials of the open elements, if this is a grand
+                potential phase diagram.
+        """
+        self._set(self._get_key(fingerprint, chemsys, chempots), pd)
+
+    def clear(self):
+        """Removes all phase diagrams from the cache."""
+        self._cache.clear()
+        self._pd_keys.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: PhaseDiagramKey):
+        """Returns the cached phase diagram (or None), updating the LRU order."""
+        pd = self._cache.get(key)
+        if pd is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return pd
+
+    def _set(self, key: PhaseDiagramKey, pd):
+        """Stores a phase diagram, evicting the least recently used ones if needed."""
+        self._cache[key] = pd
+        self._cache.move_to_end(key)
+
+        fingerprint, chemsys, chempots = key
+        if not chempots:
+            pd_keys = self._pd_keys.setdefault(fingerprint, {})
+            pd_keys[frozenset(chemsys.split("-"))] = key
+
+        while len(self._cache) > self.maxsize:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self._remove_pd_key(evicted_key)
+
+    def _remove_pd_key(self, key: PhaseDiagramKey):
+        """Removes an evicted (non-grand) phase diagram from the chemsys index."""
+        fingerprint, chemsys, chempots = key
+        if chempots or fingerprint not in self._pd_keys:
+            return
+
+        pd_keys = self._pd_keys[fingerprint]
+        pd_keys.pop(frozenset(chemsys.split("-")), None)
+        if not pd_keys:
+            del self._pd_keys[fingerprint]
+
+    def _get_parent_pd(self, fingerprint: str, elems) -> Optional[PhaseDiagram]:
+        """Returns the smallest cached (non-grand) phase diagram for the same entries
+        whose chemical system includes the provided elements, if one exists."""
+        pd_keys = self._pd_keys.get(fingerprint)
+        if not pd_keys:
+            return None
+
+        key = pd_keys.get(frozenset(elems))
+        if key is None:
+            parents = [chemsys for chemsys in pd_keys if chemsys.issuperset(elems)]
+            if not parents:
+                return None
+            key = pd_keys[min(parents, key=len)]
+
+        return self._cache[key]
+
+    @staticmethod
+    def _get_key(
+        fingerprint: str,
+        elems: Iterable[str],
+        chempots: Optional[Dict[Element, float]] = None,
+    ) -> PhaseDiagramKey:
+        """Returns the key of a phase diagram in the cache."""
+        return (
+            fingerprint,
+            "-".join(sorted(str(el) for el in elems)),
+            tuple(sorted((str(el), float(mu)) for el, mu in (chempots or {}).items())),
+        )
+
+    @staticmethod
+    def _get_elems(entries, chemsys):
+        """Returns the set of element names in the chemical system."""
+        if chemsys is None:
+            return {str(el) for e in entries for el in e.composition.elements}
+        return {str(el) for el in chemsys}
+
+    @staticmethod
+    def _get_entries_in_chemsys(entries, elems):
+        """Returns the entries within a chemical system (including subsystems)."""
+        return [
+            e
+            for e in entries
+            if elems.issuperset(str(el) for el in e.composition.elements)
+        ]
+
+    def __len__(self):
+        return len(self._cache)
+
+
+_pd_cache = PhaseDiagramCache()
+
+
+def get_pd_cache() -> PhaseDiagramCache:
+    """
+    Returns the phase diagram cache shared by all entry sets and enumerators.
+    """
+    return _pd_cache
+
+
+def set_pd_cache(cache: PhaseDiagramCache):
+    """
+    Sets the phase diagram cache shared by all entry sets and enumerators.
+
+    Args:
+        cache: A PhaseDiagramCache object. Use PhaseDiagramCache(maxsize=0) to disable
+            caching.
+    """
+    global _pd_cache  # pylint: disable=global-statement
+    _pd_cache = cache
@@ -0,0 +1,161 @@
+"""
+A batched implementation of the interfacial reaction ("kink") analysis from the
+InterfacialReactivity class in pymatgen.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from pymatgen.analysis.phase_diagram import PDEntry, PhaseDiagram
+from pymatgen.core.composition import Composition
+
+Kink = Tuple[float, List[Composition], List[PDEntry], np.ndarray]
+
+
+class KinkFinder:
+    """
+    Finds the "kinks" along the mixing lines between pairs of reactant compositions in
+    a phase diagram, i.e. the mixing ratios at which the predicted products change. This
+    reproduces InterfacialReactivity.get_kinks() (and its grand potential variant) from
+    pymatgen, but the barycentric transformations of the hull facets are computed once
+    per phase diagram, and all facets are intersected with the mixing line of each pair
+    using vectorized operations.
+
+    Reaction energies are not calculated; use the InterfacialReactivity classes in
+    pymatgen for a detailed analysis of a single interface.
+    """
+
+    def __init__(self, pd: PhaseDiagram, block_size: int = 1000000):
+        """
+        Args:
+            pd: A PhaseDiagram or GrandPotentialPhaseDiagram object. If a grand
+                potential phase diagram is provided, the open elements are removed from
+                the reactant compositions and added as reactants in every reaction.
+            block_size: Approximate maximum number of barycentric coordinates computed
+                at once; pairs are processed in blocks to limit memory usage.
+        """
+        self.pd = pd
+        self.block_size = block_size
+        self.chempots = getattr(pd, "chempots", None) or {}
+
+        facets = np.array(pd.facets, dtype=int).reshape(len(pd.facets), -1)
+        qhull_coords = np.array(pd.qhull_data)[:, :-1]
+        aug = np.concatenate(
+            [qhull_coords[facets], np.ones(facets.shape + (1,))], axis=-1
+        )
+
+        self._facets = facets
+        self._aug_inv = np.linalg.inv(aug)
+        self._coords_cache: Dict[Composition, np.ndarray] = {}
+
+    def get_kinks(
+        self, pairs: Sequence[Tuple[Composition, Composition]]
+    ) -> List[List[Kink]]:
+        """
+        Finds the kinks along the mixing line of every pair of reactants.
+
+        Args:
+            pairs: Sequence of (reactant 1, reactant 2) compositions.
+
+        Returns:
+            A list with the kinks for each pair. Each kink is a tuple of: the mixing
+            ratio x (of reactant 1) in x * r1 + (1 - x) * r2, the reactant compositions,
+            the product entries (as found in pd.qhull_entries), and the amounts of the
+            products (atomic fractions of the normalized mixture).
+        """
+        if not pairs:
+            return []
+
+        c1 = np.array([self._get_coords(r1) for r1, _ in pairs])
+        c2 = np.array([self._get_coords(r2) for _, r2 in pairs])
+
+        num_facets, dim = self._facets.shape
+        step = max(self.block_size // (num_facets * dim * dim), 1)
+
+        all_kinks = []
+        for start in range(0, len(pairs), step):
+            end = start + step
+            all_kinks.extend(
+                self._get_kinks_block(pairs[start:end], c1[start:end], c2[start:end])
+            )
+
+        return all_kinks
+
+    def _get_kinks_block(self, pairs, c1, c2) -> List[List[Kink]]:
+        """Finds the kinks for a block of pairs. See get_kinks()."""
+        tol = PhaseDiagram.numerical_tol
+        ones = np.ones((len(pairs), 1))
+
+        b1 = np.einsum("pj,fji->pfi", np.hstack([c1, ones]), self._aug_inv)
+        b2 = np.einsum("pj,fji->pfi", np.hstack([c2, ones]), self._aug_inv)
+        line = b1 - b2
+
+        # positions (t = 0 at c1, t = 1 at c2) where the line crosses a facet boundary
+        valid = np.abs(line) > 1e-10
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(valid, b1 / np.where(valid, line, 1.0), np.nan)
+        bary = b1[:, :, None, :] - t[..., None] * line[:, :, None, :]
+        in_facet = valid & (bary >= -tol).all(axis=-1)
+
+        all_kinks = []
+        for idx, (r1, r2) in enumerate(pairs):
+            length = np.linalg.norm(c2[idx] - c1[idx])
+            if np.all(c1[idx] == c2[idx]):
+                ts = np.array([1.0, 0.0])
+            else:
+                ts = np.sort(np.append(t[idx][in_facet[idx]], [0.0, 1.0]))
+                ts = ts[(ts * length > -tol) & (ts * length < length + tol)]
+                ts = ts[np.append(True, np.diff(ts) * length > tol)]
+                ts = np.clip(ts[::-1], 0.0, 1.0)
+
+            kinks = []
+            for t_kink in ts:
+                x = 1.0 - t_kink
+                products, amounts = self._get_decomposition(
+                    b1[idx] - t_kink * line[idx]
+                )
+                kinks.append((x, self._get_reactants(r1, r2, x), products, amounts))
+
+            all_kinks.append(kinks)
+
+        return all_kinks
+
+    def _get_decomposition(self, bary: np.ndarray) -> Tuple[List[PDEntry], np.ndarray]:
+        """Returns the products and their amounts, given the barycentric coordinates of
+        a point with respect to every facet."""
+        in_facet = (bary >= -PhaseDiagram.numerical_tol / 10).all(axis=1)
+        if not in_facet.any():
+            raise RuntimeError("No facet found for composition!")
+
+        facet_idx = int(np.argmax(in_facet))
+        amounts = bary[facet_idx]
+        mask = np.abs(amounts) > PhaseDiagram.numerical_tol
+
+        products = [self.pd.qhull_entries[i] for i in self._facets[facet_idx][mask]]
+
+        return products, amounts[mask]
+
+    def _get_reactants(self, r1, r2, x) -> List[Composition]:
+        """Returns the reactants at a mixing ratio x, including open elements."""
+        if np.isclose(x, 0):
+            reactants = [r2]
+        elif np.isclose(x, 1):
+            reactants = [r1]
+        else:
+            reactants = list({r1, r2})
+
+        reactants += [Composition(el.symbol) for el in self.chempots]
+
+        return reactants
+
+    def _get_coords(self, comp: Composition) -> np.ndarray:
+        """Returns the phase diagram coordinates of a composition, excluding any open
+        elements."""
+        coords = self._coords_cache.get(comp)
+        if coords is None:
+            comp_no_open = Composition(
+                {el: amt for el, amt in comp.items() if el not in self.chempots}
+            )
+            coords = self.pd.pd_coords(comp_no_open)
+            self._coords_cache[comp] = coords
+
+        return coords
@@ -1,23 +1,29 @@
 """
 Utility functions used in the thermodynamic analysis classes.
 """
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
 from pymatgen.analysis.phase_diagram import PhaseDiagram
 from pymatgen.entries import Entry
 from tqdm import tqdm
 
+from rxn_network.thermo.cache import get_pd_cache
 
-def expand_pd(entries: Iterable[Entry], pbar: bool = False) -> Dict[str, PhaseDiagram]:
+
+def expand_pd(
+    entries: Iterable[Entry], pbar: bool = False, fingerprint: Optional[str] = None
+) -> Dict[str, PhaseDiagram]:
     """
     Helper method for generating a set of smaller phase diagrams for analyzing
     thermodynamic stability in large chemical systems. This is necessary when
     considering chemical systems which contain 10 or more elements, due to dimensional
-    limitations of the Qhull algorithm.
+    limitations of the Qhull algorithm. Phase diagrams are acquired from the shared
+    phase diagram cache (see rxn_network.thermo.cache).
 
     Args:
         entries ([Entry]): list of Entry objects for building phase diagram.
         pbar (bool): whether to show a progress bar.
+        fingerprint (str): optional fingerprint of the entries, used as the cache key.
 
     Returns:
         Dictionary of PhaseDiagram objects indexed by chemical subsystem string;
@@ -26,6 +32,10 @@ def expand_pd(entries: Iterable[Entry], pbar: bool = False) -> Dict[str, PhaseDi
 
     pd_dict: Dict[str, PhaseDiagram] = {}
 
+    entries = list(entries)
+    pd_cache = get_pd_cache()
+    fingerprint = fingerprint or pd_cache.get_fingerprint(entries)
+
     sorted_entries = sorted(
         entries, key=lambda x: len(x.composition.elements), reverse=True
     )
@@ -37,15 +47,8 @@ def expand_pd(entries: Iterable[Entry], pbar: bool = False) -> Dict[str, PhaseDi
             ):
                 break
         else:
-            pd_dict[e.composition.chemical_system] = PhaseDiagram(
-                list(
-                    filter(
-                        lambda x: set(x.composition.elements).issubset(
-                            e.composition.elements
-                        ),
-                        entries,
-                    )
-                )
+            pd_dict[e.composition.chemical_system] = pd_cache.get_pd(
+                entries, e.composition.chemical_system.split("-"), fingerprint
             )
 
     return pd_dict
@@ -0,0 +1,363 @@
+"""
+Execution backends used for parallelizing work in the enumerators and solvers.
+
+Three backends are available:
+
+    - "serial": runs every task immediately in the current process. Useful for small
+      queries and for debugging, as there is no startup or serialization overhead.
+    - "process": runs tasks on a local pool of processes (concurrent.futures).
+    - "ray": runs tasks as Ray remote functions (default). Supports multi-node
+      clusters; see rxn_network.utils.ray.initialize_ray().
+
+The backend can be chosen per call (by passing an Executor object or its name) or
+globally by setting the RN_EXECUTOR environment variable.
+
+Futures returned by submit() may be passed as arguments to other tasks; these tasks
+only run once their dependencies have completed, and receive the results in place of
+the futures.
+"""
+import concurrent.futures as cf
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+import ray
+
+from rxn_network.utils.ray import initialize_ray
+
+EXECUTOR_ENV_VAR = "RN_EXECUTOR"
+DEFAULT_EXECUTOR = "ray"
+
+SHARED_OBJECT_MIN_SIZE = 100000  # bytes
+WORKER_SHARED_CACHE_SIZE = 16
+
+
+class Executor(metaclass=ABCMeta):
+    """
+    Base definition for an execution backend. Tasks are submitted as plain (picklable)
+    functions and return a future-like object, which can be waited on and then
+    retrieved with get().
+    """
+
+    name: str = ""
+
+    def put(self, obj: Any) -> Any:
+        """
+        Stores an object that will be shared by many tasks. By default this returns
+        the object itself.
+        """
+        return obj
+
+    @abstractmethod
+    def submit(self, func: Callable, *args) -> Any:
+        """
+        Submits func(*args) for execution and returns a future-like object. Any
+        arguments which are futures returned by this executor are replaced by their
+        results before func is called.
+        """
+
+    @abstractmethod
+    def wait(self, futures: List[Any], num_returns: int = 1) -> Tuple[List, List]:
+        """
+        Waits until at least num_returns of the provided futures have completed.
+
+        Returns:
+            Tuple of (completed futures, pending futures)
+        """
+
+    @abstractmethod
+    def get(self, future: Any) -> Any:
+        """
+        Returns the result of a completed future.
+        """
+
+    @property
+    @abstractmethod
+    def num_workers(self) -> int:
+        """
+        Returns the number of workers available to the executor.
+        """
+
+    def iter_completed(self, futures: List[Any]) -> Iterator[Any]:
+        """
+        Yields the results of the provided futures in order of completion.
+        """
+        while futures:
+            done, futures = self.wait(futures)
+            for future in done:
+                yield self.get(future)
+
+    def shutdown(self):
+        """
+        Releases any resources held by the executor.
+        """
+
+
+class SerialExecutor(Executor):
+    """
+    Executes every task immediately in the current process.
+    """
+
+    name = "serial"
+
+    def submit(self, func: Callable, *args) -> cf.Future:
+        future: cf.Future = cf.Future()
+        try:
+            args = tuple(a.result() if isinstance(a, cf.Future) else a for a in args)
+            future.set_result(func(*args))
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+        return future
+
+    def wait(self, futures: List[Any], num_returns: int = 1) -> Tuple[List, List]:
+        return futures[:num_returns], futures[num_returns:]
+
+    def get(self, future: cf.Future) -> Any:
+        return future.result()
+
+    @property
+    def num_workers(self) -> int:
+        return 1
+
+
+class _SharedObject:
+    """
+    Handle to an object stored on disk by ProcessExecutor.put(). Only the path is
+    pickled when the handle is sent along with a task.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+
+_worker_shared_objects: OrderedDict = OrderedDict()
+
+
+def _load_shared(shared: _SharedObject) -> Any:
+    """Loads a shared object in a worker process, at most once per worker (as long
+    as the object stays among the most recently used ones)."""
+    if shared.path in _worker_shared_objects:
+        _worker_shared_objects.move_to_end(shared.path)
+        return _worker_shared_objects[shared.path]
+
+    with open(shared.path, "rb") as f:
+        obj = pickle.load(f)
+
+    _worker_shared_objects[shared.path] = obj
+    while len(_worker_shared_objects) > WORKER_SHARED_CACHE_SIZE:
+        _worker_shared_objects.popitem(last=False)
+
+    return obj
+
+
+def _call_with_shared(func: Callable, *args) -> Any:
+    """Calls func(*args) in a worker process, replacing shared object handles by the
+    objects themselves."""
+    args = tuple(_load_shared(a) if isinstance(a, _SharedObject) else a for a in args)
+    return func(*args)
+
+
+class ProcessExecutor(Executor):
+    """
+    Executes tasks on a local pool of processes, best suited for single-node jobs.
+
+    Large shared objects (see put()) are written to a temporary file once, and each
+    worker loads them the first time they are needed; only a small handle is sent
+    with every task. Workers therefore reuse their own copy of a shared object for
+    all of the tasks they run.
+    """
+
+    name = "process"
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Number of processes in the pool. Defaults to the number of
+                CPUs on the machine.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[cf.ProcessPoolExecutor] = None
+        self._shared_dir: Optional[str] = None
+
+    def put(self, obj: Any) -> Any:
+        """
+        Pickles an object that will be shared by many tasks. Small objects are
+        returned as is (and pickled with every task); larger objects are written to a
+        temporary file, which is removed once the returned handle is no longer used.
+        """
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) < SHARED_OBJECT_MIN_SIZE:
+            return obj
+
+        if self._shared_dir is None:
+            self._shared_dir = tempfile.mkdtemp(prefix="rn_shared_")
+            weakref.finalize(self, shutil.rmtree, self._shared_dir, True)
+
+        # names are never reused, as workers identify shared objects by their path
+        path = os.path.join(self._shared_dir, f"{uuid.uuid4().hex}.pkl")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        shared = _SharedObject(path)
+        weakref.finalize(shared, _remove_file, path)
+        return shared
+
+    def submit(self, func: Callable, *args) -> cf.Future:
+        if self._pool is None:
+            self._pool = cf.ProcessPoolExecutor(max_workers=self.max_workers)
+
+        deps = [a for a in args if isinstance(a, cf.Future)]
+        if not deps:
+            return self._pool.submit(_call_with_shared, func, *args)
+
+        return self._submit_after(deps, func, args)
+
+    def _submit_after(
+        self, deps: List[cf.Future], func: Callable, args: Tuple
+    ) -> cf.Future:
+        """Submits func(*args) to the pool once all of its dependencies (futures in
+        args) have completed, without blocking the calling thread."""
+        future: cf.Future = cf.Future()
+        pending = set(deps)
+        lock = threading.Lock()
+
+        def copy_result(task: cf.Future):
+            if task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def on_dep_done(dep: cf.Future):
+            with lock:
+                pending.discard(dep)
+                if pending:
+                    return
+
+            for d in deps:
+                if d.exception() is not None:
+                    future.set_exception(d.exception())
+                    return
+
+            resolved = [a.result() if isinstance(a, cf.Future) else a for a in args]
+            try:
+                task = self._pool.submit(  # type: ignore
+                    _call_with_shared, func, *resolved
+                )
+            except RuntimeError as e:  # pool was shut down
+                future.set_exception(e)
+                return
+            task.add_done_callback(copy_result)
+
+        for dep in deps:
+            dep.add_done_callback(on_dep_done)
+
+        return future
+
+    def wait(self, futures: List[Any], num_returns: int = 1) -> Tuple[List, List]:
+        done: List[cf.Future] = []
+        pending = set(futures)
+        while len(done) < num_returns and pending:
+            newly_done, pending = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+            done.extend(newly_done)
+
+        return done, [f for f in futures if f in pending]
+
+    def get(self, future: cf.Future) -> Any:
+        return future.result()
+
+    @property
+    def num_workers(self) -> int:
+        return self.max_workers
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        if self._shared_dir is not None:
+            shutil.rmtree(self._shared_dir, ignore_errors=True)
+            self._shared_dir = None
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class RayExecutor(Executor):
+    """
+    Executes tasks as Ray remote functions. Ray is initialized (or connected to an
+    existing cluster) upon creation of this object.
+    """
+
+    name = "ray"
+
+    def __init__(self):
+        initialize_ray()
+        self._remote_funcs: Dict[Callable, Any] = {}
+
+    def put(self, obj: Any) -> Any:
+        return ray.put(obj)
+
+    def submit(self, func: Callable, *args) -> Any:
+        # ObjectRefs passed as arguments are resolved by ray before func is called
+        if func not in self._remote_funcs:
+            self._remote_funcs[func] = ray.remote(func)
+        return self._remote_funcs[func].remote(*args)
+
+    def wait(self, futures: List[Any], num_returns: int = 1) -> Tuple[List, List]:
+        return ray.wait(futures, num_returns=num_returns)
+
+    def get(self, future: Any) -> Any:
+        return ray.get(future)
+
+    @property
+    def num_workers(self) -> int:
+        return int(ray.cluster_resources()["CPU"])
+
+
+EXECUTORS: Dict[str, Type[Executor]] = {
+    e.name: e for e in (SerialExecutor, ProcessExecutor, RayExecutor)
+}
+
+_executor_cache: Dict[str, Executor] = {}
+
+
+def get_executor(executor: Optional[Union[str, Executor]] = None) -> Executor:
+    """
+    Returns an Executor object. Executors created by name are cached, such that (for
+    example) the same process pool is reused across calls.
+
+    Args:
+        executor: Either an Executor object (returned as is), the name of an executor
+            ("serial", "process", "ray"), or None. If None, the name is read from the
+            RN_EXECUTOR environment variable, defaulting to "ray".
+
+    Returns:
+        An Executor object.
+    """
+    if isinstance(executor, Executor):
+        return executor
+
+    name = (executor or os.environ.get(EXECUTOR_ENV_VAR) or DEFAULT_EXECUTOR).lower()
+    if name not in EXECUTORS:
+        raise ValueError(
+            f"Unknown executor: {name}! Please choose from: {list(EXECUTORS)}"
+        )
+
+    if name == "ray":
+        initialize_ray()  # ray may have been shut down since the executor was cached
+
+    if name not in _executor_cache:
+        _executor_cache[name] = EXECUTORS[name]()
+
+    return _executor_cache[name]
@@ -2,10 +2,15 @@
 from copy import deepcopy
 
 import pytest
-from pymatgen.analysis.phase_diagram import PhaseDiagram
+from pymatgen.analysis.phase_diagram import GrandPotPDEntry, PhaseDiagram
+from pymatgen.core.composition import Element
 from pymatgen.entries.computed_entries import ConstantEnergyAdjustment
 
-from rxn_network.entries.entry_set import GibbsEntrySet
+from rxn_network.entries.entry_set import (
+    GibbsEntrySet,
+    get_energy_vector,
+    get_num_atoms_vector,
+)
 
 
 @pytest.mark.parametrize(
@@ -86,6 +91,46 @@ def test_build_indices(gibbs_entries):
     assert indices == list(range(num_entries))
 
 
+def test_energy_vector(gibbs_entries):
+    entries = gibbs_entries.copy()
+    energies = entries.energy_vector
+
+    assert energies == pytest.approx(get_energy_vector(entries.entries_list))
+    assert entries.num_atoms_vector == pytest.approx(
+        get_num_atoms_vector(entries.entries_list)
+    )
+
+    entries.discard(entries.entries_list[0])
+    assert len(entries.energy_vector) == len(energies) - 1
+    assert len(entries.num_atoms_vector) == len(energies) - 1
+
+
+def test_get_energy_vector(gibbs_entries):
+    entries = gibbs_entries.entries_list
+    energies = get_energy_vector(entries)
+    num_atoms = get_num_atoms_vector(entries)
+
+    assert len(energies) == len(num_atoms) == len(entries)
+    for e, energy, atoms in zip(entries, energies, num_atoms):
+        comp, factor = e.composition.get_reduced_composition_and_factor()
+        assert energy == pytest.approx(e.energy / factor)
+        assert atoms == comp.num_atoms
+
+
+def test_get_energy_vector_grand(gibbs_entries):
+    chempots = {Element("O"): -1.0}
+    entries = gibbs_entries.entries_list
+    energies = get_energy_vector(entries, chempots)
+
+    for e, energy in zip(entries, energies):
+        comp, factor = e.composition.get_reduced_composition_and_factor()
+        if comp.elements == [Element("O")]:
+            assert energy == pytest.approx(e.energy / factor)
+        else:
+            expected = GrandPotPDEntry(e, chempots).energy / factor
+            assert energy == pytest.approx(expected)
+
+
 def test_get_min_entry_by_formula(gibbs_entries):
     f_id = [("YMnO3", "mp-19385"), ("Mn2O3", "mp-1172875"), ("MnO2", "mp-1279979")]
     for f, entry_id in f_id:
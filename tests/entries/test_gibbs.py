@@ -86,6 +86,17 @@ def test_get_new_temperature(entry):
     assert new_entry.energy != entry.energy
 
 
+def test_get_energies(entry):
+    temps = [300, 450, 1050, 2000]
+    energies = entry.get_energies(temps)
+
+    assert energies == pytest.approx(
+        [entry.get_new_temperature(t).energy for t in temps]
+    )
+    with pytest.raises(ValueError):
+        entry.get_energies([300, 2001])
+
+
 def test_to_grand_entry(entry):
     chempots = {Element("O"): 0}
     grand_entry = entry.to_grand_entry(chempots)
@@ -113,6 +113,15 @@ def test_get_new_temperature(entries):
     assert new_entry.energy_per_atom != pytest.approx(entry.energy_per_atom)
 
 
+def test_get_energies(entries):
+    entry = entries[300]
+    temps = [300, 350, 1200, 2000]
+
+    assert entry.get_energies(temps) == pytest.approx(
+        [entry.get_new_temperature(t).energy for t in temps]
+    )
+
+
 def test_as_dict(entries):
     d = entries[300].as_dict()
 
@@ -1,14 +1,46 @@
 """ Tests for BasicEnumerator and BasicOpenEnumerator """
 from pathlib import Path
 from monty.serialization import loadfn
+import numpy as np
 import pytest
 
+from rxn_network.entries.entry_set import GibbsEntrySet
 from rxn_network.enumerators.basic import BasicEnumerator, BasicOpenEnumerator
+from rxn_network.enumerators.utils import ReactionSetShardWriter, get_combos_array
+from rxn_network.reactions.cache import (
+    BalancingCache,
+    get_balancing_cache,
+    set_balancing_cache,
+)
 
 TEST_FILES_PATH = Path(__file__).parent.parent / "test_files"
 RXNS_FILE = "ymno3_rxns.json.gz"
 
 
+def assert_same_rxns(rxns_1, rxns_2):
+    """Compares two collections of reactions, independent of order/normalization."""
+
+    def get_keys(rxns):
+        keys = []
+        for rxn in rxns:
+            total = abs(rxn.coefficients).sum()
+            formulas, coeffs = zip(
+                *sorted(
+                    (c.reduced_formula, coeff / total)
+                    for c, coeff in zip(rxn.compositions, rxn.coefficients)
+                )
+            )
+            keys.append((formulas, coeffs))
+        return sorted(keys)
+
+    keys_1, keys_2 = get_keys(rxns_1), get_keys(rxns_2)
+
+    assert len(keys_1) == len(keys_2)
+    for (f1, c1), (f2, c2) in zip(keys_1, keys_2):
+        assert f1 == f2
+        assert np.allclose(c1, c2)
+
+
 @pytest.fixture(scope="module")
 def ymno3_rxns():
     return loadfn(TEST_FILES_PATH / RXNS_FILE)
@@ -81,6 +113,114 @@ def test_enumerate(
         assert all([not r.is_identity for r in rxns])
 
 
+@pytest.mark.parametrize("executor", ["serial", "process"])
+def test_enumerate_executor(filtered_entries, basic_enumerator_default, executor):
+    rxns = basic_enumerator_default.enumerate(filtered_entries)
+    rxns_executor = basic_enumerator_default.enumerate(
+        filtered_entries, executor=executor
+    )
+
+    assert_same_rxns(rxns, rxns_executor)
+
+
+@pytest.mark.parametrize("executor", ["serial", "process"])
+def test_enumerate_balancing_cache(
+    filtered_entries, basic_enumerator_default, executor, tmp_path
+):
+    rxns = basic_enumerator_default.enumerate(filtered_entries)
+
+    path = tmp_path / "balancing_cache.json.gz"
+    original_cache = get_balancing_cache()
+    set_balancing_cache(BalancingCache(path=path))
+    try:
+        rxns_cached = basic_enumerator_default.enumerate(
+            filtered_entries, executor=executor
+        )
+    finally:
+        set_balancing_cache(original_cache)
+
+    assert_same_rxns(rxns, rxns_cached)
+    assert len(BalancingCache(path=path)) > 0
+
+
+@pytest.mark.parametrize(
+    "enumerator", [BasicEnumerator(quiet=True), BasicOpenEnumerator(["O2"], quiet=True)]
+)
+def test_enumerate_new(filtered_entries, enumerator):
+    new_entries = [
+        e
+        for e in filtered_entries
+        if e.composition.reduced_formula in ["YMnO3", "Mn3O4"]
+    ]
+    old_entries = GibbsEntrySet([e for e in filtered_entries if e not in new_entries])
+
+    old_rxns = enumerator.enumerate(old_entries)
+    rxns = enumerator.enumerate_new(old_rxns, new_entries)
+
+    assert len(rxns) > len(old_rxns)
+    assert_same_rxns(rxns, enumerator.enumerate(filtered_entries))
+
+
+@pytest.mark.parametrize("precursor_idxs", [None, {0, 1, 2}])
+@pytest.mark.parametrize("new_idxs", [{1, 4}, {5, 7}])
+@pytest.mark.parametrize("enumerator_class", [BasicEnumerator, BasicOpenEnumerator])
+def test_new_rxn_iter_length(enumerator_class, new_idxs, precursor_idxs):
+    combos = get_combos_array(range(6), 2)
+    open_combos = [(6,), (7,), (6, 7)]
+
+    rxn_iterable = enumerator_class._filter_rxn_iterable_by_new_entries(
+        enumerator_class._get_rxn_iterable(combos, open_combos, precursor_idxs),
+        new_idxs,
+    )
+
+    assert enumerator_class._new_rxn_iter_length(
+        combos, open_combos, precursor_idxs, new_idxs
+    ) == sum(1 for _ in rxn_iterable)
+
+
+def test_enumerate_metrics(filtered_entries, basic_enumerator_with_target):
+    rxns = basic_enumerator_with_target.enumerate(filtered_entries, executor="serial")
+    metrics = rxns.metrics
+
+    assert metrics.total_num_rxns >= len(rxns)
+    assert metrics.total_num_pairs > metrics.total_num_rxns
+    assert set(metrics.num_rxns) <= set(metrics.num_pairs)
+    assert metrics.rejections["targets"] > 0
+    assert 0 < metrics.balance_time <= metrics.react_time
+    assert metrics.rxns_per_second > 0
+
+
+def test_enumerate_does_not_modify_entries(filtered_entries):
+    enumerator = BasicOpenEnumerator(["O2"], calculate_e_above_hulls=True, quiet=True)
+    entries_data = {e: dict(e.data) for e in filtered_entries}
+
+    enumerator.enumerate(filtered_entries, executor="serial")
+
+    assert all(e.data == entries_data[e] for e in filtered_entries)
+
+
+def test_enumerate_iter(filtered_entries, basic_enumerator_default):
+    rxns = basic_enumerator_default.enumerate(filtered_entries)
+
+    streamed_rxns = set()
+    for rxn_set in basic_enumerator_default.enumerate_iter(filtered_entries):
+        streamed_rxns.update(rxn_set.get_rxns())
+
+    assert streamed_rxns == set(rxns.get_rxns())
+
+
+def test_enumerate_to_sink(tmp_path, filtered_entries, basic_enumerator_default):
+    sink = ReactionSetShardWriter(tmp_path)
+    num_rxns = basic_enumerator_default.enumerate_to_sink(filtered_entries, sink)
+
+    assert sink.paths
+    assert all(path.exists() for path in sink.paths)
+    assert num_rxns == sum(len(rxn_set) for rxn_set in sink.load())
+
+    rxns = {r for rxn_set in sink.load() for r in rxn_set.get_rxns()}
+    assert rxns == set(basic_enumerator_default.enumerate(filtered_entries))
+
+
 def test_enumerate_with_precursors(
     filtered_entries,
     basic_enumerator_with_precursors,
@@ -1,11 +1,19 @@
 """ Tests for MinimizeGibbsEnumerator and MinimizeGrandPotentialEnumerator """
+import numpy as np
 import pytest
+from pymatgen.analysis.phase_diagram import GrandPotentialPhaseDiagram, PhaseDiagram
 from pymatgen.core.composition import Element
 
+from rxn_network.entries.entry_set import GibbsEntrySet
 from rxn_network.enumerators.minimize import (
     MinimizeGibbsEnumerator,
     MinimizeGrandPotentialEnumerator,
+    get_kink_rxn,
 )
+from rxn_network.reactions.computed import ComputedReaction
+from rxn_network.reactions.open import OpenComputedReaction
+from rxn_network.thermo.cache import PhaseDiagramCache, get_pd_cache, set_pd_cache
+from rxn_network.thermo.kinks import KinkFinder
 
 
 @pytest.fixture(scope="module")
@@ -123,6 +131,18 @@ def test_enumerate_grand_potential(filtered_entries, grand_potential_enumerator)
     assert all([not r.is_identity for r in rxns])
 
 
+@pytest.mark.parametrize("executor", ["serial", "process"])
+def test_enumerate_grand_potential_executor(
+    filtered_entries, grand_potential_enumerator, executor
+):
+    rxns = grand_potential_enumerator.enumerate(filtered_entries)
+    rxns_executor = grand_potential_enumerator.enumerate(
+        filtered_entries, executor=executor
+    )
+
+    assert {str(r) for r in rxns} == {str(r) for r in rxns_executor}
+
+
 def test_enumerate_grand_potential_precursors(
     filtered_entries, grand_potential_enumerator_with_precursors
 ):
@@ -165,3 +185,154 @@ def test_enumerate_grand_potential_precursors_target(
 
     assert len(rxns) == 1
     assert str(rxns[0]) == "Mn2O3 + Y2O3 + 0.5 O2 -> Y2Mn2O7"
+
+
+def test_enumerate_new(
+    filtered_entries, gibbs_enumerator_default, grand_potential_enumerator
+):
+    new_entries = [
+        e
+        for e in filtered_entries
+        if e.composition.reduced_formula in ["YMnO3", "Mn3O4"]
+    ]
+    old_entries = GibbsEntrySet([e for e in filtered_entries if e not in new_entries])
+
+    for enumerator in [gibbs_enumerator_default, grand_potential_enumerator]:
+        old_rxns = enumerator.enumerate(old_entries)
+        rxns = enumerator.enumerate_new(old_rxns, new_entries)
+
+        expected_rxns = enumerator.enumerate(filtered_entries)
+        assert len(rxns) == len(expected_rxns)
+        assert {str(r) for r in rxns} == {str(r) for r in expected_rxns}
+
+
+def test_enumerate_sweep(filtered_entries, grand_potential_enumerator):
+    mus = [0.0, -1.0, -2.0]
+
+    rxn_sets = grand_potential_enumerator.enumerate_sweep(filtered_entries, mus)
+
+    assert list(rxn_sets) == mus
+    for mu in mus:
+        enumerator = MinimizeGrandPotentialEnumerator(
+            open_elem=Element("O"), mu=mu, quiet=True
+        )
+        expected_rxns = enumerator.enumerate(filtered_entries)
+
+        assert len(rxn_sets[mu]) == len(expected_rxns)
+        assert {str(r) for r in rxn_sets[mu]} == {str(r) for r in expected_rxns}
+        assert all("mu" not in data for data in rxn_sets[mu].all_data)
+
+
+@pytest.mark.parametrize("mu", [None, 0.0])
+def test_enumerate_pd_cache_parity(filtered_entries, mu):
+    if mu is None:
+        enumerator = MinimizeGibbsEnumerator(quiet=True)
+    else:
+        enumerator = MinimizeGrandPotentialEnumerator(
+            open_elem=Element("O"), mu=mu, quiet=True
+        )
+
+    original_cache = get_pd_cache()
+    try:
+        set_pd_cache(PhaseDiagramCache(maxsize=0))  # a new phase diagram every time
+        uncached_rxns = enumerator.enumerate(filtered_entries)
+
+        warm_cache = PhaseDiagramCache()
+        warm_cache.get_pd(filtered_entries)
+        set_pd_cache(warm_cache)
+        cached_rxns = enumerator.enumerate(filtered_entries)
+    finally:
+        set_pd_cache(original_cache)
+
+    uncached_rxns = sorted(uncached_rxns, key=str)
+    cached_rxns = sorted(cached_rxns, key=str)
+
+    assert [str(r) for r in cached_rxns] == [str(r) for r in uncached_rxns]
+    for cached_rxn, uncached_rxn in zip(cached_rxns, uncached_rxns):
+        assert np.allclose(cached_rxn.coefficients, uncached_rxn.coefficients)
+
+
+@pytest.mark.parametrize("mu", [None, 0.0])
+def test_enumerate_pd_cache_process(filtered_entries, mu):
+    if mu is None:
+        enumerator = MinimizeGibbsEnumerator(quiet=True)
+    else:
+        enumerator = MinimizeGrandPotentialEnumerator(
+            open_elem=Element("O"), mu=mu, quiet=True
+        )
+
+    original_cache = get_pd_cache()
+    try:
+        cache = PhaseDiagramCache()
+        set_pd_cache(cache)
+
+        rxns = enumerator.enumerate(filtered_entries, executor="process")
+        assert len(cache) > 0  # phase diagrams built by the workers were returned
+
+        hits, misses = cache.hits, cache.misses
+        cached_rxns = enumerator.enumerate(filtered_entries, executor="process")
+    finally:
+        set_pd_cache(original_cache)
+
+    assert cache.hits > hits
+    assert cache.misses == misses
+    assert {str(r) for r in cached_rxns} == {str(r) for r in rxns}
+
+
+@pytest.mark.parametrize("mu", [None, 0.0, -1.0])
+def test_get_kink_rxn(filtered_entries, mu):
+    r1 = filtered_entries.get_min_entry_by_formula("Mn2O3").composition
+    r2 = filtered_entries.get_min_entry_by_formula("Y2O3").composition
+
+    chempots = None
+    pd = PhaseDiagram(filtered_entries)
+    if mu is not None:
+        chempots = {Element("O"): mu}
+        pd = GrandPotentialPhaseDiagram(filtered_entries, chempots)
+
+    kinks = KinkFinder(pd).get_kinks([(r1, r2)])[0]
+    assert len(kinks) > 2
+
+    for kink in kinks:
+        rxn = get_kink_rxn(kink, r1, r2, filtered_entries, chempots)
+
+        if chempots:
+            expected = OpenComputedReaction.balance(
+                rxn.reactant_entries, rxn.product_entries, chempots
+            )
+        else:
+            expected = ComputedReaction.balance(
+                rxn.reactant_entries, rxn.product_entries
+            )
+
+        assert rxn.balanced
+        assert rxn.data == expected.data
+        assert expected.lowest_num_errors == 0
+        assert rxn.lowest_num_errors == len(kink[1]) + len(kink[2]) - len(rxn.entries)
+        assert np.allclose(
+            rxn.coefficients / rxn.coefficients[-1],
+            expected.coefficients / expected.coefficients[-1],
+        )
+        assert rxn.energy_per_atom == pytest.approx(expected.energy_per_atom)
+
+
+def test_get_kink_rxn_endpoint(filtered_entries):
+    r1 = filtered_entries.get_min_entry_by_formula("Mn2O3").composition
+    r2 = filtered_entries.get_min_entry_by_formula("Y2O3").composition
+
+    kinks = KinkFinder(PhaseDiagram(filtered_entries)).get_kinks([(r1, r2)])[0]
+    x, reactants, products, amounts = kinks[0]
+    assert x == pytest.approx(0.0)
+
+    rxn = get_kink_rxn(kinks[0], r1, r2, filtered_entries)
+    assert rxn.balanced
+    assert max(rxn.coefficients) == pytest.approx(1.0)
+
+    # a product with a zero amount (listed first) is dropped
+    zero_kink = (x, reactants, products[:1] + products, np.append(0.0, amounts))
+    zero_rxn = get_kink_rxn(zero_kink, r1, r2, filtered_entries)
+    assert zero_rxn == rxn
+    assert zero_rxn.lowest_num_errors == rxn.lowest_num_errors + 1
+
+    with pytest.raises(ValueError, match="No products"):
+        get_kink_rxn((x, reactants, [], np.array([])), r1, r2, filtered_entries)
@@ -0,0 +1,126 @@
+""" Tests for enumerator utility functions """
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pytest
+
+from rxn_network.enumerators.utils import (
+    ChunkSizer,
+    EnumerationMetrics,
+    count_precursor_combo_pairs,
+    get_combo_tuples,
+    get_combos_array,
+    get_elem_bitmasks,
+    get_precursor_combo_pairs,
+    group_by_chemsys,
+    group_combos_by_chemsys,
+)
+from rxn_network.utils.funcs import limited_powerset
+
+
+@pytest.fixture(scope="module")
+def entries_list(filtered_entries):
+    return filtered_entries.entries_list
+
+
+def test_get_combos_array():
+    combos = get_combos_array([2, 5, 7, 9], 3)
+
+    assert combos.shape == (comb(4, 1) + comb(4, 2) + comb(4, 3), 3)
+    assert get_combo_tuples(combos) == list(limited_powerset([2, 5, 7, 9], 3))
+
+    # combinations larger than the number of indices are skipped
+    combos = get_combos_array([4, 1], 3)
+    assert combos.dtype == np.int32
+    assert get_combo_tuples(combos) == [(4,), (1,), (4, 1)]
+    assert get_combos_array([], 2).shape == (0, 2)
+
+
+def test_get_elem_bitmasks(entries_list):
+    elems = sorted({str(el) for e in entries_list for el in e.composition.elements})
+    masks, elem_bits = get_elem_bitmasks(entries_list, elems)
+
+    assert len(masks) == len(entries_list)
+    for e, mask in zip(entries_list, masks):
+        assert mask == sum(elem_bits[str(el)] for el in e.composition.elements)
+
+
+def test_group_combos_by_chemsys(entries_list):
+    elems = sorted({str(el) for e in entries_list for el in e.composition.elements})
+    masks, _ = get_elem_bitmasks(entries_list, elems)
+
+    combos = get_combos_array(range(len(entries_list)), 2)
+    combos_dict = group_combos_by_chemsys(combos, masks, elems)
+
+    expected = group_by_chemsys(
+        [tuple(c) for c in limited_powerset(entries_list, 2)], None
+    )
+
+    assert combos_dict.keys() == expected.keys()
+    for chemsys, group in combos_dict.items():
+        assert {
+            frozenset(entries_list[i] for i in c) for c in get_combo_tuples(group)
+        } == {frozenset(c) for c in expected[chemsys]}
+
+
+def test_get_precursor_combo_pairs():
+    combos = get_combo_tuples(get_combos_array(range(5), 2))
+    precursor_idxs = {1, 3}
+
+    expected = [
+        (c1, c2)
+        for c1, c2 in combinations(combos, 2)
+        if set(c1).isdisjoint(c2)
+        and (precursor_idxs.issuperset(c1) or precursor_idxs.issuperset(c2))
+    ]
+
+    pairs = list(get_precursor_combo_pairs(combos, precursor_idxs))
+
+    assert sorted(pairs) == sorted(expected)
+    assert count_precursor_combo_pairs(combos, precursor_idxs) == len(expected)
+
+
+@pytest.mark.parametrize("precursor_idxs", [set(), {0}, {1, 3}, {0, 2, 3, 5}])
+def test_count_precursor_combo_pairs(precursor_idxs):
+    combos = get_combo_tuples(get_combos_array(range(6), 3))
+    combos = [c for c in combos if c != (0, 2)]  # not every combination is present
+
+    expected = sum(1 for _ in get_precursor_combo_pairs(combos, precursor_idxs))
+
+    assert count_precursor_combo_pairs(combos, precursor_idxs) == expected
+
+
+def test_chunk_sizer():
+    sizer = ChunkSizer(1000, num_workers=4, target_time=1.0, min_size=10)
+    assert sizer.get_size() == 1000
+
+    sizer.update(1000, 0.5)  # 2000 pairs per second
+    assert sizer.get_size() == 2000
+
+    sizer.update(100, 1.0)  # much slower: moving average of cost per pair
+    assert sizer.get_size() == int(1.0 / (0.5 * 0.01 + 0.5 * 0.0005))
+
+    assert sizer.get_size(num_remaining=200) == 50  # split tail across workers
+    assert sizer.get_size(num_remaining=8) == 10  # never below minimum size
+
+
+def test_enumeration_metrics():
+    metrics = EnumerationMetrics()
+    metrics.update("Mn-O", 100, 10, 2.0, {"balance_time": 1.5, "identity": 3})
+    metrics.update("Mn-O", 50, 5, 1.0, {"balance_time": 0.5, "targets": 2})
+    metrics.update("O-Y", 20, 5, 1.0, {})
+    metrics.wall_time = 2.0
+
+    assert metrics.num_pairs == {"Mn-O": 150, "O-Y": 20}
+    assert metrics.total_num_rxns == 20
+    assert metrics.rxns_per_second == 10.0
+    assert metrics.balance_time == 2.0
+    assert metrics.react_time == 4.0
+    assert metrics.rejections["identity"] == 3
+    assert metrics.rejections["targets"] == 2
+    assert metrics.rejections["unbalanced"] == 0
+
+    metrics_2 = EnumerationMetrics.from_dict(metrics.as_dict())
+    assert metrics_2.num_pairs == metrics.num_pairs
+    assert metrics_2.rejections == metrics.rejections
@@ -2,6 +2,7 @@
 Test for BasicReaction. Several tests adapted from
 test module for pymatgen.analysis.reaction_calculator
 """
+import numpy as np
 import pytest
 from pymatgen.core.composition import Element
 
@@ -149,6 +150,51 @@ def test_equals():
     rxn2 = BasicReaction.from_formulas(["MnO2", "Y2O3"], ["Y2Mn2O7"])
 
     assert rxn1 == rxn2
+    assert hash(rxn1) == hash(rxn2)
+    assert len({rxn1, rxn2}) == 1
+
+
+def test_equals_near_rounding_boundary():
+    comps = [Composition("Fe"), Composition("O2"), Composition("Fe2O3")]
+    rxn1 = BasicReaction(comps, [-2, -1.5 + 5e-7 + 1e-10, 1])
+    rxn2 = BasicReaction(comps, [-2, -1.5 + 5e-7 - 1e-10, 1])
+
+    assert rxn1 == rxn2
+    assert hash(rxn1) == hash(rxn2)
+    assert len({rxn1, rxn2}) == 1
+
+
+def test_equals_unbalanced():
+    rxn1 = BasicReaction.from_formulas(["MnO2", "Y2O3"], ["YMn2O5"])
+    rxn2 = BasicReaction.from_formulas(["Y2O3", "MnO2"], ["YMn2O5"])
+
+    assert not rxn1.balanced
+    assert rxn1 == rxn2
+    assert len({rxn1, rxn2, rxn1.copy()}) == 1
+
+
+def test_not_equals(pre_balanced_rxn):
+    doubled_rxn = BasicReaction(
+        pre_balanced_rxn.compositions, 2 * pre_balanced_rxn.coefficients
+    )
+    swapped_rxn = BasicReaction(
+        [Composition("Fe"), Composition("O2"), Composition("Fe2O3")], [-1.5, -2, 1]
+    )
+
+    assert pre_balanced_rxn != doubled_rxn
+    assert pre_balanced_rxn != swapped_rxn  # same coefficients, but not paired
+    assert pre_balanced_rxn != "2 Fe + 1.5 O2 -> Fe2O3"
+
+
+def test_hash_same_chemical_system():
+    rxns = [
+        BasicReaction.from_formulas(["Y2O3", "MnO2"], ["Y2Mn2O7"]),
+        BasicReaction.from_formulas(["Y2Mn2O7"], ["Y2O3", "MnO2"]),
+        BasicReaction.from_formulas(["Y2O3", "Mn2O3"], ["YMnO3"]),
+        BasicReaction.from_formulas(["YMnO3", "O2"], ["Y2Mn2O7"]),
+    ]
+
+    assert len({hash(rxn) for rxn in rxns}) == len(rxns)
 
 
 def test_reverse():
@@ -244,3 +290,34 @@ def test_scientific_notation():
 
     assert str(rxn) == "FePO4 -> Fe1P1O3.9999 + 5e-05 O2"
     assert str(rxn2) == "1000 FePO4 + 20 CO -> 10 O2 + 1000 FePO4 + 20 C"
+
+
+@pytest.mark.parametrize(
+    "reactants, products, expected_coeffs, expected_errors",
+    [
+        (["Fe", "O2"], ["Fe2O3"], [-2, -1.5, 1], 0),
+        (["Na", "K2O"], ["Na2O", "K"], [-2, -1, 1, 2], 0),
+        (["FePO4", "O"], ["FePO4"], [-1, 0, 1], 1),
+        (["FePO4", "Mn"], ["FePO4", "Xe"], [-1, 0, 1, 0], 2),
+        (["LiCoO2", "Li2O"], ["ZrF4", "Co2O3"], [-2, 1, 0, 1], 2),
+        (["MnO2", "Y2O3"], ["YMn2O5"], [0, 0, 0], np.inf),
+        (["FePO4"], ["FePO3.9999", "O2"], [-1, 1, 5e-05], 0),  # exact fallback
+    ],
+)
+def test_balance_coeffs_batch(reactants, products, expected_coeffs, expected_errors):
+    reactant_comps = [Composition(r) for r in reactants]
+    product_comps = [Composition(p) for p in products]
+    comps = reactant_comps + product_comps
+    elems = sorted({el for c in comps for el in c.elements} | {Element("Xe")})
+
+    comp_matrix = np.array([[c[el] for el in elems] for c in comps]).T
+    comp_matrices = np.stack([comp_matrix, comp_matrix])
+
+    coeffs, errors, constraints = BasicReaction._balance_coeffs_batch(
+        comp_matrices, len(reactants)
+    )
+
+    for c, e, n in zip(coeffs, errors, constraints):
+        assert c == pytest.approx(expected_coeffs)
+        assert e == expected_errors
+        assert n == 1
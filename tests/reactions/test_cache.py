@@ -0,0 +1,170 @@
+""" Tests for the reaction balancing cache """
+import pickle
+
+import numpy as np
+import pytest
+
+from rxn_network.core.composition import Composition
+from rxn_network.reactions.basic import BasicReaction
+from rxn_network.reactions.computed import ComputedReaction
+from rxn_network.reactions.cache import (
+    BalancingCache,
+    get_balancing_cache,
+    set_balancing_cache,
+)
+
+
+@pytest.fixture
+def cache():
+    original_cache = get_balancing_cache()
+    new_cache = BalancingCache(maxsize=2)
+    set_balancing_cache(new_cache)
+
+    yield new_cache
+
+    set_balancing_cache(original_cache)
+
+
+def get_comps(formulas):
+    return [Composition(f) for f in formulas]
+
+
+def test_get_key():
+    key_1, _ = BalancingCache.get_key(get_comps(["Zn", "HCl"]), get_comps(["H2"]))
+    key_2, _ = BalancingCache.get_key(get_comps(["HCl", "Zn"]), get_comps(["H2"]))
+    key_3, _ = BalancingCache.get_key(get_comps(["H2"]), get_comps(["Zn", "HCl"]))
+
+    assert key_1 == key_2
+    assert key_1 != key_3
+
+
+def test_balance_cached(cache):
+    rxn = BasicReaction.balance(get_comps(["Zn", "HCl"]), get_comps(["ZnCl2", "H2"]))
+    assert cache.misses == 1
+    assert len(cache) == 1
+
+    rxn_reordered = BasicReaction.balance(
+        get_comps(["HCl", "Zn"]), get_comps(["H2", "ZnCl2"])
+    )
+    assert cache.hits == 1
+    assert rxn_reordered == rxn
+    assert np.allclose(rxn_reordered.coefficients, [-2, -1, 1, 1])
+
+
+@pytest.mark.parametrize("warm_products", [None, ["Na2O", "K"], ["K", "Na2O"]])
+def test_balance_order_independent(cache, warm_products):
+    reactants = get_comps(["Na", "K2O"])
+    if warm_products:
+        BasicReaction._balance_coeffs(reactants, get_comps(warm_products))
+
+    for products, expected in [
+        (["Na2O", "K"], [-2.0, -1.0, 1.0, 2.0]),
+        (["K", "Na2O"], [-1.0, -0.5, 1.0, 0.5]),
+    ]:
+        coeffs, _, _ = BasicReaction._balance_coeffs(reactants, get_comps(products))
+        uncached_coeffs, _, _ = BasicReaction._solve_coeffs(
+            reactants, get_comps(products)
+        )
+
+        assert coeffs.tolist() == uncached_coeffs.tolist() == expected
+
+    assert len(cache) == 1
+
+
+def test_lru_eviction(cache):
+    BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+    BasicReaction.balance(get_comps(["Zn", "HCl"]), get_comps(["ZnCl2", "H2"]))
+    BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))  # hit
+    BasicReaction.balance(get_comps(["Mg", "O2"]), get_comps(["MgO"]))
+
+    fe_key, _ = BalancingCache.get_key(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+    zn_key, _ = BalancingCache.get_key(
+        get_comps(["Zn", "HCl"]), get_comps(["ZnCl2", "H2"])
+    )
+
+    assert len(cache) == 2
+    assert fe_key in cache
+    assert zn_key not in cache
+
+
+def test_pop_new_update(cache):
+    BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+    new = cache.pop_new()
+
+    assert len(new) == 1
+    assert cache.pop_new() == {}
+
+    other_cache = BalancingCache()
+    other_cache.update(new)
+    set_balancing_cache(other_cache)
+
+    BasicReaction.balance(get_comps(["O2", "Fe"]), get_comps(["Fe2O3"]))
+    assert other_cache.hits == 1
+    assert other_cache.pop_new() == {}
+
+
+def test_pickle(cache, tmp_path):
+    cache.path = tmp_path / "balancing_cache.json.gz"
+    BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+    BasicReaction.balance(get_comps(["O2", "Fe"]), get_comps(["Fe2O3"]))
+
+    copied = pickle.loads(pickle.dumps(cache))
+
+    assert len(copied) == len(cache) == 1
+    assert copied.path is None
+    assert copied.pop_new() == {}
+    assert copied.hits == copied.misses == 0
+    assert len(cache.pop_new()) == 1
+
+
+def test_balance_batch_cached(filtered_entries):
+    entries = sorted(filtered_entries, key=lambda e: e.composition.reduced_formula)
+    pairs = [
+        (entries[i : i + 2], entries[i + 2 : i + 4]) for i in range(len(entries) - 3)
+    ]
+    reactants, products = [list(p) for p in zip(*pairs)]
+
+    original_cache = get_balancing_cache()
+    set_balancing_cache(None)
+    uncached = ComputedReaction.balance_batch(reactants, products)
+
+    new_cache = BalancingCache()
+    set_balancing_cache(new_cache)
+    try:
+        cold = ComputedReaction.balance_batch(reactants, products)
+        warm = ComputedReaction.balance_batch(reactants, products)
+    finally:
+        set_balancing_cache(original_cache)
+
+    assert new_cache.hits == len(pairs)
+    for rxn, cold_rxn, warm_rxn, (r, p) in zip(uncached, cold, warm, pairs):
+        exact_coeffs, exact_errors, _ = BasicReaction._solve_coeffs(
+            [e.composition.reduced_composition for e in r],
+            [e.composition.reduced_composition for e in p],
+        )
+        assert cold_rxn.coefficients.tolist() == rxn.coefficients.tolist()
+        assert warm_rxn.coefficients.tolist() == exact_coeffs.tolist()
+        assert np.allclose(warm_rxn.coefficients, rxn.coefficients)
+        assert warm_rxn.lowest_num_errors == rxn.lowest_num_errors == exact_errors
+
+
+def test_save_load(cache, tmp_path):
+    rxn = BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+
+    path = tmp_path / "balancing_cache.json.gz"
+    cache.save(path)
+
+    new_cache = BalancingCache(path=path)
+    set_balancing_cache(new_cache)
+
+    assert len(new_cache) == 1
+    assert BasicReaction.balance(get_comps(["O2", "Fe"]), get_comps(["Fe2O3"])) == rxn
+    assert new_cache.hits == 1
+
+
+def test_no_cache(cache):
+    set_balancing_cache(None)
+    rxn = BasicReaction.balance(get_comps(["Fe", "O2"]), get_comps(["Fe2O3"]))
+
+    assert rxn.balanced
+    assert len(cache) == 0
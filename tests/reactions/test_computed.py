@@ -105,6 +105,22 @@ def test_copy(pre_balanced_rxn, auto_balanced_rxn):
     )
 
 
+def test_hash(pre_balanced_rxn, auto_balanced_rxn, gibbs_balanced_rxn):
+    assert hash(pre_balanced_rxn) == hash(auto_balanced_rxn)
+    assert len({pre_balanced_rxn, auto_balanced_rxn, gibbs_balanced_rxn}) == 2
+
+    new_rxn = gibbs_balanced_rxn.get_new_temperature(1500)
+    assert new_rxn != gibbs_balanced_rxn  # same compositions, but different energies
+
+
+def test_equals_unbalanced(entries):
+    rxn = ComputedReaction([entries["NaCl"], entries["Y2Mn2O7"]], [-1.0, 1.0])
+
+    assert not rxn.balanced
+    assert rxn == rxn.copy()
+    assert len({rxn, rxn.copy()}) == 1
+
+
 def test_reverse(pre_balanced_rxn):
     pre_balanced_rxn_rev = pre_balanced_rxn.reverse()
 
@@ -122,3 +138,11 @@ def test_get_new_temperature(pre_balanced_rxn, gibbs_balanced_rxn):
     new_rxn = gibbs_balanced_rxn.get_new_temperature(1500)
     for e in new_rxn.entries:
         assert e.temperature == 1500
+
+
+def test_balance_batch(reactants, products, auto_balanced_rxn):
+    rxns = ComputedReaction.balance_batch([reactants, products], [products, reactants])
+
+    assert rxns[0] == auto_balanced_rxn
+    assert rxns[0].data["num_constraints"] == auto_balanced_rxn.data["num_constraints"]
+    assert rxns[1] == ComputedReaction.balance(products, reactants)
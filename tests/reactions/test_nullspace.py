@@ -0,0 +1,53 @@
+""" Tests for the exact nullspace functions used in reaction balancing """
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from rxn_network.reactions.nullspace import get_nullspace, solve_constrained
+
+
+@pytest.mark.parametrize(
+    "comp_matrix, expected_basis",
+    [
+        ([[1, 0, 2], [0, 2, 3]], [(-4, -3, 2)]),  # 4 Fe + 3 O2 -> 2 Fe2O3
+        ([[0.5, 1, 1], [1, 0, 1], [2, 0, 2]], [(-2, -1, 2)]),  # Li0.5CoO2 + Li
+        ([[1, 0], [0, 1]], []),
+        ([[1, 0, 0, 1], [0, 1, 1, 1]], [(0, -1, 1, 0), (-1, -1, 0, 1)]),
+    ],
+)
+def test_get_nullspace(comp_matrix, expected_basis):
+    comp_matrix = np.array(comp_matrix)
+    basis = get_nullspace(comp_matrix)
+
+    assert basis == expected_basis
+    for v in basis:
+        assert np.allclose(comp_matrix @ np.array(v), 0)
+
+
+def get_fractions(soln):
+    numerators, denominator = soln
+    assert denominator > 0
+    return [Fraction(n, denominator) for n in numerators]
+
+
+def test_solve_constrained():
+    basis = get_nullspace(np.array([[1, 0, 0, 1], [0, 1, 1, 1]]))  # Li, Cl, Cl, LiCl
+
+    soln = get_fractions(solve_constrained(basis, (3,), 1))
+    assert soln == [-1, Fraction(-1, 2), Fraction(-1, 2), 1]  # minimum norm
+
+    soln = get_fractions(solve_constrained(basis, (1, 2), -1))
+    assert soln == [-2, -1, -1, 2]
+
+    soln = get_fractions(solve_constrained(basis, (0,), 1))
+    assert soln == [1, Fraction(1, 2), Fraction(1, 2), -1]
+
+
+def test_solve_constrained_no_solution():
+    basis = get_nullspace(np.array([[1, 0, 2, 0], [0, 2, 3, 0], [0, 0, 0, 1]]))  # Xe
+
+    assert solve_constrained(basis, (3,), 1) is None
+    assert solve_constrained([], (0,), 1) is None
+    soln = get_fractions(solve_constrained(basis, (2,), 1))
+    assert soln == [-2, Fraction(-3, 2), 1, 0]
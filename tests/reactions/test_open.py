@@ -1,9 +1,18 @@
 """ Tests for OpenComputedReaction. """
+import gc
+import weakref
+from copy import deepcopy
+
 import pytest
 
 from rxn_network.core.composition import Composition
 from pymatgen.core.composition import Element
-from rxn_network.reactions.open import OpenComputedReaction
+from pymatgen.entries.computed_entries import ConstantEnergyAdjustment
+from rxn_network.reactions.open import (
+    OpenComputedReaction,
+    clear_grand_entry_cache,
+    get_grand_entry,
+)
 
 
 @pytest.fixture(scope="module", params=["Na", "Mn", "O"])
@@ -76,6 +85,55 @@ def test_elements(open_computed_rxn):
     assert set(open_computed_rxn.elements) == expected[open_elem.name]
 
 
+def test_grand_entries(open_computed_rxn):
+    rxn_copy = open_computed_rxn.copy()
+    open_elem = open_computed_rxn.open_elems[0]
+
+    for e, grand_e, grand_e_copy in zip(
+        open_computed_rxn.entries,
+        open_computed_rxn.grand_entries,
+        rxn_copy.grand_entries,
+    ):
+        assert grand_e is grand_e_copy  # shared between reactions
+        if e.composition.elements == [open_elem]:
+            assert grand_e is e
+        else:
+            assert grand_e.original_entry is e
+            assert grand_e.chempots == open_computed_rxn.chempots
+
+
+def test_get_grand_entry(computed_rxn):
+    entry = computed_rxn.entries[0]
+    grand_entry = get_grand_entry(entry, {Element("O"): -1.0})
+
+    assert get_grand_entry(entry, {Element("O"): -1}) is grand_entry
+    assert get_grand_entry(entry, {Element("O"): -2.0}) is not grand_entry
+    assert grand_entry.energy == pytest.approx(entry.energy + entry.composition["O"])
+
+
+def test_grand_entry_cache(computed_rxn):
+    entry = deepcopy(computed_rxn.entries[0])
+    chempots = {Element("O"): -1.0}
+
+    entry_ref = weakref.ref(entry)
+    get_grand_entry(entry, chempots)
+    del entry
+    gc.collect()
+    assert entry_ref() is None  # not kept alive by the cache
+
+    entry = deepcopy(computed_rxn.entries[0])
+    grand_entry = get_grand_entry(entry, chempots)
+    assert get_grand_entry(entry, chempots) is grand_entry
+
+    entry.energy_adjustments.append(ConstantEnergyAdjustment(-1.0))
+    new_grand_entry = get_grand_entry(entry, chempots)
+    assert new_grand_entry is not grand_entry
+    assert new_grand_entry.energy == pytest.approx(grand_entry.energy - 1.0)
+
+    clear_grand_entry_cache()
+    assert get_grand_entry(entry, chempots) is not new_grand_entry
+
+
 def test_copy(open_computed_rxn):
     assert open_computed_rxn.copy() == open_computed_rxn
 
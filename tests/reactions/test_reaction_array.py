@@ -0,0 +1,162 @@
+""" Tests for ReactionArray and ReactionView """
+import numpy as np
+import pytest
+from pymatgen.core.composition import Element
+from pymatgen.entries.computed_entries import ComputedEntry, ConstantEnergyAdjustment
+
+from rxn_network.costs.softplus import Softplus
+from rxn_network.entries.gibbs import GibbsComputedEntry
+from rxn_network.reactions.computed import ComputedReaction
+from rxn_network.reactions.open import OpenComputedReaction
+from rxn_network.reactions.reaction_array import ReactionArray, ReactionView
+from rxn_network.reactions.reaction_set import ReactionSet
+
+
+@pytest.fixture(scope="module")
+def rxn_set(ymno3_rxns):
+    return ReactionSet.from_rxns(ymno3_rxns)
+
+
+@pytest.fixture(scope="module")
+def open_rxn_set(ymno3_rxns):
+    return ReactionSet.from_rxns(ymno3_rxns, open_elem="O", chempot=-1.0)
+
+
+@pytest.mark.parametrize("rxn_set_name", ["rxn_set", "open_rxn_set"])
+def test_energies(rxn_set_name, request):
+    rxn_set = request.getfixturevalue(rxn_set_name)
+    rxns = list(rxn_set.get_rxns())
+    array = rxn_set.to_array()
+
+    assert len(array) == len(rxns)
+    assert array.matrix.shape == (len(rxns), len(rxn_set.entries))
+    assert array.matrix.nnz == sum(len(r.entries) for r in rxns)
+    assert array.energies == pytest.approx([r.energy for r in rxns])
+    assert array.num_atoms == pytest.approx([r.num_atoms for r in rxns])
+    assert array.energies_per_atom == pytest.approx([r.energy_per_atom for r in rxns])
+
+
+@pytest.mark.parametrize("rxn_set_name", ["rxn_set", "open_rxn_set"])
+def test_energy_uncertainties(rxn_set_name, request):
+    rxn_set = request.getfixturevalue(rxn_set_name)
+    rxns = list(rxn_set.get_rxns())
+    array = rxn_set.to_array()
+
+    # entries without uncertainties (depending on the pymatgen version) give NaN
+    assert array.energy_uncertainties == pytest.approx(
+        [r.energy_uncertainty for r in rxns], nan_ok=True
+    )
+    assert array.energy_uncertainties_per_atom == pytest.approx(
+        [r.energy_uncertainty_per_atom for r in rxns], nan_ok=True
+    )
+
+
+def test_energies_unbalanced(computed_rxn):
+    entries = list(computed_rxn.entries)
+    coeffs = computed_rxn.coefficients.copy()
+    coeffs[-1] *= 2  # more product than reactants
+
+    rxn = ComputedReaction(entries, coeffs)
+    array = ReactionArray(entries, [list(range(len(entries)))], [coeffs])
+
+    assert not rxn.balanced
+    assert array.num_atoms == pytest.approx([rxn.num_atoms])
+    assert array.energies_per_atom == pytest.approx([rxn.energy_per_atom])
+
+
+def test_energies_repeated_compositions(computed_rxn):
+    entries, coeffs = list(computed_rxn.entries), computed_rxn.coefficients
+    polymorph = ComputedEntry(
+        entries[0].composition,
+        entries[0].uncorrected_energy + 1.0,
+        energy_adjustments=[ConstantEnergyAdjustment(0.0, uncertainty=0.1)],
+    )
+
+    # split the first coefficient between the entry and a higher-energy polymorph
+    split_coeffs = np.concatenate([[coeffs[0] / 2], coeffs[1:], [coeffs[0] / 2]])
+    rxn = ComputedReaction(entries + [polymorph], split_coeffs)
+    array = ReactionArray(
+        entries + [polymorph], [list(range(len(entries) + 1))], [split_coeffs]
+    )
+
+    assert rxn.energy == pytest.approx(computed_rxn.energy)
+    assert array.energies == pytest.approx([rxn.energy])
+    assert array[0].energy_per_atom == pytest.approx(rxn.energy_per_atom)
+    assert array.energy_uncertainties == pytest.approx(
+        [rxn.energy_uncertainty], nan_ok=True
+    )
+
+
+def test_energies_at_temperatures_repeated_compositions(filtered_entries):
+    entries = [filtered_entries.get_min_entry_by_formula(f) for f in ["Y", "O2"]]
+    y2o3 = filtered_entries.get_min_entry_by_formula("Y2O3")
+    polymorph = GibbsComputedEntry(  # lowest in energy only at high temperatures
+        y2o3.composition,
+        y2o3.formation_energy_per_atom + 0.05,
+        2 * y2o3.volume_per_atom,
+        y2o3.temperature,
+    )
+    entries += [y2o3, polymorph]
+    coeffs = [-2.0, -1.5, 0.5, 0.5]
+    rxn = ComputedReaction(entries, coeffs)
+    array = ReactionArray(entries, [[0, 1, 2, 3]], [coeffs])
+
+    temps = [300, 1000, 2000]
+    energies = array.get_energies_at_temperatures(temps)
+    assert energies[0] == pytest.approx(
+        [rxn.get_new_temperature(t).energy for t in temps]
+    )
+
+
+def test_entry_set_vectors(gibbs_entries):
+    entries = gibbs_entries.copy()
+    indices = [[0, 1], [1, 2]]
+    coeffs = [[-1.0, 1.0], [-1.0, 1.0]]
+    array = ReactionArray(entries, indices, coeffs)
+
+    assert array.entries == entries.entries_list
+    assert array.entry_energies is entries.energy_vector
+    assert array.entry_num_atoms is entries.num_atoms_vector
+
+    list_array = ReactionArray(entries.entries_list, indices, coeffs)
+    assert array.energies == pytest.approx(list_array.energies)
+
+
+def test_views(open_rxn_set):
+    array = open_rxn_set.to_array()
+    view = array[-1]
+    rxn = list(open_rxn_set.get_rxns())[-1]
+
+    assert isinstance(view, ReactionView)
+    assert view.energy_per_atom == pytest.approx(rxn.energy_per_atom)
+    assert view.data == open_rxn_set.all_data[-1]
+    assert view._rxn is None  # not materialized yet
+
+    assert view.reactants == rxn.reactants
+    assert isinstance(view.to_rxn(), OpenComputedReaction)
+    assert view.to_rxn() == rxn
+    assert view.chempots == {Element("O"): -1.0}
+
+    with pytest.raises(IndexError):
+        array[len(array)]
+
+
+def test_slicing(rxn_set):
+    array = rxn_set.to_array()
+    energies = array.energies
+
+    subset = array[::2]
+    assert isinstance(subset, ReactionArray)
+    assert subset.energies == pytest.approx(energies[::2])
+    assert subset.get_rxn(1) == array.get_rxn(2)
+
+    mask = energies < 0
+    assert len(array[mask]) == mask.sum()
+
+
+def test_calculate_costs(open_rxn_set):
+    cf = Softplus()
+    assert open_rxn_set.calculate_costs(cf) == pytest.approx(
+        [cf.evaluate(r) for r in open_rxn_set.get_rxns()]
+    )
+    assert np.isfinite(open_rxn_set.calculate_costs(cf)).all()
@@ -1,12 +1,14 @@
 """ Tests for ReactionSet."""
 from pathlib import Path
 
+import numpy as np
 import pytest
 from monty.serialization import loadfn
 from pymatgen.core.composition import Element
 
 from rxn_network.core.composition import Composition
 from rxn_network.costs.softplus import Softplus
+from rxn_network.enumerators.basic import BasicEnumerator
 from rxn_network.reactions.computed import ComputedReaction
 from rxn_network.reactions.open import OpenComputedReaction
 from rxn_network.reactions.reaction_set import ReactionSet
@@ -35,6 +37,88 @@ def test_calculate_costs(ymno3_rxns, rxn_set):
     assert rxn_set.calculate_costs(cf) == [cf.evaluate(r) for r in ymno3_rxns]
 
 
+@pytest.fixture(scope="module")
+def gibbs_rxns(filtered_entries):
+    return list(BasicEnumerator(quiet=True).enumerate(filtered_entries).get_rxns())
+
+
+def test_get_energies_at_temperatures(gibbs_rxns):
+    rxn_set = ReactionSet.from_rxns(gibbs_rxns)
+
+    temps = [300, 850, 1500]
+    energies = rxn_set.get_energies_at_temperatures(temps)
+    energies_per_atom = rxn_set.get_energies_at_temperatures(temps, per_atom=True)
+
+    assert energies.shape == (len(gibbs_rxns), len(temps))
+    for i, t in enumerate(temps):
+        new_rxns = [r.get_new_temperature(t) for r in gibbs_rxns]
+        assert energies[:, i] == pytest.approx([r.energy for r in new_rxns])
+        assert energies_per_atom[:, i] == pytest.approx(
+            [r.energy_per_atom for r in new_rxns]
+        )
+
+
+def test_csr_layout(ymno3_rxns, rxn_set):
+    assert rxn_set.flat_indices.dtype == np.int32
+    assert rxn_set.flat_coeffs.dtype == np.float64
+    assert len(rxn_set.offsets) == len(ymno3_rxns) + 1
+    assert rxn_set.offsets[-1] == sum(len(r.entries) for r in ymno3_rxns)
+    assert [list(c) for c in rxn_set.coeffs] == [
+        list(r.coefficients) for r in ymno3_rxns
+    ]
+    assert rxn_set.all_data == [r.data for r in ymno3_rxns]
+
+
+def test_data_columns(computed_rxn):
+    entries, coeffs = computed_rxn.entries, computed_rxn.coefficients
+    rxn_set = ReactionSet(
+        entries,
+        [list(range(len(entries)))] * 2,
+        [coeffs] * 2,
+        all_data=[{"num_constraints": 1, "a": "x"}, {"num_constraints": 2}],
+    )
+
+    assert rxn_set.data_columns["num_constraints"].tolist() == [1, 2]
+    assert rxn_set.other_data == [{"a": "x"}, {}]
+    assert rxn_set.all_data == [
+        {"num_constraints": 1, "a": "x"},
+        {"num_constraints": 2},
+    ]
+    assert rxn_set[1].data == {"num_constraints": 2}
+
+
+def test_slicing(ymno3_rxns, rxn_set):
+    subset = rxn_set[2:5]
+    assert isinstance(subset, ReactionSet)
+    assert list(subset.get_rxns()) == ymno3_rxns[2:5]
+    assert np.shares_memory(subset.flat_indices, rxn_set.flat_indices)
+
+    mask = np.arange(len(rxn_set)) % 2 == 0
+    assert list(rxn_set[mask].get_rxns()) == ymno3_rxns[::2]
+    assert rxn_set[-1] == ymno3_rxns[-1]
+
+    with pytest.raises(IndexError):
+        rxn_set[len(rxn_set)]
+
+
+def test_add_rxn_set(ymno3_rxns, rxn_set):
+    combined = rxn_set[:3].add_rxn_set(rxn_set[3:])
+    assert list(combined.get_rxns()) == ymno3_rxns
+
+    added = rxn_set[:3].add_rxns(ymno3_rxns[3:])
+    assert list(added.get_rxns()) == ymno3_rxns
+
+
+def test_to_from_dict(ymno3_rxns, rxn_set, open_rxn_set):
+    for r_set in [rxn_set, open_rxn_set]:
+        d = r_set.as_dict()
+        assert "offsets" in d
+
+        new_rxn_set = ReactionSet.from_dict(d)
+        assert list(new_rxn_set.get_rxns()) == list(r_set.get_rxns())
+        assert new_rxn_set.all_data == r_set.all_data
+
+
 def test_filter_duplicates(computed_rxn):
     computed_rxn2 = ComputedReaction(
         computed_rxn.entries, computed_rxn.coefficients * 2
@@ -46,3 +130,100 @@ def test_filter_duplicates(computed_rxn):
             [computed_rxn, computed_rxn2], filter_duplicates=True
         ).get_rxns()
     ) == [computed_rxn]
+
+
+def test_filter_duplicates_order_and_sign(computed_rxn, rxn_set):
+    entries, coeffs = computed_rxn.entries, computed_rxn.coefficients
+    num = len(entries)
+    reversed_order = list(range(num))[::-1]
+
+    rxn_set2 = ReactionSet(
+        entries,
+        [list(range(num)), reversed_order, list(range(num))],
+        [coeffs, 3 * coeffs[::-1], -coeffs],
+        all_data=[{"i": 0}, {"i": 1}, {"i": 2}],
+    )
+    filtered = rxn_set2.filter_duplicates()
+    assert [d["i"] for d in filtered.all_data] == [0, 2]  # reverse rxn is kept
+
+    unique = rxn_set.filter_duplicates()
+    doubled = unique.add_rxn_set(unique).filter_duplicates()
+    assert list(doubled.get_rxns()) == list(unique.get_rxns())
+
+
+def test_filter_duplicates_near_rounding_boundary(computed_rxn):
+    entries, coeffs = computed_rxn.entries, computed_rxn.coefficients
+    num = len(entries)
+
+    scale = abs(coeffs[0])
+    boundary = scale * (np.round(coeffs[1] / scale, 6) + 5e-7)
+
+    all_coeffs = [coeffs[:-1].copy() for _ in range(3)]
+    all_coeffs[0][1] = boundary + 1e-10 * scale
+    all_coeffs[1][1] = boundary - 1e-10 * scale
+    all_coeffs[2][1] = 1.01 * boundary
+
+    rxn_set = ReactionSet(
+        entries,
+        [list(range(num - 1))] * 3 + [list(range(num))],  # padded to the longest
+        all_coeffs + [coeffs],
+        all_data=[{"i": 0}, {"i": 1}, {"i": 2}, {"i": 3}],
+    )
+    filtered = rxn_set.filter_duplicates()
+    assert [d["i"] for d in filtered.all_data] == [0, 2, 3]
+
+
+def test_filter_duplicates_near_bin_boundary(computed_rxn):
+    entries = computed_rxn.entries
+    tol = 1e-5  # bin width of the log-normalized coefficients
+
+    boundary = np.exp(tol * np.round(np.log(0.5) / tol))  # a boundary between bins
+    rxn_set = ReactionSet(
+        entries,
+        [[0, 1, 2]] * 3,
+        [
+            [-1.0, boundary * (1 - 1e-7), 0.3],
+            [-1.0, boundary * (1 - 1e-7), 0.9],  # sorted between the duplicates
+            [-2.0, 2 * boundary * (1 + 1e-7), 0.6],
+        ],
+        all_data=[{"i": 0}, {"i": 1}, {"i": 2}],
+    )
+
+    filtered = rxn_set.filter_duplicates()
+    assert [d["i"] for d in filtered.all_data] == [0, 1]
+
+
+def test_filter_duplicates_zero_coeffs(computed_rxn):
+    rxn_set = ReactionSet(
+        computed_rxn.entries,
+        [[0, 1, 2]] * 3,
+        [[-1.0, 0.0, 1.0], [-2.0, 0.0, 2.0], [-1.0, 0.5, 1.0]],
+        all_data=[{"i": 0}, {"i": 1}, {"i": 2}],
+    )
+
+    filtered = rxn_set.filter_duplicates()
+    assert [d["i"] for d in filtered.all_data] == [0, 1, 2]
+
+
+def test_get_rxns_by_reactants(ymno3_rxns, rxn_set):
+    reactants = ["Y2O3", "Mn2O3"]
+    expected = [
+        r
+        for r in ymno3_rxns
+        if {c.reduced_formula for c in r.reactants}.issubset(reactants)
+    ]
+
+    assert expected
+    assert list(rxn_set.get_rxns_by_reactants(reactants)) == expected
+    assert rxn_set.get_rxns_by_reactants(["Fe2O3"]) == []
+
+
+def test_get_rxns_by_product(ymno3_rxns, rxn_set):
+    for idx in [0, len(rxn_set.entries) - 1]:  # first entry was previously missed
+        product = rxn_set.entries[idx].composition.reduced_formula
+        expected = [
+            r for r in ymno3_rxns if product in {c.reduced_formula for c in r.products}
+        ]
+        assert list(rxn_set.get_rxns_by_product(product)) == expected
+
+    assert rxn_set.get_rxns_by_product("Fe2O3") == []
@@ -0,0 +1,103 @@
+""" Tests for the phase diagram cache """
+import pytest
+from pymatgen.analysis.phase_diagram import PhaseDiagram
+from pymatgen.core.composition import Composition, Element
+
+from rxn_network.thermo.cache import PhaseDiagramCache, get_pd_cache, set_pd_cache
+
+
+@pytest.fixture
+def cache():
+    original_cache = get_pd_cache()
+    new_cache = PhaseDiagramCache(maxsize=10)
+    set_pd_cache(new_cache)
+
+    yield new_cache
+
+    set_pd_cache(original_cache)
+
+
+def test_get_fingerprint(filtered_entries):
+    entries = filtered_entries.entries_list
+
+    fingerprint = PhaseDiagramCache.get_fingerprint(entries)
+
+    assert fingerprint == PhaseDiagramCache.get_fingerprint(entries[::-1])
+    assert fingerprint != PhaseDiagramCache.get_fingerprint(entries[1:])
+
+
+def test_get_pd(cache, filtered_entries):
+    pd = cache.get_pd(filtered_entries, ["Mn", "O"])
+    assert cache.misses == 1
+
+    assert cache.get_pd(filtered_entries, ["O", "Mn"]) is pd
+    assert cache.hits == 1
+
+    assert {str(el) for el in pd.elements} == {"Mn", "O"}
+    assert len(pd.all_entries) == len(
+        filtered_entries.get_subset_in_chemsys(["Mn", "O"])
+    )
+
+
+def test_get_grand_pd(cache, filtered_entries):
+    chempots = {Element("O"): -1.0}
+
+    grand_pd = cache.get_grand_pd(filtered_entries, chempots, ["Mn", "O", "Y"])
+
+    assert cache.get_grand_pd(filtered_entries, chempots, ["Mn", "O", "Y"]) is grand_pd
+    assert cache.get_grand_pd(filtered_entries, {Element("O"): 0.0}) is not grand_pd
+    assert grand_pd.chempots == chempots
+
+
+def test_get_cached_and_add(cache, filtered_entries):
+    fingerprint = cache.get_fingerprint(filtered_entries)
+    chempots = {Element("O"): -1.0}
+    pd = PhaseDiagram(filtered_entries.get_subset_in_chemsys(["Mn", "O"]))
+
+    assert cache.get_cached(fingerprint, ["Mn", "O"]) is None
+    cache.add(pd, fingerprint, ["O", "Mn"])
+
+    assert cache.get_cached(fingerprint, ["Mn", "O"]) is pd
+    assert cache.get_pd(filtered_entries, ["Mn", "O"]) is pd
+    assert cache.get_cached(fingerprint, ["Mn", "O"], chempots) is None
+
+
+def test_get_hull_energy(cache, filtered_entries):
+    comp = Composition("YMnO3")
+    pd = PhaseDiagram(filtered_entries)
+
+    cache.get_pd(filtered_entries)
+    assert cache.get_hull_energy(filtered_entries, comp) == pytest.approx(
+        pd.get_hull_energy(comp)
+    )
+    assert len(cache) == 1
+
+
+def test_get_hull_energy_parent_pd(cache, filtered_entries):
+    comp = Composition("Mn2O3")
+    pd = PhaseDiagram(filtered_entries)
+
+    cache.get_pd(filtered_entries, ["Mn", "O", "Y"])
+    cache.get_pd(filtered_entries, ["Mn", "O"])
+    cache.get_grand_pd(filtered_entries, {Element("O"): 0.0}, ["Mn", "O"])
+    misses = cache.misses
+
+    assert cache.get_hull_energy(filtered_entries, comp) == pytest.approx(
+        pd.get_hull_energy(comp)
+    )
+    assert cache.get_hull_energy(filtered_entries, Composition("YO")) == pytest.approx(
+        pd.get_hull_energy(Composition("YO"))
+    )
+    assert cache.misses == misses  # answered by the cached phase diagrams
+    assert len(cache) == 3
+
+
+def test_maxsize(filtered_entries):
+    cache = PhaseDiagramCache(maxsize=1)
+
+    pd = cache.get_pd(filtered_entries, ["Mn", "O"])
+    cache.get_pd(filtered_entries, ["O", "Y"])
+
+    assert len(cache) == 1
+    assert cache._get_parent_pd(cache.get_fingerprint(filtered_entries), {"Mn"}) is None
+    assert cache.get_pd(filtered_entries, ["Mn", "O"]) is not pd
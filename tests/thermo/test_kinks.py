@@ -0,0 +1,74 @@
+""" Tests for the KinkFinder class """
+from itertools import combinations
+
+import numpy as np
+import pytest
+from pymatgen.analysis.interface_reactions import (
+    GrandPotentialInterfacialReactivity,
+    InterfacialReactivity,
+)
+from pymatgen.analysis.phase_diagram import GrandPotentialPhaseDiagram, PhaseDiagram
+from pymatgen.core.composition import Composition, Element
+
+from rxn_network.thermo.kinks import KinkFinder
+
+
+@pytest.fixture(scope="module")
+def pd(filtered_entries):
+    return PhaseDiagram(filtered_entries)
+
+
+@pytest.fixture(scope="module")
+def grand_pd(filtered_entries):
+    return GrandPotentialPhaseDiagram(filtered_entries, {Element("O"): -1.0})
+
+
+@pytest.fixture(scope="module")
+def pairs(filtered_entries):
+    comps = [
+        e.composition for e in filtered_entries.entries_list if len(e.composition) > 1
+    ]
+    return list(combinations(comps, 2)) + [(c, c) for c in comps[:3]]
+
+
+def get_kink_products(kink):
+    return sorted(Composition(e.name).reduced_formula for e in kink[2])
+
+
+def test_get_kinks(pd, pairs):
+    all_kinks = KinkFinder(pd, block_size=1000).get_kinks(pairs)
+
+    assert len(all_kinks) == len(pairs)
+
+    for (r1, r2), kinks in zip(pairs, all_kinks):
+        expected = InterfacialReactivity(r1, r2, pd, use_hull_energy=True).get_kinks()
+
+        assert [k[0] for k in kinks] == pytest.approx([k[1] for k in expected])
+        for kink, (_, _, _, rxn, _) in zip(kinks, expected):
+            assert set(kink[1]) == set(rxn._input_reactants)
+            assert get_kink_products(kink) == sorted(
+                c.reduced_formula for c in rxn._input_products
+            )
+            assert np.isclose(kink[3].sum(), 1.0)
+
+
+def test_get_kinks_grand(pd, grand_pd, pairs):
+    pairs = [p for p in pairs if Element("O") in p[0] and Element("O") in p[1]]
+    all_kinks = KinkFinder(grand_pd).get_kinks(pairs)
+
+    for (r1, r2), kinks in zip(pairs, all_kinks):
+        expected = GrandPotentialInterfacialReactivity(
+            r1,
+            r2,
+            grand_pd,
+            pd_non_grand=pd,
+            include_no_mixing_energy=True,
+            use_hull_energy=True,
+        ).get_kinks()
+
+        assert len(kinks) == len(expected)
+        for kink, (_, _, _, rxn, _) in zip(kinks, expected):
+            assert set(kink[1]) == set(rxn._input_reactants)
+            assert get_kink_products(kink) == sorted(
+                c.reduced_formula for c in rxn._input_products
+            )
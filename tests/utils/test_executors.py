@@ -0,0 +1,84 @@
+"""Tests for executors"""
+import os
+from operator import add
+
+import pytest
+
+from rxn_network.utils.executors import (
+    EXECUTOR_ENV_VAR,
+    ProcessExecutor,
+    SerialExecutor,
+    get_executor,
+)
+
+
+@pytest.mark.parametrize("executor", [SerialExecutor(), ProcessExecutor(2)])
+def test_executor(executor):
+    shared = executor.put(10)
+    futures = [executor.submit(add, i, shared) for i in range(5)]
+
+    done, pending = executor.wait(futures, num_returns=2)
+    assert len(done) >= 2
+    assert len(done) + len(pending) == 5
+
+    assert sorted(executor.iter_completed(futures)) == [10, 11, 12, 13, 14]
+
+    executor.shutdown()
+
+
+def _get_pid_and_id(obj):
+    return os.getpid(), id(obj)
+
+
+def test_process_executor_put():
+    executor = ProcessExecutor(1)
+    assert executor.put(10) == 10
+
+    shared = executor.put(list(range(100000)))
+    path = shared.path
+    assert os.path.exists(path)
+
+    results = list(
+        executor.iter_completed([executor.submit(len, shared) for _ in range(3)])
+    )
+    assert results == [100000] * 3
+
+    # the object is loaded once by the (only) worker and reused by later tasks
+    ids = {executor.get(executor.submit(_get_pid_and_id, shared)) for _ in range(3)}
+    assert len(ids) == 1
+
+    del shared
+    assert not os.path.exists(path)
+
+    executor.shutdown()
+
+
+def test_get_executor(monkeypatch):
+    executor = SerialExecutor()
+    assert get_executor(executor) is executor
+
+    assert isinstance(get_executor("serial"), SerialExecutor)
+    assert get_executor("process") is get_executor("process")
+
+    monkeypatch.setenv(EXECUTOR_ENV_VAR, "serial")
+    assert isinstance(get_executor(), SerialExecutor)
+
+    with pytest.raises(ValueError):
+        get_executor("not_an_executor")
+
+
+@pytest.mark.parametrize("executor", [SerialExecutor(), ProcessExecutor(2)])
+def test_executor_dependencies(executor):
+    first = executor.submit(add, 1, 2)
+    second = executor.submit(add, first, 10)
+    third = executor.submit(add, second, first)
+
+    assert executor.get(third) == 16
+    assert executor.get(second) == 13
+
+    failed = executor.submit(add, 1, "a")
+    dependent = executor.submit(add, failed, 1)
+    with pytest.raises(TypeError):
+        executor.get(dependent)
+
+    executor.shutdown()